@@ -9,7 +9,7 @@ rem Install PyInstaller if not already installed
 pip install pyinstaller
 
 rem Run PyInstaller with correct paths
-pyinstaller --onefile --windowed --icon=icon.ico --name="MonsterSpawnEditor" src\monster_spawn_editor.py
+pyinstaller --onefile --windowed --icon=icon.ico --name="MonsterSpawnEditor" --exclude-module bench src\monster_spawn_editor.py
 
 echo.
 if %ERRORLEVEL% EQU 0 (
@@ -0,0 +1,413 @@
+"""Benchmarks of the editor's data paths.
+
+Runs parsing, serializing, the canvas scene model, hit-testing, monster
+search, undo history and saving over the bundled Monster.txt and
+MonsterSetBase tree, and over scaled-up copies of them (every map's spawns
+repeated N times, Monster.txt grown to a given number of monsters) or
+seeded synthetic maps of a given size (``--synthetic``).  Only
+editor_core is needed; the scene runs on a real Tk canvas when a display
+is available (``--display``) and on a call-counting stand-in otherwise.
+
+Results are written as JSON (best/median time and peak traced memory per
+benchmark) and can be compared with a file from an earlier commit::
+
+    python src/monster_spawn_editor.py bench --output before.json
+    python src/monster_spawn_editor.py bench --compare before.json
+"""
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from editor_core import (
+    ENCODING,
+    format_spawn_file,
+    load_spawn_store,
+    parse_monster_txt,
+    parse_spawn_file,
+)
+from editor_core.catalog import spawn_file_path, split_map_name
+from editor_core.coords import map_to_scene
+from editor_core.history import History, ModifySpawns
+from editor_core.repository import Repository
+from editor_core.scene import SpawnScene
+from editor_core.search import MonsterIndex
+from editor_core.synthetic import generate_spawn_file
+
+DEFAULT_SCALES = (1, 10)
+DEFAULT_MONSTERS = (0, 10000)   # 0 = Monster.txt as shipped
+DEFAULT_REPEAT = 5
+# A benchmark slower than the baseline by more than this factor is reported as a regression
+DEFAULT_THRESHOLD = 1.25
+SEED = 20240101
+
+SEARCH_QUERIES = ("g", "go", "gob", "gobl", "goblin", "gbl", "12", "dragon", "zzz")
+HIT_TESTS = 2000
+HISTORY_EDITS = 1000
+
+
+class CountingCanvas:
+    """Stand-in for tk.Canvas when there is no display; counts the calls SpawnScene makes"""
+
+    def __init__(self):
+        self.calls = 0
+        self._next = 0
+
+    def _create(self, *args, **kwargs):
+        self.calls += 1
+        self._next += 1
+        return self._next
+
+    create_oval = create_rectangle = _create
+
+    def itemconfigure(self, *args, **kwargs):
+        self.calls += 1
+
+    coords = delete = itemconfigure
+
+
+# Corpora
+
+class Corpus:
+    """Spawn file texts or a Monster.txt text held in memory"""
+
+    def __init__(self, name, files=None, monster_text=None):
+        self.name = name
+        self.files = files              # catalogue path -> file text
+        self.monster_text = monster_text
+
+
+def load_corpus(root):
+    repository = Repository(root)
+    files = {}
+    for map_file in repository.list_maps():
+        with open(repository.map_path(map_file), 'r', encoding=ENCODING, newline='') as f:
+            files[map_file] = f.read()
+    with open(repository.monster_file, 'r', encoding=ENCODING, newline='') as f:
+        monster_text = f.read()
+    return Corpus("bundled", files, monster_text)
+
+
+def scale_spawns(text, factor, rng):
+    """File text with every spawn repeated ``factor`` times at nearby positions"""
+    doc, spawns = parse_spawn_file(text)
+    scaled = list(spawns)
+    for _ in range(factor - 1):
+        for spawn in spawns:
+            copy = spawn.copy()
+            copy.row = None
+            dx, dy = rng.randint(-8, 8), rng.randint(-8, 8)
+            copy.x = max(0, min(255, spawn.x + dx))
+            copy.y = max(0, min(255, spawn.y + dy))
+            copy.end_x = max(0, min(255, spawn.end_x + dx))
+            copy.end_y = max(0, min(255, spawn.end_y + dy))
+            scaled.append(copy)
+    return format_spawn_file(doc, scaled)
+
+
+def scale_monsters(text, count):
+    """Monster.txt text grown to ``count`` rows by repeating the real rows under new IDs"""
+    table = parse_monster_txt(text)
+    rows = [table.lines[line_no] for line_no in table.row_lines]
+    if not rows or len(rows) >= count:
+        return text
+    last = max(table.rows)
+    extra = []
+    for n in range(count - len(rows)):
+        line = rows[n % len(rows)]
+        body = line.lstrip()
+        index = body.split(None, 1)[0]
+        extra.append(line[:len(line) - len(body)] + str(last + 1 + n) + body[len(index):])
+    lines = table.lines
+    insert_at = table.row_lines[-1] + 1
+    return "".join(lines[:insert_at] + extra + lines[insert_at:])
+
+
+def synthetic_spawns(base, per_file, seed=SEED):
+    """Generated files with ``per_file`` spawns each, one per bundled file and map number,
+    using the bundled Monster.txt IDs"""
+    table = parse_monster_txt(base.monster_text)
+    npc_ids = [monster_id for monster_id in table if table.monster_type(monster_id) == 0] or [0]
+    monster_ids = [monster_id for monster_id in table if table.monster_type(monster_id) != 0] or [0]
+    files = {}
+    for n, path in enumerate(sorted(base.files)):
+        map_number = split_map_name(path)[0]
+        files[path] = generate_spawn_file(n if map_number is None else map_number, per_file, seed + n,
+                                          npc_ids=npc_ids, monster_ids=monster_ids)
+    return files
+
+
+def build_corpora(base, scales, monster_counts, synthetic=()):
+    """Yield a monster corpus per Monster.txt size and a spawn corpus per scale and synthetic size,
+    built on demand"""
+    for count in monster_counts:
+        if not count:
+            yield Corpus("Monster.txt", monster_text=base.monster_text)
+        else:
+            yield Corpus(f"{count} monsters", monster_text=scale_monsters(base.monster_text, count))
+    for factor in scales:
+        rng = random.Random(SEED + factor)
+        files = base.files if factor == 1 else {path: scale_spawns(text, factor, rng)
+                                                for path, text in base.files.items()}
+        yield Corpus(f"spawns x{factor}", files=files)
+    for per_file in synthetic:
+        yield Corpus(f"synthetic {per_file}/file", files=synthetic_spawns(base, per_file))
+
+
+# Measuring
+
+def measure(fn, setup, repeat):
+    """Best and median wall time (ms) of ``fn(setup())`` and its peak traced memory (KiB)"""
+    times = []
+    for _ in range(repeat):
+        state = setup()
+        started = time.perf_counter()
+        fn(state)
+        times.append((time.perf_counter() - started) * 1000)
+    # Memory is traced in a separate run, tracemalloc slows everything down
+    state = setup()
+    tracemalloc.start()
+    try:
+        fn(state)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"best_ms": round(min(times), 3), "median_ms": round(statistics.median(times), 3),
+            "runs": repeat, "peak_kib": round(peak / 1024, 1)}
+
+
+def benchmarks(corpus, canvas_factory, workdir):
+    """Yield (name, items, fn, setup) for one corpus"""
+    if corpus.monster_text is not None:
+        yield from monster_benchmarks(corpus.monster_text)
+    if corpus.files is not None:
+        yield from spawn_benchmarks(corpus.files, canvas_factory, workdir)
+
+
+def monster_benchmarks(text):
+    table = parse_monster_txt(text)
+    entries = [(monster_id, table.name(monster_id), table.monster_type(monster_id)) for monster_id in table]
+
+    yield "monster_txt.parse", len(table), lambda _: parse_monster_txt(text), lambda: None
+    yield "search.build_index", len(entries), lambda _: MonsterIndex(entries), lambda: None
+
+    def search(index):
+        for query in SEARCH_QUERIES:
+            index.search(query)
+    yield "search.queries", len(SEARCH_QUERIES), search, lambda: MonsterIndex(entries)
+
+
+def spawn_benchmarks(texts, canvas_factory, workdir):
+    largest = max(texts, key=lambda path: len(texts[path]))
+    parsed = {path: parse_spawn_file(text) for path, text in texts.items()}
+    spawn_count = sum(len(spawns) for _, spawns in parsed.values())
+    _, big_spawns = parsed[largest]
+
+    def parse_all(_):
+        for text in texts.values():
+            parse_spawn_file(text)
+    yield "spawn_file.parse_all", spawn_count, parse_all, lambda: None
+    yield f"spawn_file.parse[{largest}]", len(big_spawns), lambda _: parse_spawn_file(texts[largest]), lambda: None
+
+    def format_all(_):
+        for doc, spawns in parsed.values():
+            format_spawn_file(doc, spawns)
+    yield "spawn_file.format_all", spawn_count, format_all, lambda: None
+
+    def project(map_x, map_y):
+        return map_to_scene(map_x, map_y, 1024, 1024, 0.75)
+    yield "scene.sync", len(big_spawns), lambda scene: scene.sync(big_spawns), \
+        lambda: SpawnScene(canvas_factory(), project)
+
+    def synced_scene(spawns=big_spawns):
+        scene = SpawnScene(canvas_factory(), project)
+        scene.sync(spawns)
+        return scene
+    yield "scene.reproject", len(big_spawns), lambda scene: scene.reproject(), synced_scene
+
+    def move_tenth(state):
+        scene, spawns = state
+        for spawn in spawns[::10]:
+            spawn.x = (spawn.x + 1) % 256
+        scene.sync(spawns)
+
+    def scene_with_copies():
+        spawns = [spawn.copy() for spawn in big_spawns]
+        return synced_scene(spawns), spawns
+    yield "scene.sync_changed_10pct", len(big_spawns[::10]), move_tenth, scene_with_copies
+
+    rng = random.Random(SEED)
+    points = [(rng.uniform(0, 255), rng.uniform(0, 255)) for _ in range(HIT_TESTS)]
+
+    def hit_test(scene):
+        grid = scene.grid
+        for x, y in points:
+            grid.near(x, y, 4)
+    yield "grid.near", HIT_TESTS, hit_test, synced_scene
+
+    def history_round_trip(state):
+        history, spawns = state
+        for spawn in spawns[:HISTORY_EDITS]:
+            history.execute(ModifySpawns("Move", [(spawn, {'x': (spawn.x + 1) % 256})]), spawns)
+        while history.undo(spawns):
+            pass
+        while history.redo(spawns):
+            pass
+    edits = min(HISTORY_EDITS, len(big_spawns))
+    yield "history.edit_undo_redo", edits * 3, history_round_trip, \
+        lambda: (History(), [spawn.copy() for spawn in big_spawns])
+
+    # File I/O: write the corpus out once, then load and save through the Repository
+    data_root = os.path.join(workdir, "data")
+    if os.path.exists(data_root):
+        shutil.rmtree(data_root)
+    for path, text in texts.items():
+        target = spawn_file_path(path, os.path.join(data_root, "MonsterSetBase"))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'w', encoding=ENCODING, newline='') as f:
+            f.write(text)
+    repository = Repository(data_root)
+    paths = [repository.map_path(map_file) for map_file in texts]
+    yield "spawn_store.load", spawn_count, lambda _: load_spawn_store(paths), lambda: None
+
+    def edited_sessions():
+        sessions = [repository.open_map(map_file) for map_file in texts]
+        for session in sessions:
+            if session.spawns:
+                session.spawns[0].quantity += 1  # so every file really gets written
+        return sessions
+    yield "repository.save_all", len(texts), lambda sessions: repository.save_maps(sessions, keep=1), \
+        edited_sessions
+
+
+def run(scales=DEFAULT_SCALES, monster_counts=DEFAULT_MONSTERS, repeat=DEFAULT_REPEAT, root=".",
+        display=False, only=None, progress=None, synthetic=()):
+    """Run every benchmark on every corpus; returns the JSON-ready report"""
+    canvas_factory = CountingCanvas
+    tk_root = None
+    if display:
+        import tkinter as tk
+        tk_root = tk.Tk()
+        tk_root.withdraw()
+
+        def canvas_factory():
+            return tk.Canvas(tk_root)
+
+    base = load_corpus(root)
+    results = []
+    workdir = tempfile.mkdtemp(prefix="monster-editor-bench-")
+    try:
+        for corpus in build_corpora(base, scales, monster_counts, synthetic):
+            for name, items, fn, setup in benchmarks(corpus, canvas_factory, workdir):
+                if only and not any(part in name for part in only):
+                    continue
+                result = {"name": name, "corpus": corpus.name, "items": items}
+                result.update(measure(fn, setup, repeat))
+                results.append(result)
+                if progress:
+                    progress(result)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+        if tk_root is not None:
+            tk_root.destroy()
+    return {"meta": environment(repeat, display), "results": results}
+
+
+def environment(repeat, display):
+    meta = {
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "repeat": repeat,
+        "canvas": "tk" if display else "counting",
+        "commit": None,
+    }
+    try:
+        meta["commit"] = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                        text=True, check=True,
+                                        cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        pass
+    try:
+        import resource
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        meta["max_rss_kib"] = maxrss // 1024 if sys.platform == "darwin" else maxrss
+    except ImportError:
+        pass
+    return meta
+
+
+def compare(report, baseline, threshold=DEFAULT_THRESHOLD):
+    """Lines comparing median times with a baseline report, and the number of regressions"""
+    before = {(r["name"], r["corpus"]): r for r in baseline["results"]}
+    lines = []
+    regressions = 0
+    for result in report["results"]:
+        old = before.get((result["name"], result["corpus"]))
+        if old is None or not old["median_ms"]:
+            continue
+        ratio = result["median_ms"] / old["median_ms"]
+        flag = ""
+        if ratio > threshold:
+            flag = "  SLOWER"
+            regressions += 1
+        elif ratio < 1 / threshold:
+            flag = "  faster"
+        lines.append(f"{result['name']:<44} {result['corpus']:<28} {old['median_ms']:>10.2f} -> "
+                     f"{result['median_ms']:>10.2f} ms  x{ratio:.2f}{flag}")
+    return lines, regressions
+
+
+def format_result(result):
+    return (f"{result['name']:<44} {result['corpus']:<28} {result['items']:>8} items  "
+            f"median {result['median_ms']:>10.2f} ms  best {result['best_ms']:>10.2f} ms  "
+            f"peak {result['peak_kib']:>10.1f} KiB")
+
+
+def add_arguments(parser):
+    parser.add_argument("--root", default=".", help="folder that contains Monster/ and MonsterSetBase/ (default: current)")
+    parser.add_argument("--scales", type=int, nargs="*", default=list(DEFAULT_SCALES),
+                        help="spawn multipliers to run (default: 1 10; add 100 for production-sized maps)")
+    parser.add_argument("--monsters", type=int, nargs="*", default=list(DEFAULT_MONSTERS),
+                        help="Monster.txt sizes to run; 0 = as shipped (default: 0 10000)")
+    parser.add_argument("--synthetic", type=int, nargs="*", default=[],
+                        help="also run on generated maps with this many spawns per file (e.g. 5000)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timed runs per benchmark (default: 5)")
+    parser.add_argument("--only", nargs="+", help="run only benchmarks whose name contains one of these")
+    parser.add_argument("--display", action="store_true", help="draw the scene on a real Tk canvas (needs a display)")
+    parser.add_argument("--output", help="write the JSON report to this file (default: stdout)")
+    parser.add_argument("--compare", help="JSON report of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="slowdown factor reported as a regression (default: 1.25)")
+
+
+def bench_command(args):
+    """Run the benchmarks; returns 1 if --compare found regressions"""
+    report = run(args.scales, args.monsters, max(1, args.repeat), args.root, args.display, args.only,
+                 progress=lambda result: print(format_result(result), file=sys.stderr),
+                 synthetic=args.synthetic)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.compare:
+        with open(args.compare, 'r', encoding="utf-8") as f:
+            lines, regressions = compare(report, json.load(f), args.threshold)
+        print("\n".join(lines), file=sys.stderr)
+        print(f"{regressions} regression(s) over x{args.threshold}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
@@ -0,0 +1,22 @@
+"""Tk-free data layer of the Monster & MonsterSetBase editor."""
+from .cache import LRUCache
+from .fileio import BACKUP_KEEP, SaveResult, atomic_write_text, backup_file, save_text_file, save_text_files
+from .monster_txt import (
+    ENCODING,
+    MONSTER_COLUMNS,
+    MonsterTable,
+    load_monster_table,
+    monster_type_from_attribute,
+    parse_monster_txt,
+    save_monster_table,
+)
+from .spawn import SPAWN_FIELDS, Spawn, SpawnStore
+from .spawn_file import (
+    SECTION_COLUMNS,
+    SpawnFile,
+    SpawnSection,
+    format_spawn_file,
+    load_spawn_store,
+    parse_spawn_file,
+    read_spawn_file,
+)
@@ -0,0 +1,79 @@
+"""Edits applied to many spawns at once.
+
+Each function returns a single history command covering every spawn it
+changes, so a bulk edit is one undo step and one redraw.  Fields that a
+spawn's section has no column for (e.g. the quantity of a single monster)
+are left alone, since they would not be saved anyway.
+"""
+from .coords import MAP_MAX
+from .history import DeleteSpawns, ModifySpawns
+from .spawn_file import SECTION_COLUMNS, spawn_type
+
+
+def has_column(spawn, key):
+    """True if the spawn's section stores ``key``"""
+    columns = SECTION_COLUMNS.get(spawn.section)
+    return columns is None or key in columns
+
+
+def _label(name, spawns):
+    return f"{name} ({len(spawns)} Spawns)" if len(spawns) != 1 else name
+
+
+def _modify(name, changes, selection):
+    """ModifySpawns named after the number of spawns it actually changes"""
+    command = ModifySpawns(name, changes, selection)
+    command.name = _label(name, command.changes)
+    return command
+
+
+def _clamp(value):
+    return max(0, min(MAP_MAX, value))
+
+
+def translate_spawns(spawns, dx, dy, selection=-1):
+    """Move spawns by (dx, dy) cells; a spawn stops at the map edge and keeps its area size.
+
+    A spawn that already lies partly outside 0-255 has each coordinate
+    clamped to the map instead.
+    """
+    changes = []
+    for spawn in spawns:
+        values = {}
+        for start, end, delta in (('x', 'end_x', dx), ('y', 'end_y', dy)):
+            low = min(getattr(spawn, start), getattr(spawn, end))
+            high = max(getattr(spawn, start), getattr(spawn, end))
+            if 0 <= low and high <= MAP_MAX:
+                delta = max(-low, min(delta, MAP_MAX - high))
+            values[start] = _clamp(getattr(spawn, start) + delta)
+            values[end] = _clamp(getattr(spawn, end) + delta)
+        changes.append((spawn, values))
+    return _modify("Move", changes, selection)
+
+
+def set_spawn_fields(spawns, values, name="Edit", selection=-1):
+    """Set the same ``values`` on every spawn (only fields its section has)"""
+    changes = [(spawn, {key: value for key, value in values.items() if has_column(spawn, key)})
+               for spawn in spawns]
+    return _modify(name, changes, selection)
+
+
+def scale_quantity(spawns, factor, selection=-1):
+    """Multiply the quantity of area spawns by ``factor`` (rounded, at least 1)"""
+    changes = [(spawn, {'quantity': max(1, int(round(spawn.quantity * factor)))})
+               for spawn in spawns if has_column(spawn, 'quantity')]
+    return _modify("Scale Quantity", changes, selection)
+
+
+def retarget_spawns(spawns, monster_id, mtype=2, selection=-1):
+    """Point spawns at another monster; ``mtype`` is its editor type (0 NPC, 1 Trap, 2 Monster)"""
+    changes = [(spawn, {'monster_id': monster_id, 'type': spawn_type(spawn.section, mtype)})
+               for spawn in spawns]
+    return _modify("Change Monster", changes, selection)
+
+
+def delete_spawns(spawn_list, spawns, selection=-1):
+    """Command removing ``spawns`` (by identity) from ``spawn_list``"""
+    wanted = {id(spawn) for spawn in spawns}
+    items = [(index, spawn) for index, spawn in enumerate(spawn_list) if id(spawn) in wanted]
+    return DeleteSpawns(_label("Remove", items) if len(items) != 1 else "Remove Spawn", items, selection)
@@ -0,0 +1,56 @@
+"""Small least-recently-used cache."""
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Mapping that drops the least recently used entries past ``maxsize``.
+
+    ``weigh(value)`` gives the cost of an entry (1 by default), so the cache
+    can be bounded by e.g. pixel count instead of entry count.  A value that
+    alone weighs more than ``maxsize`` is not stored.
+    """
+
+    def __init__(self, maxsize, weigh=None):
+        self.maxsize = maxsize
+        self.weigh = weigh or (lambda value: 1)
+        self.entries = OrderedDict()   # key -> (value, weight)
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key, default=None):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value):
+        self.pop(key)
+        weight = self.weigh(value)
+        if weight > self.maxsize:
+            return
+        self.entries[key] = (value, weight)
+        self.size += weight
+        while self.size > self.maxsize:
+            _, (_, dropped) = self.entries.popitem(last=False)
+            self.size -= dropped
+
+    def pop(self, key, default=None):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return default
+        self.size -= entry[1]
+        return entry[0]
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
@@ -0,0 +1,70 @@
+"""Catalogue of the spawn files under MonsterSetBase/.
+
+Files are addressed by their path relative to the MonsterSetBase folder,
+with ``/`` separators (``"007 - Atlans.txt"``, ``"Event/011 - Blood Castle
+1.txt"``, ``"Invasion/InvasionSetBase.txt"``), so the same name works as a
+list entry, a dict key and a path on every platform.
+"""
+import os
+import re
+from collections import Counter, namedtuple
+
+from .monster_txt import ENCODING
+from .spawn_file import parse_spawn_file
+
+SPAWN_ROOT = "MonsterSetBase"
+
+MAP_PREFIX_RE = re.compile(r'(\d+)\s*-\s*(.*)$')
+
+# map_number is the number in the file name, or the most common MapNumber of
+# the rows for files without one (InvasionSetBase.txt spans many maps);
+# error is the message of a file that could not be read
+CatalogEntry = namedtuple('CatalogEntry', 'path map_number map_numbers sections lines spawns error',
+                          defaults=(None,))
+
+
+def spawn_file_path(rel_path, root=SPAWN_ROOT):
+    """Filesystem path of a catalogue path"""
+    return os.path.join(root, *rel_path.split("/"))
+
+
+def split_map_name(rel_path):
+    """(map number, map name) from a '007 - Atlans.txt' style name; number is None without a prefix"""
+    base = os.path.splitext(rel_path.rsplit("/", 1)[-1])[0]
+    match = MAP_PREFIX_RE.match(base)
+    if match:
+        return int(match.group(1)), match.group(2).strip()
+    return None, base
+
+
+def list_spawn_files(root=SPAWN_ROOT):
+    """Catalogue paths of every .txt file under ``root``, top level first, sorted"""
+    paths = []
+    for directory, folders, files in os.walk(root):
+        folders.sort()
+        rel_dir = os.path.relpath(directory, root)
+        prefix = "" if rel_dir == os.curdir else rel_dir.replace(os.sep, "/") + "/"
+        paths.extend(prefix + name for name in sorted(files) if name.lower().endswith(".txt"))
+    return paths
+
+
+def scan_spawn_file(rel_path, root=SPAWN_ROOT):
+    """Read one spawn file and summarize it as a CatalogEntry"""
+    with open(spawn_file_path(rel_path, root), 'r', encoding=ENCODING, newline='') as f:
+        text = f.read()
+    doc, spawns = parse_spawn_file(text)
+    counts = Counter(spawn.map_number for spawn in spawns)
+    map_number = split_map_name(rel_path)[0]
+    if map_number is None and counts:
+        map_number = counts.most_common(1)[0][0]
+    return CatalogEntry(rel_path, map_number, tuple(sorted(counts)), tuple(doc.section_types()),
+                        len(text.splitlines()), len(spawns))
+
+
+def scan_catalog(root=SPAWN_ROOT):
+    """Yield a CatalogEntry for every spawn file under ``root``, in list_spawn_files order"""
+    for rel_path in list_spawn_files(root):
+        try:
+            yield scan_spawn_file(rel_path, root)
+        except (OSError, UnicodeError) as e:
+            yield CatalogEntry(rel_path, split_map_name(rel_path)[0], (), (), 0, 0, str(e))
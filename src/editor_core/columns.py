@@ -0,0 +1,49 @@
+"""Helpers for rewriting whitespace-aligned rows in the game's text files."""
+
+
+def split_line_ending(line):
+    """Split a raw line into its body and its line ending"""
+    if line.endswith("\r\n"):
+        return line[:-2], "\r\n"
+    if line.endswith("\n") or line.endswith("\r"):
+        return line[:-1], line[-1]
+    return line, ""
+
+
+def realign(body, spans, tokens):
+    """Replace the tokens at ``spans`` with ``tokens`` keeping the column layout.
+
+    Every new token starts where the old one did, unless the previous token
+    grew past that point, in which case a single space separates them and the
+    following columns catch up again.  Text before the first span and after
+    the last span (such as a trailing comment) is kept.
+    """
+    prefix = body[:spans[0][0]]
+    parts = [prefix]
+    length = len(prefix)
+    for i, ((start, _), token) in enumerate(zip(spans, tokens)):
+        if i:
+            pad = max(start - length, 1)
+            parts.append(" " * pad)
+            length += pad
+        parts.append(token)
+        length += len(token)
+
+    tail = body[spans[-1][1]:]
+    content = tail.lstrip()
+    if content:
+        content_start = len(body) - len(content)
+        parts.append(" " * max(content_start - length, 1))
+        parts.append(content)
+    else:
+        parts.append(tail)
+    return "".join(parts)
+
+
+def pad_columns(tokens, widths):
+    """Format tokens left-aligned in fixed width columns (at least one space apart)"""
+    parts = []
+    for token, width in zip(tokens, widths):
+        token = str(token)
+        parts.append(token.ljust(width) if len(token) < width else token + " ")
+    return "".join(parts)
@@ -0,0 +1,35 @@
+"""Conversion between game coordinates and map image pixels.
+
+Game coordinates run 0-255 on both axes.  The game's X axis runs down the
+map image and its Y axis across, so X maps to image rows and Y to image
+columns.  "Scene" coordinates are pixels of a ``width`` x ``height`` map
+image drawn at ``scale``, i.e. scrollable canvas coordinates.  Every
+function returns (0, 0) for an empty image.
+"""
+
+MAP_MAX = 255
+
+
+def map_to_scene(map_x, map_y, width, height, scale):
+    """Scene pixel of a (possibly fractional) game coordinate"""
+    if width <= 0 or height <= 0:
+        return 0, 0
+    return (map_y / MAP_MAX) * width * scale, (map_x / MAP_MAX) * height * scale
+
+
+def scene_to_map_float(scene_x, scene_y, width, height, scale):
+    """Fractional game coordinate of a scene pixel"""
+    if width <= 0 or height <= 0 or scale <= 0:
+        return 0.0, 0.0
+    return scene_y / (height * scale) * MAP_MAX, scene_x / (width * scale) * MAP_MAX
+
+
+def scene_to_map(scene_x, scene_y, width, height, scale):
+    """Game cell under a scene pixel, rounded and kept within 0-255"""
+    map_x, map_y = scene_to_map_float(scene_x, scene_y, width, height, scale)
+    return max(0, min(MAP_MAX, int(round(map_x)))), max(0, min(MAP_MAX, int(round(map_y))))
+
+
+def cell_pixels(width, height, scale):
+    """On-screen size of one game cell along the shorter image side"""
+    return min(width, height) * scale / MAP_MAX
@@ -0,0 +1,117 @@
+"""Crash-safe file writing."""
+import os
+import shutil
+import tempfile
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# Timestamped copies kept per file by backup_file
+BACKUP_KEEP = 5
+BACKUP_SUFFIX = ".bak"
+# Threads used by save_text_files
+SAVE_WORKERS = 8
+
+SaveResult = namedtuple('SaveResult', 'path written backup error')
+
+
+def _read_umask():
+    # os.umask can only be read by setting it; done once, before any save threads start
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+
+# Mode of a newly created file, as open() would give it
+NEW_FILE_MODE = 0o666 & ~_read_umask()
+
+
+def atomic_write_text(path, text, encoding="utf-8"):
+    """Write ``text`` to ``path`` through a temp file and an atomic rename.
+
+    The temp file lives in the target directory so the rename never crosses
+    file systems; a crash leaves either the old file or the new one.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".txt", dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding=encoding, newline='') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            shutil.copymode(path, temp_path)
+        else:
+            os.chmod(temp_path, NEW_FILE_MODE)  # mkstemp creates it 0600
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def backup_file(path, backup_dir, keep=BACKUP_KEEP):
+    """Copy ``path`` to ``backup_dir`` as ``<name>.<timestamp>.bak``; keeps the newest ``keep`` copies.
+
+    Returns the backup path, or None if ``path`` does not exist.
+    """
+    if not os.path.exists(path):
+        return None
+    os.makedirs(backup_dir, exist_ok=True)
+    name = os.path.basename(path)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    backup_path = os.path.join(backup_dir, f"{name}.{stamp}{BACKUP_SUFFIX}")
+    shutil.copy2(path, backup_path)
+
+    # Timestamps sort in time order, so the oldest copies come first
+    prefix = name + "."
+    backups = sorted(entry for entry in os.listdir(backup_dir)
+                     if entry.startswith(prefix) and entry.endswith(BACKUP_SUFFIX))
+    for old in backups[:max(0, len(backups) - keep)]:
+        try:
+            os.unlink(os.path.join(backup_dir, old))
+        except OSError:
+            pass
+    return backup_path
+
+
+def save_text_file(path, text, encoding="utf-8", backup_dir=None, keep=BACKUP_KEEP):
+    """Atomically replace ``path`` with ``text``, backing up the old file first.
+
+    A file whose content is already ``text`` is left alone.  Returns a
+    SaveResult; errors are raised.
+    """
+    try:
+        with open(path, 'r', encoding=encoding, newline='') as f:
+            if f.read() == text:
+                return SaveResult(path, False, None, None)
+    except (OSError, UnicodeError):
+        pass
+    backup = backup_file(path, backup_dir, keep) if backup_dir else None
+    atomic_write_text(path, text, encoding=encoding)
+    return SaveResult(path, True, backup, None)
+
+
+def save_text_files(files, encoding="utf-8", keep=BACKUP_KEEP, workers=None):
+    """Save ``(path, text, backup_dir)`` items; returns a SaveResult per item, in order.
+
+    Files are written concurrently on ``workers`` threads (the waiting is on
+    disk I/O and fsync, which release the GIL); ``workers=1`` writes them one
+    after another.  A file that fails doesn't stop the others; its result
+    carries the error.
+    """
+    files = list(files)
+
+    def save(item):
+        path, text, backup_dir = item
+        try:
+            return save_text_file(path, text, encoding, backup_dir, keep)
+        except (OSError, UnicodeError) as e:
+            return SaveResult(path, False, None, e)
+
+    if workers == 1 or len(files) < 2:
+        return [save(item) for item in files]
+    with ThreadPoolExecutor(max_workers=min(workers or SAVE_WORKERS, len(files))) as pool:
+        return list(pool.map(save, files))
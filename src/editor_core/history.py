@@ -0,0 +1,125 @@
+"""Undo/redo history that stores edits instead of snapshots.
+
+Every command records only the spawns it inserted, deleted or changed, so
+recording an action costs the same on a 10-line file as on a 600-line one
+and the history can hold thousands of steps.  Commands edit the spawn list
+in place and keep the Spawn objects themselves, so the canvas scene (which
+tracks spawns by identity) only redraws the spawns that changed.
+"""
+from collections import deque
+
+# Number of actions kept per map
+HISTORY_LIMIT = 5000
+
+
+class Command:
+    """One undoable action on a spawn list"""
+
+    def __init__(self, name, selection=-1):
+        self.name = name
+        self.selection = selection  # selected spawn index before the action
+        self.redo_selection = -1  # selected spawn index when it was undone
+
+    def apply(self, spawns):
+        raise NotImplementedError
+
+    def revert(self, spawns):
+        raise NotImplementedError
+
+
+class InsertSpawns(Command):
+    """Insert spawns at the given list positions (``items`` is [(index, spawn)])"""
+
+    def __init__(self, name, items, selection=-1):
+        super().__init__(name, selection)
+        self.items = sorted(items, key=lambda item: item[0])
+
+    def apply(self, spawns):
+        for index, spawn in self.items:
+            spawns.insert(index, spawn)
+
+    def revert(self, spawns):
+        for index, _ in reversed(self.items):
+            del spawns[index]
+
+
+class DeleteSpawns(InsertSpawns):
+    """Remove the spawns at the given list positions (``items`` is [(index, spawn)])"""
+
+    def apply(self, spawns):
+        InsertSpawns.revert(self, spawns)
+
+    def revert(self, spawns):
+        InsertSpawns.apply(self, spawns)
+
+
+class ModifySpawns(Command):
+    """Change fields of spawns; ``changes`` is [(spawn, {key: new value})]"""
+
+    def __init__(self, name, changes, selection=-1):
+        super().__init__(name, selection)
+        self.changes = []
+        for spawn, values in changes:
+            before = {key: getattr(spawn, key) for key in values if getattr(spawn, key) != values[key]}
+            if before:
+                after = {key: values[key] for key in before}
+                self.changes.append((spawn, before, after))
+
+    def __bool__(self):
+        return bool(self.changes)
+
+    def apply(self, spawns):
+        for spawn, _, after in self.changes:
+            for key, value in after.items():
+                setattr(spawn, key, value)
+
+    def revert(self, spawns):
+        for spawn, before, _ in reversed(self.changes):
+            for key, value in before.items():
+                setattr(spawn, key, value)
+
+
+class History:
+    """Undo and redo stacks of Commands for one spawn list"""
+
+    def __init__(self, limit=HISTORY_LIMIT):
+        self.undo_stack = deque(maxlen=limit)
+        self.redo_stack = []
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+
+    def execute(self, command, spawns):
+        """Apply ``command`` to ``spawns`` and record it"""
+        command.apply(spawns)
+        self.undo_stack.append(command)
+        self.redo_stack.clear()
+        return command
+
+    def undo(self, spawns, selection=-1):
+        """Revert the last command; returns it, or None if there is nothing to undo"""
+        if not self.undo_stack:
+            return None
+        command = self.undo_stack.pop()
+        command.revert(spawns)
+        command.redo_selection = selection
+        self.redo_stack.append(command)
+        return command
+
+    def redo(self, spawns):
+        """Re-apply the last undone command; returns it, or None"""
+        if not self.redo_stack:
+            return None
+        command = self.redo_stack.pop()
+        command.apply(spawns)
+        self.undo_stack.append(command)
+        return command
+
+    @property
+    def undo_name(self):
+        return self.undo_stack[-1].name if self.undo_stack else None
+
+    @property
+    def redo_name(self):
+        return self.redo_stack[-1].name if self.redo_stack else None
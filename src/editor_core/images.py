@@ -0,0 +1,116 @@
+"""Lookup of the map image for a spawn file.
+
+The Images folder is listed once and indexed by normalized name (lowercase,
+spaces and underscores alike), so finding an image is a dict lookup instead
+of a stat per candidate name.  An optional manifest, ``Images/maps.txt``,
+maps numbers to image files explicitly::
+
+    // MapNumber    Image
+    37              Kanturu_Ruins.png
+    38              Kanturu_Relics.png
+
+The index is rebuilt when the folder or the manifest changes.
+"""
+import os
+import re
+import time
+
+from .monster_txt import ENCODING
+
+IMAGE_DIR = "Images"
+MANIFEST_NAME = "maps.txt"
+IMAGE_EXTENSIONS = (".png",)
+
+# Map names whose image is named differently
+NAME_OVERRIDES = {
+    'Kanturu 1': 'Kanturu_Ruins.png',
+    'Kanturu 2': 'Kanturu_Relics.png',
+}
+
+# Seconds between checks of the folder mtime (each check is a stat, slow on network shares)
+REFRESH_INTERVAL = 2.0
+
+_SEPARATORS_RE = re.compile(r'[\s_]+')
+
+
+def normalize_name(name):
+    """'Lost Tower', 'lost_tower' and 'LOST_TOWER' all become 'lost_tower'"""
+    return _SEPARATORS_RE.sub('_', name.strip().lower())
+
+
+def parse_manifest(text):
+    """{map number: image file name} from the manifest text"""
+    manifest = {}
+    for line in text.splitlines():
+        line = line.split("//", 1)[0].strip()
+        if not line:
+            continue
+        parts = line.split(None, 1)
+        if len(parts) == 2 and parts[0].isdigit():
+            manifest[int(parts[0])] = parts[1].strip()
+    return manifest
+
+
+class MapImageCatalog:
+    """Map name / number -> image path, built from one listing of ``directory``"""
+
+    def __init__(self, directory=IMAGE_DIR, refresh_interval=REFRESH_INTERVAL):
+        self.directory = directory
+        self.refresh_interval = refresh_interval
+        self.exists = False
+        self.files = {}       # normalized stem -> file name
+        self.manifest = {}    # map number -> file name
+        self.resolved = {}    # (map name, map number) -> path or None
+        self._stamp = None
+        self._checked = None
+
+    def refresh(self, force=False):
+        """Re-list the folder if it (or the manifest) changed; checks at most every refresh_interval"""
+        now = time.monotonic()
+        if not force and self._checked is not None and now - self._checked < self.refresh_interval:
+            return
+        self._checked = now
+        stamp = (_mtime(self.directory), _mtime(os.path.join(self.directory, MANIFEST_NAME)))
+        if stamp == self._stamp and not force:
+            return
+        self._stamp = stamp
+        self.exists = stamp[0] is not None
+        self.files = {}
+        self.manifest = {}
+        self.resolved = {}
+        if not self.exists:
+            return
+        for name in sorted(os.listdir(self.directory)):
+            stem, ext = os.path.splitext(name)
+            if ext.lower() in IMAGE_EXTENSIONS:
+                self.files.setdefault(normalize_name(stem), name)
+        if stamp[1] is not None:
+            with open(os.path.join(self.directory, MANIFEST_NAME), 'r', encoding=ENCODING) as f:
+                self.manifest = parse_manifest(f.read())
+
+    def resolve(self, map_name, map_number=None):
+        """Path of the image for a map, or None"""
+        self.refresh()
+        key = (map_name, map_number)
+        if key not in self.resolved:
+            self.resolved[key] = self._find(map_name, map_number)
+        return self.resolved[key]
+
+    def _find(self, map_name, map_number):
+        for explicit in (self.manifest.get(map_number), NAME_OVERRIDES.get(map_name)):
+            name = explicit and self.files.get(normalize_name(os.path.splitext(explicit)[0]))
+            if name:
+                return os.path.join(self.directory, name)
+        wanted = normalize_name(map_name)
+        name = self.files.get(wanted)
+        if name is None:
+            # Fallback: a file whose name contains the map name
+            name = next((name for stem, name in self.files.items() if wanted in stem), None)
+        return os.path.join(self.directory, name) if name else None
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
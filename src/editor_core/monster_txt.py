@@ -0,0 +1,225 @@
+"""Parser for Monster/Monster.txt.
+
+The file is tokenized once and stored column by column, so the editor and
+command line scripts can share it without building a Tk root.
+"""
+import re
+from array import array
+
+from .columns import realign, split_line_ending
+from .fileio import atomic_write_text
+
+# Every column of Monster.txt in file order: (column name, stats key).
+# The stats keys are the ones used by the editor's stats panel.
+MONSTER_COLUMNS = (
+    ("Index", "id"),
+    ("Rate", "rate"),
+    ("Name", "name"),
+    ("Level", "level"),
+    ("MaxLife", "hp"),
+    ("MaxMana", "mp"),
+    ("DamageMin", "mindmg"),
+    ("DamageMax", "maxdmg"),
+    ("Defense", "defense"),
+    ("MagicDefense", "magdefense"),
+    ("AttackRate", "attackrate"),
+    ("DefenseRate", "success"),
+    ("MoveRange", "moverange"),
+    ("AttackType", "attacktype"),
+    ("AttackRange", "attackrange"),
+    ("ViewRange", "viewrange"),
+    ("MoveSpeed", "movespeed"),
+    ("AttackSpeed", "attackspeed"),
+    ("RegenTime", "regtime"),
+    ("Attribute", "attribute"),
+    ("ItemRate", "itemrate"),
+    ("MoneyRate", "moneyrate"),
+    ("MaxItemLevel", "maxistone"),
+    ("MonsterSkill", "skill"),
+    ("Resistance1", "resistice"),
+    ("Resistance2", "resistpoison"),
+    ("Resistance3", "resistwind"),
+    ("Resistance4", "resistfire"),
+)
+
+MONSTER_KEYS = tuple(key for _, key in MONSTER_COLUMNS)
+NAME_COLUMN = MONSTER_KEYS.index("name")
+
+# Columns that can be edited in place (Index is the row key)
+EDITABLE_KEYS = frozenset(MONSTER_KEYS) - {"id"}
+
+# Quoted field (may contain spaces) or a run of non-whitespace
+TOKEN_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+# Files are read as latin-1 so every byte maps to one character and back
+ENCODING = "latin-1"
+
+
+def _to_int(text):
+    try:
+        return int(text)
+    except ValueError:
+        return 0
+
+
+def monster_type_from_attribute(attribute):
+    """Map the Attribute column to the editor's type (0 = NPC, 1 = Trap, 2 = Monster)"""
+    return attribute if attribute in (0, 1, 2) else 2
+
+
+class MonsterTable:
+    """Columnar view of Monster.txt keyed by the Index column.
+
+    Numeric columns are stored as ``array('i')`` and names as a list.  The
+    original lines are kept so the file can be rewritten without losing
+    alignment or columns the editor doesn't show.
+    """
+
+    def __init__(self):
+        self.lines = []            # raw file lines, line endings included
+        self.row_lines = array('i')  # line number of each row
+        self.columns = {key: array('i') for key in MONSTER_KEYS if key != "name"}
+        self.names = []
+        self.rows = {}             # monster id -> row number (last one wins)
+        self.dirty = set()         # rows changed since the last load/save
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, monster_id):
+        return monster_id in self.rows
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def get(self, monster_id, key, default=None):
+        """Return a single field of a monster"""
+        row = self.rows.get(monster_id)
+        if row is None:
+            return default
+        if key == "name":
+            return self.names[row]
+        if key == "type":
+            return monster_type_from_attribute(self.columns["attribute"][row])
+        return self.columns[key][row]
+
+    def name(self, monster_id, default="Unknown"):
+        return self.get(monster_id, "name", default)
+
+    def monster_type(self, monster_id, default=2):
+        return self.get(monster_id, "type", default)
+
+    def record(self, monster_id):
+        """Return every column of a monster as a dict, plus its editor type"""
+        row = self.rows[monster_id]
+        record = {key: column[row] for key, column in self.columns.items()}
+        record["name"] = self.names[row]
+        record["type"] = monster_type_from_attribute(record["attribute"])
+        return record
+
+    def set(self, monster_id, key, value):
+        """Change one field of a monster; returns True if the value changed"""
+        if key not in EDITABLE_KEYS:
+            raise KeyError(key)
+        row = self.rows[monster_id]
+        if key == "name":
+            value = str(value).replace('"', "'")
+            if self.names[row] == value:
+                return False
+            self.names[row] = value
+        else:
+            column = self.columns[key]
+            value = int(value)
+            if column[row] == value:
+                return False
+            column[row] = value
+        self.dirty.add(row)
+        return True
+
+    def update(self, monster_id, values):
+        """Apply every known column in ``values``; other keys are ignored.
+
+        Every value is checked first, so a value that doesn't fit its column
+        raises OverflowError (or ValueError) before anything is changed.
+        """
+        values = {key: value for key, value in values.items() if key in EDITABLE_KEYS}
+        if monster_id not in self.rows:
+            raise KeyError(monster_id)
+        for key, value in values.items():
+            if key != "name":
+                array(self.columns[key].typecode, [int(value)])
+        changed = False
+        for key, value in values.items():
+            changed = self.set(monster_id, key, value) or changed
+        return changed
+
+    def format_row(self, row):
+        """Render a row back into its original line, keeping the alignment"""
+        body, ending = split_line_ending(self.lines[self.row_lines[row]])
+        matches = list(TOKEN_RE.finditer(body))[:len(MONSTER_KEYS)]
+        tokens = []
+        for column_no, key in enumerate(MONSTER_KEYS):
+            if column_no == NAME_COLUMN:
+                tokens.append(f'"{self.names[row]}"')
+            else:
+                tokens.append(str(self.columns[key][row]))
+        body = realign(body, [m.span() for m in matches], tokens)
+        # Rows that were shorter than the header get their missing columns appended
+        missing = tokens[len(matches):]
+        if missing:
+            body = body.rstrip() + " " + " ".join(missing)
+        return body + ending
+
+
+def parse_monster_txt(text):
+    """Parse the contents of Monster.txt into a MonsterTable"""
+    table = MonsterTable()
+    table.lines = text.splitlines(keepends=True)
+    width = len(MONSTER_KEYS)
+    values = []
+    row_lines = table.row_lines
+
+    for line_no, line in enumerate(table.lines):
+        stripped = line.strip()
+        if not stripped or stripped.startswith("//") or not stripped[0].isdigit():
+            continue
+        fields = [quoted or bare for quoted, bare in TOKEN_RE.findall(stripped)]
+        if len(fields) < 3 or not fields[0].isdigit():
+            continue
+        if len(fields) < width:
+            fields.extend(["0"] * (width - len(fields)))
+        values.append(fields[:width])
+        row_lines.append(line_no)
+
+    if not values:
+        return table
+
+    for column_no, column in enumerate(zip(*values)):
+        key = MONSTER_KEYS[column_no]
+        if column_no == NAME_COLUMN:
+            table.names = list(column)
+        else:
+            table.columns[key] = array('i', map(_to_int, column))
+
+    table.rows = {monster_id: row for row, monster_id in enumerate(table.columns["id"])}
+    return table
+
+
+def load_monster_table(path):
+    """Read and parse a Monster.txt file"""
+    with open(path, 'r', encoding=ENCODING, newline='') as f:
+        return parse_monster_txt(f.read())
+
+
+def save_monster_table(table, path):
+    """Write the changed rows of ``table`` back to ``path``.
+
+    Only dirty rows are re-rendered; every other line is written exactly as
+    it was read.  The file is replaced atomically.
+    """
+    changed = {table.row_lines[row]: table.format_row(row) for row in table.dirty}
+    lines = [changed.get(line_no, line) for line_no, line in enumerate(table.lines)]
+    atomic_write_text(path, "".join(lines), encoding=ENCODING)
+    table.lines = lines
+    table.dirty.clear()
+    return len(changed)
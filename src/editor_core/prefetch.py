@@ -0,0 +1,84 @@
+"""Background loading of data the user is likely to ask for next."""
+from concurrent.futures import ThreadPoolExecutor
+
+from .cache import LRUCache
+
+
+class Prefetcher:
+    """Runs ``load(key)`` on a thread pool and keeps the results in an LRUCache.
+
+    Only the thread that owns the prefetcher (the Tk thread in the editor)
+    calls its methods; the workers just run ``load``, so the cache needs no
+    locking.  Finished loads are moved into the cache whenever the prefetcher
+    is used.  A load that failed in the background is retried by ``get``, so
+    its error is raised to the caller.
+    """
+
+    def __init__(self, load, maxsize, weigh=None, workers=2, name="prefetch"):
+        self.load = load
+        self.cache = LRUCache(maxsize, weigh)
+        self.pending = {}   # key -> Future
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+
+    def __contains__(self, key):
+        return key in self.cache or key in self.pending
+
+    def prefetch(self, keys):
+        """Start loading ``keys`` in order; queued loads for other keys are cancelled"""
+        self._collect()
+        keys = list(dict.fromkeys(keys))
+        for key, future in list(self.pending.items()):
+            if key not in keys and future.cancel():
+                del self.pending[key]
+        for key in keys:
+            if key not in self.cache and key not in self.pending:
+                self.pending[key] = self.pool.submit(self.load, key)
+
+    def get(self, key):
+        """Value for ``key``: from the cache, from a load in progress, or loaded now"""
+        self._collect()
+        value = self.cache.get(key)
+        if value is not None:
+            return value
+        future = self.pending.pop(key, None)
+        value = None
+        if future is not None and not future.cancelled():
+            try:
+                value = future.result()
+            except Exception:
+                value = None  # loaded again below, so the error reaches the caller
+        if value is None:
+            value = self.load(key)
+        self.cache.put(key, value)
+        return value
+
+    def take(self, key):
+        """Like get, but the value leaves the cache (for values the caller goes on to modify)"""
+        value = self.get(key)
+        self.cache.pop(key)
+        return value
+
+    def discard(self, key):
+        future = self.pending.pop(key, None)
+        if future is not None:
+            future.cancel()
+        self.cache.pop(key)
+
+    def clear(self):
+        for future in self.pending.values():
+            future.cancel()
+        self.pending.clear()
+        self.cache.clear()
+
+    def shutdown(self):
+        self.clear()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def _collect(self):
+        """Move finished background loads into the cache"""
+        for key, future in list(self.pending.items()):
+            if not future.done():
+                continue
+            del self.pending[key]
+            if not future.cancelled() and future.exception() is None:
+                self.cache.put(key, future.result())
@@ -0,0 +1,164 @@
+"""Opt-in timing of the editor's handlers.
+
+Methods decorated with ``@profiled`` record their wall time into the
+module's ``PROFILER`` once it is enabled.  While it is disabled (the
+default) a call costs one attribute check on top of the call itself, so
+the decorators stay in the shipped build.  Times are inclusive: a handler
+that calls another handler counts the inner one too.
+
+``PROFILER.start_cprofile()`` / ``stop_cprofile(path)`` capture a full
+cProfile of the same period for a closer look (e.g. with snakeviz).
+"""
+import cProfile
+import functools
+import io
+import json
+import pstats
+import threading
+import time
+
+# Upper bounds (ms) of the histogram buckets; the last bucket takes everything slower
+BUCKET_LIMITS_MS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+
+class TimingStats:
+    """Call count, total/max time and a histogram of call durations for one handler"""
+
+    __slots__ = ('count', 'total_ms', 'max_ms', 'last_ms', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms = 0.0
+        self.buckets = [0] * (len(BUCKET_LIMITS_MS) + 1)
+
+    def add(self, ms):
+        self.count += 1
+        self.total_ms += ms
+        self.last_ms = ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+        for n, limit in enumerate(BUCKET_LIMITS_MS):
+            if ms < limit:
+                self.buckets[n] += 1
+                return
+        self.buckets[-1] += 1
+
+    @property
+    def mean_ms(self):
+        return self.total_ms / self.count if self.count else 0.0
+
+    def to_dict(self):
+        labels = [f"<{limit}ms" for limit in BUCKET_LIMITS_MS] + [f">={BUCKET_LIMITS_MS[-1]}ms"]
+        return {"count": self.count, "total_ms": round(self.total_ms, 3), "mean_ms": round(self.mean_ms, 3),
+                "max_ms": round(self.max_ms, 3), "histogram": dict(zip(labels, self.buckets))}
+
+
+class Profiler:
+    """Named TimingStats plus plain event counters; safe to record from worker threads"""
+
+    def __init__(self):
+        self.enabled = False
+        self.stats = {}       # handler name -> TimingStats
+        self.counters = {}    # event name -> count
+        self.last = None      # (name, ms) of the latest recorded call
+        self.started = None
+        self._lock = threading.Lock()
+        self._cprofile = None
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+        if enabled and self.started is None:
+            self.started = time.time()
+
+    def reset(self):
+        with self._lock:
+            self.stats.clear()
+            self.counters.clear()
+            self.last = None
+            self.started = time.time() if self.enabled else None
+
+    def record(self, name, ms):
+        with self._lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = TimingStats()
+            stats.add(ms)
+            self.last = (name, ms)
+
+    def count(self, name, n=1):
+        """Add ``n`` to a counter (e.g. canvas items drawn); does nothing while disabled"""
+        if self.enabled:
+            with self._lock:
+                self.counters[name] = self.counters.get(name, 0) + n
+
+    def summary(self):
+        """One-line readout for the status bar"""
+        if self.last is None:
+            return "Profiling: no calls yet"
+        name, ms = self.last
+        stats = self.stats[name]
+        return f"{name} {ms:.1f} ms (avg {stats.mean_ms:.1f}, max {stats.max_ms:.1f}, {stats.count}x)"
+
+    def rows(self):
+        """(name, TimingStats) sorted by total time, slowest first"""
+        with self._lock:
+            return sorted(self.stats.items(), key=lambda item: item[1].total_ms, reverse=True)
+
+    def report(self):
+        """JSON-ready dict of every handler and counter"""
+        return {
+            "started": self.started,
+            "dumped": time.time(),
+            "buckets_ms": list(BUCKET_LIMITS_MS),
+            "handlers": {name: stats.to_dict() for name, stats in self.rows()},
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+    def dump(self, path):
+        with open(path, 'w', encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+            f.write("\n")
+
+    @property
+    def cprofile_running(self):
+        return self._cprofile is not None
+
+    def start_cprofile(self):
+        if self._cprofile is None:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def stop_cprofile(self, path=None, top=30):
+        """Stop the capture; writes it to ``path`` (pstats format) if given and returns the top entries as text"""
+        profile, self._cprofile = self._cprofile, None
+        if profile is None:
+            return ""
+        profile.disable()
+        if path:
+            profile.dump_stats(path)
+        out = io.StringIO()
+        pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(top)
+        return out.getvalue()
+
+
+PROFILER = Profiler()
+
+
+def profiled(name=None, profiler=PROFILER):
+    """Decorator that times calls into ``profiler`` while it is enabled"""
+    def decorate(fn):
+        key = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                profiler.record(key, (time.perf_counter() - start) * 1000)
+        return wrapper
+    return decorate
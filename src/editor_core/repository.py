@@ -0,0 +1,115 @@
+"""Where the editor's data files live, and reading and writing them.
+
+A ``Repository`` is rooted at the folder that holds ``Monster/Monster.txt``,
+``MonsterSetBase/`` and ``Images/`` (the editor uses the current folder).
+It needs no display, so batch tools and benchmarks can open and save maps
+exactly like the editor does::
+
+    repo = Repository("/srv/mu/Data")
+    monsters = repo.load_monsters()
+    session = repo.open_map("007 - Atlans.txt", monsters.monster_type)
+    session.execute(ModifySpawns("Move", [(session.spawns[0], {'x': 120})]))
+    repo.save_maps([session], monsters.name)
+"""
+import os
+
+from .catalog import SPAWN_ROOT, list_spawn_files, scan_catalog, spawn_file_path
+from .fileio import BACKUP_KEEP, save_text_files
+from .images import IMAGE_DIR, MapImageCatalog
+from .monster_txt import ENCODING, load_monster_table, save_monster_table
+from .session import MapSession
+from .spawn_file import format_spawn_file, read_spawn_file
+
+MONSTER_FILE = os.path.join("Monster", "Monster.txt")
+# Previous versions of saved spawn files go to Backups/<same path>
+BACKUP_ROOT = "Backups"
+
+
+class Repository:
+    """Data files under ``root``"""
+
+    def __init__(self, root="."):
+        self.root = root
+        self.monster_file = os.path.normpath(os.path.join(root, MONSTER_FILE))
+        self.spawn_root = os.path.normpath(os.path.join(root, SPAWN_ROOT))
+        self.backup_root = os.path.normpath(os.path.join(root, BACKUP_ROOT))
+        self.images = MapImageCatalog(os.path.normpath(os.path.join(root, IMAGE_DIR)))
+
+    # Monster.txt
+
+    def has_monster_file(self):
+        return os.path.isfile(self.monster_file)
+
+    def create_monster_dir(self):
+        """Create the folder Monster.txt goes in; returns False if it already existed"""
+        return _make_dir(os.path.dirname(self.monster_file))
+
+    def load_monsters(self):
+        return load_monster_table(self.monster_file)
+
+    def save_monsters(self, table):
+        """Write the edited rows of ``table``; returns how many were written"""
+        return save_monster_table(table, self.monster_file)
+
+    # MonsterSetBase
+
+    def create_spawn_root(self):
+        """Create MonsterSetBase/; returns False if it already existed"""
+        return _make_dir(self.spawn_root)
+
+    def list_maps(self):
+        """Paths (relative to MonsterSetBase/) of every spawn file"""
+        return list_spawn_files(self.spawn_root)
+
+    def scan_maps(self):
+        """Yield a CatalogEntry per spawn file"""
+        return scan_catalog(self.spawn_root)
+
+    def map_path(self, map_file):
+        return spawn_file_path(map_file, self.spawn_root)
+
+    def map_mtime(self, map_file):
+        """Modification time of a spawn file, to tell whether a read copy is stale"""
+        return os.path.getmtime(self.map_path(map_file))
+
+    def read_map(self, map_file, monster_type=None):
+        """Parse a spawn file into (mtime, document, spawns)"""
+        mtime = self.map_mtime(map_file)
+        document, spawns = read_spawn_file(self.map_path(map_file), monster_type)
+        return mtime, document, spawns
+
+    def open_map(self, map_file, monster_type=None):
+        """Read a spawn file into a new MapSession"""
+        _, document, spawns = self.read_map(map_file, monster_type)
+        return MapSession(map_file, document, spawns)
+
+    def map_text(self, session, monster_name=None):
+        """File text of a session; spawns go back into the sections they were read from"""
+        return format_spawn_file(session.document, session.spawns, monster_name)
+
+    def backup_dir(self, path):
+        return os.path.join(self.backup_root, os.path.relpath(os.path.dirname(os.path.abspath(path)),
+                                                              os.path.abspath(self.root)))
+
+    def save_maps(self, sessions, monster_name=None, workers=None, keep=BACKUP_KEEP):
+        """Save sessions atomically with backups, writing in parallel; returns a SaveResult per session"""
+        files = []
+        for session in sessions:
+            path = self.map_path(session.map_file)
+            files.append((path, self.map_text(session, monster_name), self.backup_dir(path)))
+        return save_text_files(files, encoding=ENCODING, keep=keep, workers=workers)
+
+    # Images
+
+    def create_image_dir(self):
+        """Create Images/ and rescan it; returns False if it already existed"""
+        created = _make_dir(self.images.directory)
+        self.images.refresh(force=True)
+        return created
+
+
+def _make_dir(path):
+    if os.path.isdir(path):
+        return False
+    os.makedirs(path, exist_ok=True)
+    return True
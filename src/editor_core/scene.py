@@ -0,0 +1,206 @@
+"""Retained model of the spawn markers drawn on the map canvas.
+
+The scene remembers which canvas items belong to which spawn, so a redraw
+only touches the items whose spawn changed.  It talks to the canvas through
+the usual Tk canvas methods and has no Tk import of its own.  It also keeps
+a SpawnGrid of the same spawns for hit-testing.
+"""
+from .spatial import SpawnGrid, has_area
+
+# Marker colour per spawn type; anything else is a standard monster (red)
+TYPE_COLORS = {0: "yellow", 1: "blue", 3: "green", 4: "cyan"}
+DEFAULT_COLOR = "red"
+
+SPAWN_TAG = "spawn"
+
+
+class _Entry:
+    __slots__ = ('spawn', 'oval', 'rect', 'state', 'highlighted')
+
+    def __init__(self, spawn):
+        self.spawn = spawn
+        self.oval = None
+        self.rect = None
+        self.state = None
+        self.highlighted = False
+
+
+def spawn_state(spawn):
+    """Everything about a spawn that affects how it is drawn"""
+    return (spawn.x, spawn.y, spawn.end_x, spawn.end_y, spawn.type, spawn.monster_id)
+
+
+class SpawnScene:
+    """Maps each spawn to its canvas items.
+
+    ``project(map_x, map_y)`` converts game coordinates into canvas
+    coordinates.  Spawns are tracked by identity, so the same Spawn must stay
+    in the editor's list for its items to be reused.
+    """
+
+    def __init__(self, canvas, project):
+        self.canvas = canvas
+        self.project = project
+        self.entries = {}      # id(spawn) -> _Entry
+        self.items = {}        # canvas item id -> _Entry
+        self.by_monster = {}   # monster id -> set of id(spawn)
+        self.selected = None   # selected spawn (highlighted)
+        self.marked = {}       # id(spawn) -> spawn of a multi-selection (highlighted)
+        self.monster_id = None  # selected monster (all its spawns highlighted)
+        self.hidden = False
+        self.grid = SpawnGrid()  # spatial index of the same spawns
+
+    def __len__(self):
+        return len(self.entries)
+
+    def reset(self):
+        """Forget every item; call after the canvas was cleared"""
+        self.entries.clear()
+        self.items.clear()
+        self.marked.clear()
+        self.by_monster.clear()
+        self.grid.clear()
+
+    def spawn_at(self, item):
+        """Return the spawn drawn by a canvas item, or None"""
+        entry = self.items.get(item)
+        return entry.spawn if entry else None
+
+    # Keeping the scene in sync with the spawn list
+
+    def sync(self, spawns):
+        """Bring the canvas in line with ``spawns``, touching only changed items"""
+        seen = set()
+        entries = self.entries
+        for spawn in spawns:
+            key = id(spawn)
+            seen.add(key)
+            entry = entries.get(key)
+            if entry is None:
+                self.add(spawn)
+            elif entry.state != spawn_state(spawn):
+                self.update(spawn)
+        for key in [key for key in entries if key not in seen]:
+            self._remove_entry(entries[key])
+
+    def add(self, spawn):
+        entry = _Entry(spawn)
+        self.entries[id(spawn)] = entry
+        self._draw(entry)
+
+    def update(self, spawn):
+        """Redraw one spawn after its position, type or monster changed"""
+        entry = self.entries.get(id(spawn))
+        if entry is None:
+            self.add(spawn)
+        else:
+            self._draw(entry)
+
+    def remove(self, spawn):
+        entry = self.entries.get(id(spawn))
+        if entry is not None:
+            self._remove_entry(entry)
+
+    # Selection, visibility and zoom
+
+    def set_selection(self, spawn=None, monster_id=None, marked=()):
+        """Highlight ``spawn``, the ``marked`` spawns and every spawn of ``monster_id``;
+        re-styles only what changed"""
+        affected = set(self.marked)
+        if self.selected is not None:
+            affected.add(id(self.selected))
+        affected |= self.by_monster.get(self.monster_id, set())
+        self.selected = spawn
+        self.monster_id = monster_id
+        self.marked = {id(spawn): spawn for spawn in marked}
+        affected |= self.marked.keys()
+        if spawn is not None:
+            affected.add(id(spawn))
+        affected |= self.by_monster.get(monster_id, set())
+        for key in affected:
+            entry = self.entries.get(key)
+            if entry is not None and entry.highlighted != self._is_highlighted(entry.spawn):
+                self._draw(entry)
+
+    def set_hidden(self, hidden):
+        if hidden != self.hidden:
+            self.hidden = hidden
+            self.canvas.itemconfigure(SPAWN_TAG, state="hidden" if hidden else "normal")
+
+    def reproject(self):
+        """Move every item after the scale changed"""
+        for entry in self.entries.values():
+            self._place(entry)
+
+    # Drawing
+
+    def _is_highlighted(self, spawn):
+        return (spawn is self.selected or id(spawn) in self.marked or
+                (self.monster_id is not None and spawn.monster_id == self.monster_id))
+
+    def _draw(self, entry):
+        spawn = entry.spawn
+        canvas = self.canvas
+        state = spawn_state(spawn)
+        if entry.state is not None and entry.state[5] != state[5]:
+            self._unindex_monster(entry)
+        if entry.state is None or entry.state[5] != state[5]:
+            self.by_monster.setdefault(spawn.monster_id, set()).add(id(spawn))
+        if entry.state is None or entry.state[:5] != state[:5]:
+            self.grid.update(spawn)
+
+        color = TYPE_COLORS.get(spawn.type, DEFAULT_COLOR)
+        highlighted = self._is_highlighted(spawn)
+        outline = "white" if highlighted else "black"
+        item_state = "hidden" if self.hidden else "normal"
+
+        if entry.oval is None:
+            entry.oval = canvas.create_oval(0, 0, 0, 0, fill=color, outline=outline, width=2,
+                                            tags=(SPAWN_TAG,), state=item_state)
+            self.items[entry.oval] = entry
+        else:
+            canvas.itemconfigure(entry.oval, fill=color, outline=outline)
+
+        area = has_area(spawn)
+        if area and entry.rect is None:
+            entry.rect = canvas.create_rectangle(0, 0, 0, 0, outline=color, dash=(2, 2), width=1,
+                                                 tags=(SPAWN_TAG,), state=item_state)
+            self.items[entry.rect] = entry
+        elif area:
+            canvas.itemconfigure(entry.rect, outline=color)
+        elif entry.rect is not None:
+            canvas.delete(entry.rect)
+            del self.items[entry.rect]
+            entry.rect = None
+
+        entry.state = state
+        entry.highlighted = highlighted
+        self._place(entry)
+
+    def _place(self, entry):
+        spawn = entry.spawn
+        x, y = self.project(spawn.x, spawn.y)
+        radius = 6 if entry.highlighted else 4
+        self.canvas.coords(entry.oval, x - radius, y - radius, x + radius, y + radius)
+        if entry.rect is not None:
+            end_x, end_y = self.project(spawn.end_x, spawn.end_y)
+            self.canvas.coords(entry.rect, x, y, end_x, end_y)
+
+    def _unindex_monster(self, entry):
+        keys = self.by_monster.get(entry.state[5])
+        if keys is not None:
+            keys.discard(id(entry.spawn))
+            if not keys:
+                del self.by_monster[entry.state[5]]
+
+    def _remove_entry(self, entry):
+        for item in (entry.oval, entry.rect):
+            if item is not None:
+                self.canvas.delete(item)
+                self.items.pop(item, None)
+        self._unindex_monster(entry)
+        self.grid.remove(entry.spawn)
+        del self.entries[id(entry.spawn)]
+        if entry.spawn is self.selected:
+            self.selected = None
+        self.marked.pop(id(entry.spawn), None)
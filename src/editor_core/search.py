@@ -0,0 +1,72 @@
+"""Search index for the monster picker.
+
+Names are lowercased and ordered by ID once, when the index is built.  A
+query matches the name or the ID as a substring; when nothing matches, the
+query letters are matched in order (``"gbl"`` finds "Goblin").  Typing more
+letters only filters the previous result instead of scanning everything
+again.
+"""
+import re
+from array import array
+
+# Keys are "name\nid", so one substring test covers both and a query can't span them
+_SEPARATOR = "\n"
+
+
+class MonsterIndex:
+    """Monsters pre-sorted by ID with lowercased search keys"""
+
+    def __init__(self, entries=()):
+        """``entries`` yields (monster id, name, editor type)"""
+        entries = sorted(entries)
+        self.ids = [monster_id for monster_id, _, _ in entries]
+        self.names = [name for _, name, _ in entries]
+        self.lowered = [name.lower() for name in self.names]
+        self.keys = [f"{name}{_SEPARATOR}{monster_id}" for monster_id, name in zip(self.ids, self.lowered)]
+        self.types = array('h', (monster_type for _, _, monster_type in entries))
+        self.positions = {monster_id: position for position, monster_id in enumerate(self.ids)}
+        self._last_query = None
+        self._last_result = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def set_type(self, monster_id, monster_type):
+        position = self.positions.get(monster_id)
+        if position is not None:
+            self.types[position] = monster_type
+
+    def search(self, query):
+        """Positions (in ID order) of the monsters matching ``query``"""
+        query = query.lower().replace(_SEPARATOR, " ")
+        if not query:
+            return list(range(len(self.ids)))
+
+        last = self._last_query
+        if last and query.startswith(last) and self._last_result is not None:
+            # Longer query: every match is among the previous matches
+            candidates = self._last_result
+        else:
+            candidates = range(len(self.keys))
+        keys = self.keys
+        result = [position for position in candidates if query in keys[position]]
+        self._last_query = query
+        self._last_result = result
+        if result:
+            return result
+        return self.fuzzy(query)
+
+    def fuzzy(self, query):
+        """Positions of names that contain the query letters in order"""
+        pattern = re.compile(".*?".join(map(re.escape, query.replace(" ", ""))))
+        return [position for position, name in enumerate(self.lowered) if pattern.search(name)]
+
+    def split_by_type(self, positions):
+        """Split positions into (NPC IDs, other monster IDs)"""
+        npcs = []
+        monsters = []
+        ids = self.ids
+        types = self.types
+        for position in positions:
+            (npcs if types[position] == 0 else monsters).append(ids[position])
+        return npcs, monsters
@@ -0,0 +1,48 @@
+"""State of one map open in the editor."""
+from .history import History, InsertSpawns
+from .spawn_file import SpawnFile
+
+
+class MapSession:
+    """Spawns, parsed file layout and undo history of one map.
+
+    The editor keeps a session for every map visited and switches between
+    them by reference, so switching maps copies nothing and each map keeps
+    its own undo history.  Spawn positions are looked up through an
+    identity index that is rebuilt only after spawns were inserted or
+    deleted, so hit-testing a click doesn't scan the list.
+    """
+
+    def __init__(self, map_file=None, document=None, spawns=None):
+        self.map_file = map_file
+        self.document = document if document is not None else SpawnFile()
+        self.spawns = spawns if spawns is not None else []
+        self.history = History()
+        self._positions = None  # id(spawn) -> index in spawns, None until needed
+
+    def positions(self):
+        """{id(spawn): index in spawns}"""
+        if self._positions is None:
+            self._positions = {id(spawn): i for i, spawn in enumerate(self.spawns)}
+        return self._positions
+
+    def index_of(self, spawn):
+        """Position of a spawn in the list (by identity), or None"""
+        return self.positions().get(id(spawn))
+
+    def _changed(self, command):
+        if isinstance(command, InsertSpawns):  # also DeleteSpawns; ModifySpawns keeps positions
+            self._positions = None
+        return command
+
+    def execute(self, command):
+        """Apply an edit command to the spawns and record it for undo"""
+        return self._changed(self.history.execute(command, self.spawns))
+
+    def undo(self, selection=-1):
+        """Revert the last edit; returns the command, or None"""
+        return self._changed(self.history.undo(self.spawns, selection))
+
+    def redo(self):
+        """Re-apply the last undone edit; returns the command, or None"""
+        return self._changed(self.history.redo(self.spawns))
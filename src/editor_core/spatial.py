@@ -0,0 +1,115 @@
+"""Uniform grid over the 256x256 game map for spawn hit-testing.
+
+Every spawn is filed under the bucket of its start point, and area spawns
+are also filed under every bucket their rectangle overlaps, so point and
+area queries only look at a handful of buckets instead of every spawn.
+"""
+
+MAP_SIZE = 256
+CELL_SIZE = 16
+
+
+def _clamp(value):
+    return max(0, min(MAP_SIZE - 1, int(value)))
+
+
+def spawn_rect(spawn):
+    """Normalized (x0, y0, x1, y1) rectangle of a spawn, inclusive"""
+    x, y, end_x, end_y = spawn.x, spawn.y, spawn.end_x, spawn.end_y
+    return min(x, end_x), min(y, end_y), max(x, end_x), max(y, end_y)
+
+
+def has_area(spawn):
+    return spawn.type != 0 and (spawn.x != spawn.end_x or spawn.y != spawn.end_y)
+
+
+class SpawnGrid:
+    """Bucket index of spawns by map cell.
+
+    Spawns are tracked by identity, like the canvas scene; call ``update``
+    after changing a spawn's coordinates or type.
+    """
+
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.points = {}   # bucket -> {id(spawn): spawn}
+        self.areas = {}    # bucket -> {id(spawn): spawn}
+        self.placed = {}   # id(spawn) -> (point bucket, area buckets)
+
+    def __len__(self):
+        return len(self.placed)
+
+    def clear(self):
+        self.points.clear()
+        self.areas.clear()
+        self.placed.clear()
+
+    def bucket(self, x, y):
+        return _clamp(x) // self.cell_size, _clamp(y) // self.cell_size
+
+    def _buckets(self, x0, y0, x1, y1):
+        bx0, by0 = self.bucket(x0, y0)
+        bx1, by1 = self.bucket(x1, y1)
+        return [(bx, by) for bx in range(bx0, bx1 + 1) for by in range(by0, by1 + 1)]
+
+    def add(self, spawn):
+        key = id(spawn)
+        if key in self.placed:
+            self.remove(spawn)
+        point = self.bucket(spawn.x, spawn.y)
+        self.points.setdefault(point, {})[key] = spawn
+        areas = self._buckets(*spawn_rect(spawn)) if has_area(spawn) else []
+        for cell in areas:
+            self.areas.setdefault(cell, {})[key] = spawn
+        self.placed[key] = (point, areas)
+
+    update = add
+
+    def remove(self, spawn):
+        key = id(spawn)
+        placed = self.placed.pop(key, None)
+        if placed is None:
+            return
+        point, areas = placed
+        self._discard(self.points, point, key)
+        for cell in areas:
+            self._discard(self.areas, cell, key)
+
+    @staticmethod
+    def _discard(buckets, cell, key):
+        bucket = buckets.get(cell)
+        if bucket is not None:
+            bucket.pop(key, None)
+            if not bucket:
+                del buckets[cell]
+
+    # Queries (map coordinates)
+
+    def near(self, x, y, radius):
+        """Spawns whose start point may lie within ``radius`` of (x, y)"""
+        found = []
+        for cell in self._buckets(x - radius, y - radius, x + radius, y + radius):
+            bucket = self.points.get(cell)
+            if bucket:
+                found.extend(bucket.values())
+        return found
+
+    def covering(self, x, y):
+        """Area spawns whose rectangle contains the cell (x, y)"""
+        found = []
+        for spawn in self.areas.get(self.bucket(x, y), {}).values():
+            x0, y0, x1, y1 = spawn_rect(spawn)
+            if x0 <= x <= x1 and y0 <= y <= y1:
+                found.append(spawn)
+        return found
+
+    def within(self, x0, y0, x1, y1):
+        """Spawns whose start point lies inside the rectangle (inclusive)"""
+        x0, x1 = min(x0, x1), max(x0, x1)
+        y0, y1 = min(y0, y1), max(y0, y1)
+        found = []
+        for cell in self._buckets(x0, y0, x1, y1):
+            for spawn in self.points.get(cell, {}).values():
+                if x0 <= spawn.x <= x1 and y0 <= spawn.y <= y1:
+                    found.append(spawn)
+        return found
@@ -0,0 +1,282 @@
+"""Section-aware reader and writer for MonsterSetBase files.
+
+A MonsterSetBase file is a list of sections.  Each section starts with a
+line holding its type (0-5), lists one spawn per line and ends with
+``end``.  Everything else (banners, column headers, comments, blank lines)
+is kept verbatim, so a file that was not edited is written back
+byte-identically and edited rows keep their column alignment.
+"""
+import re
+
+from .columns import pad_columns, realign, split_line_ending
+from .monster_txt import ENCODING
+from .spawn import Spawn, SpawnStore
+
+# Columns of each section type, in file order
+SECTION_COLUMNS = {
+    0: ('monster_id', 'map_number', 'range', 'x', 'y', 'direction'),  # NPCs
+    1: ('monster_id', 'map_number', 'range', 'x', 'y', 'end_x', 'end_y', 'direction', 'quantity'),  # Monster areas
+    2: ('monster_id', 'map_number', 'range', 'x', 'y', 'direction'),  # Single monsters
+    3: ('monster_id', 'map_number', 'range', 'x', 'y', 'end_x', 'end_y', 'direction', 'quantity', 'value'),  # Invasion areas
+    4: ('monster_id', 'map_number', 'range', 'x', 'y', 'direction'),  # Event monsters
+    5: ('monster_id', 'map_number', 'range', 'x', 'y', 'direction', 'value'),  # Invasion spots
+}
+
+SECTION_TITLES = {
+    0: "NPCS",
+    1: "MONSTERS",
+    2: "MONSTERS",
+    3: "[EVENTS] Monster Invasion",
+    4: "MONSTERS",
+    5: "[EVENTS] Npc Invasion",
+}
+
+_HEADER_NAMES = {
+    'monster_id': "Monster", 'map_number': "MapNumber", 'range': "Range",
+    'direction': "Direction", 'quantity': "Quantity", 'value': "Value",
+}
+_SPOT_NAMES = {'x': "PositionX", 'y': "PositionY"}
+_AREA_NAMES = {'x': "BeginPosX", 'y': "BeginPosY", 'end_x': "EndPosX", 'end_y': "EndPosY"}
+
+BANNER = "//" + "=" * 137
+
+_NUMBER_RE = re.compile(r'\S+')
+_PADDED_RE = re.compile(r'0\d+$')
+
+
+def section_header(kind):
+    """Column header comment written under the section marker"""
+    names = _AREA_NAMES if 'end_x' in SECTION_COLUMNS[kind] else _SPOT_NAMES
+    labels = [_HEADER_NAMES.get(c) or names[c] for c in SECTION_COLUMNS[kind]]
+    return "//" + "      ".join(labels + ["Comment"])
+
+
+def row_widths(kind):
+    """Column widths used for rows that have no original line to follow"""
+    return [14, 14, 12] + [14] * (len(SECTION_COLUMNS[kind]) - 3)
+
+
+def spawn_type(kind, mtype):
+    """Editor type of a spawn in a section of type ``kind`` whose monster has type ``mtype``"""
+    if kind == 0:
+        return 0  # NPC
+    if kind == 1:
+        return 1 if mtype == 1 else 2  # Trap or Monster
+    return mtype
+
+
+def spawn_from_values(kind, values, monster_type=None):
+    """Build a Spawn from the parsed columns of a row"""
+    spawn = Spawn(**dict(zip(SECTION_COLUMNS[kind], values)), section=kind)
+    spawn.type = spawn_type(kind, monster_type(spawn.monster_id) if monster_type and kind else 2)
+    return spawn
+
+
+class SpawnSection:
+    """One ``<type> ... end`` block.
+
+    ``body`` holds the raw marker/comment lines (str) and the keys of the
+    rows (int) in file order; ``end`` is the raw ``end`` line, or None if
+    the file stopped before it.
+    """
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.body = []
+        self.end = None
+
+
+class SpawnFile:
+    """Parsed MonsterSetBase file: loose lines and sections in file order"""
+
+    def __init__(self):
+        self.blocks = []       # str (loose line) or SpawnSection
+        self.rows = {}         # row key -> (raw line, values tuple, section type, line number)
+        self.newline = "\n"
+
+    @property
+    def sections(self):
+        return [block for block in self.blocks if isinstance(block, SpawnSection)]
+
+    def section_types(self):
+        return [section.kind for section in self.sections]
+
+
+def parse_spawn_file(text, monster_type=None):
+    """Parse a MonsterSetBase file.
+
+    Returns ``(spawn_file, spawns)``.  Every Spawn carries its
+    ``section`` type and a ``row`` key pointing back at the original line;
+    ``monster_type`` (monster id -> editor type) decides the display type.
+    Lines that can't be read as a spawn are kept verbatim.
+    """
+    doc = SpawnFile()
+    spawns = []
+    lines = text.splitlines(keepends=True)
+    if lines:
+        doc.newline = split_line_ending(lines[0])[1] or "\n"
+
+    section = None
+    for line_no, line in enumerate(lines, 1):
+        stripped = line.strip()
+        if section is None:
+            if len(stripped) == 1 and stripped in "012345":
+                section = SpawnSection(int(stripped))
+                section.body.append(line)
+                doc.blocks.append(section)
+            else:
+                doc.blocks.append(line)
+            continue
+
+        if stripped.lower() == "end":
+            section.end = line
+            section = None
+            continue
+
+        columns = SECTION_COLUMNS[section.kind]
+        code = stripped.split("//", 1)[0].split()
+        if len(code) < len(columns):
+            section.body.append(line)
+            continue
+        try:
+            values = tuple(int(part) for part in code[:len(columns)])
+        except ValueError:
+            section.body.append(line)
+            continue
+
+        key = len(doc.rows)
+        doc.rows[key] = (line, values, section.kind, line_no)
+        section.body.append(key)
+        spawn = spawn_from_values(section.kind, values, monster_type)
+        spawn.row = key
+        spawns.append(spawn)
+
+    return doc, spawns
+
+
+def _format_like(original, value):
+    """Format ``value`` the way the original token was written (keeps zero padding)"""
+    text = str(value)
+    if value >= 0 and _PADDED_RE.match(original):
+        return text.zfill(len(original))
+    return text
+
+
+def _row_comment(original, monster_id):
+    """Trailing ``//`` comment of an original row, or None if it has none or the monster changed"""
+    body = split_line_ending(original[0])[0]
+    start = body.find("//")
+    if start < 0 or original[1][0] != monster_id:
+        return None
+    return body[start:]
+
+
+def format_row(kind, spawn, monster_name, original=None, comment=None):
+    """Render one spawn as a row of a section of type ``kind``.
+
+    Without ``original`` the row is laid out in the standard columns and
+    ends with ``comment``, or the monster's name if that is None.
+    """
+    columns = SECTION_COLUMNS[kind]
+    values = spawn.values(columns)
+    name = monster_name(spawn.monster_id) if monster_name else ""
+
+    if original is None:
+        return pad_columns(values, row_widths(kind)) + (f"//{name}" if comment is None else comment)
+
+    raw_line, old_values = original[0], original[1]
+    body, ending = split_line_ending(raw_line)
+    code_end = body.find("//")
+    code = body if code_end < 0 else body[:code_end]
+    matches = list(_NUMBER_RE.finditer(code))[:len(columns)]
+    tokens = [_format_like(m.group(), v) for m, v in zip(matches, values)]
+    if code_end >= 0 and values[0] != old_values[0] and monster_name:
+        # Monster changed, so the name in the comment is stale
+        body = body[:code_end] + f"//{name}"
+    return realign(body, [m.span() for m in matches], tokens) + ending
+
+
+def _new_section_lines(kind, rows, newline):
+    lines = [BANNER, f"// {SECTION_TITLES[kind]}", BANNER, str(kind), section_header(kind)]
+    lines.extend(rows)
+    lines.append("end")
+    return [line + newline for line in lines]
+
+
+def format_spawn_file(doc, spawns, monster_name=None, normalize=False):
+    """Serialize ``spawns`` back into the layout of ``doc``.
+
+    Spawns that still match their original row are written from the raw
+    line, edited ones are realigned in place, deleted ones are dropped and
+    new ones are appended to the first section of their type (a new section
+    is added at the end of the file if there is none).  With ``normalize``
+    every row is re-rendered in the standard column layout instead, keeping
+    its comment.
+    """
+    newline = doc.newline
+    current = {}
+    added = {}
+    for spawn in spawns:
+        key = spawn.row
+        original = doc.rows.get(key)
+        if original is not None and key not in current and original[2] == spawn.section:
+            current[key] = spawn
+        else:
+            added.setdefault(spawn.section, []).append(spawn)
+
+    out = []
+    for block in doc.blocks:
+        if isinstance(block, str):
+            out.append(block)
+            continue
+        kind = block.kind
+        columns = SECTION_COLUMNS[kind]
+        for item in block.body:
+            if isinstance(item, str):
+                out.append(item)
+                continue
+            spawn = current.get(item)
+            if spawn is None:
+                continue
+            original = doc.rows[item]
+            if normalize:
+                comment = _row_comment(original, spawn.monster_id)
+                _append_line(out, format_row(kind, spawn, monster_name, comment=comment), newline)
+            elif spawn.values(columns) == original[1]:
+                out.append(original[0])
+            else:
+                out.append(format_row(kind, spawn, monster_name, original))
+        for spawn in added.pop(kind, ()):
+            _append_line(out, format_row(kind, spawn, monster_name), newline)
+        if block.end is not None:
+            out.append(block.end)
+
+    for kind in sorted(added):
+        rows = [format_row(kind, spawn, monster_name) for spawn in added[kind]]
+        if out:
+            _append_line(out, "", newline)
+        out.extend(_new_section_lines(kind, rows, newline))
+    return "".join(out)
+
+
+def _append_line(out, line, newline):
+    """Append a line, terminating the previous one if the file lacked a final newline"""
+    if out and not split_line_ending(out[-1])[1]:
+        out[-1] += newline
+    if not split_line_ending(line)[1]:
+        line += newline
+    out.append(line)
+
+
+def read_spawn_file(path, monster_type=None):
+    """Read and parse a MonsterSetBase file; see parse_spawn_file"""
+    with open(path, 'r', encoding=ENCODING, newline='') as f:
+        return parse_spawn_file(f.read(), monster_type)
+
+
+def load_spawn_store(paths, monster_type=None):
+    """Read many MonsterSetBase files into one SpawnStore (sources are the paths)"""
+    store = SpawnStore()
+    for path in paths:
+        store.extend(read_spawn_file(path, monster_type)[1], path)
+    return store
@@ -0,0 +1,150 @@
+"""Seeded generator of Monster.txt tables and MonsterSetBase files.
+
+The output uses the real column layouts (MONSTER_COLUMNS, SECTION_COLUMNS)
+and goes through the same writer the editor saves with, so it parses back
+exactly like a hand-made file.  The same seed always gives the same files,
+so stress tests and benchmarks can be repeated across commits.
+"""
+import os
+import random
+
+from .catalog import SPAWN_ROOT, spawn_file_path
+from .columns import pad_columns
+from .monster_txt import ENCODING, MONSTER_COLUMNS
+from .spawn import Spawn
+from .spawn_file import SpawnFile, format_spawn_file
+
+# Share of the spawns that go to each section type (0 NPCs, 1 areas, 2 single
+# monsters, 3 invasion areas, 4 event monsters, 5 invasion spots)
+SECTION_MIX = {0: 0.05, 1: 0.45, 2: 0.35, 3: 0.05, 4: 0.05, 5: 0.05}
+
+# "uniform" spreads spawns over the whole map, "clustered" groups them around a few hotspots
+DISTRIBUTIONS = ("uniform", "clustered")
+
+_NAME_WIDTH = 37
+
+
+def _monster_rows(count, seed, npc_share, trap_share):
+    rng = random.Random(seed)
+    rows = []
+    for monster_id in range(count):
+        roll = rng.random()
+        attribute = 0 if roll < npc_share else 1 if roll < npc_share + trap_share else 2
+        level = rng.randint(1, 150)
+        damage = level * rng.randint(2, 5)
+        rows.append({
+            "Index": monster_id, "Rate": 1, "Name": f'"Synthetic {monster_id}"', "Level": level,
+            "MaxLife": level * rng.randint(20, 400), "MaxMana": 0,
+            "DamageMin": damage, "DamageMax": damage + level, "Defense": level * 2, "MagicDefense": 0,
+            "AttackRate": level * 5, "DefenseRate": level * 2, "MoveRange": 3, "AttackType": 0,
+            "AttackRange": rng.choice((1, 1, 1, 3, 5)), "ViewRange": rng.randint(3, 7), "MoveSpeed": 400,
+            "AttackSpeed": rng.choice((1200, 1600, 1800)), "RegenTime": rng.choice((10, 20, 30, 60)),
+            "Attribute": attribute, "ItemRate": 130, "MoneyRate": 20, "MaxItemLevel": min(level // 10, 15),
+            "MonsterSkill": 0, "Resistance1": 0, "Resistance2": 0, "Resistance3": 0, "Resistance4": 0,
+        })
+    return rows
+
+
+def generate_monster_txt(count, seed=0, npc_share=0.1, trap_share=0.02):
+    """Monster.txt text with ``count`` monsters (IDs 0..count-1).
+
+    ``npc_share`` and ``trap_share`` set how many rows get Attribute 0 (NPC)
+    and 1 (trap); the rest are monsters (2).
+    """
+    names = [name for name, _ in MONSTER_COLUMNS]
+    # Same layout as the bundled file: each column is its header name plus three spaces
+    widths = [len(name) + 3 for name in names]
+    widths[0] += 2  # the header's leading "//"
+    widths[names.index("Name")] = _NAME_WIDTH
+    lines = [pad_columns(["//" + names[0]] + names[1:], widths).rstrip()]
+    for row in _monster_rows(count, seed, npc_share, trap_share):
+        lines.append(pad_columns([row[name] for name in names], widths).rstrip())
+    return "\n".join(lines) + "\n"
+
+
+def monster_ids_by_type(count, seed=0, npc_share=0.1, trap_share=0.02):
+    """(NPC IDs, other IDs) of the table generate_monster_txt makes with the same arguments"""
+    npcs, others = [], []
+    for row in _monster_rows(count, seed, npc_share, trap_share):
+        (npcs if row["Attribute"] == 0 else others).append(row["Index"])
+    return npcs, others
+
+
+def generate_spawns(map_number, count, seed=0, npc_ids=(0,), monster_ids=(1,), mix=SECTION_MIX,
+                    distribution="clustered", hotspots=8, max_quantity=10):
+    """``count`` random Spawns for one map, spread over the section types of ``mix``"""
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"unknown distribution {distribution!r}, expected one of {DISTRIBUTIONS}")
+    rng = random.Random(seed)
+    kinds = sorted(mix)
+    weights = [mix[kind] for kind in kinds]
+    centers = [(rng.randint(20, 235), rng.randint(20, 235)) for _ in range(max(1, hotspots))]
+
+    def position():
+        if distribution == "uniform":
+            return rng.randint(0, 255), rng.randint(0, 255)
+        cx, cy = rng.choice(centers)
+        return (max(0, min(255, int(rng.gauss(cx, 12)))),
+                max(0, min(255, int(rng.gauss(cy, 12)))))
+
+    spawns = []
+    for kind in rng.choices(kinds, weights, k=count):
+        x, y = position()
+        spawn = Spawn(rng.choice(npc_ids if kind == 0 else monster_ids), map_number,
+                      range=rng.randint(0, 30) if kind else 0, x=x, y=y, section=kind,
+                      type=0 if kind == 0 else 2)
+        if kind in (0, 2, 4, 5):
+            spawn.direction = rng.randint(0, 7) if kind == 0 else rng.choice((-1, -1, rng.randint(0, 7)))
+        if kind in (1, 3):
+            spawn.end_x = min(255, x + rng.randint(0, 20))
+            spawn.end_y = min(255, y + rng.randint(0, 20))
+            spawn.quantity = rng.randint(1, max_quantity)
+        if kind in (3, 5):
+            spawn.value = rng.randint(0, 5)  # invasion group
+        spawns.append(spawn)
+    return spawns
+
+
+def generate_spawn_file(map_number, count, seed=0, **options):
+    """MonsterSetBase file text with ``count`` spawns; ``options`` go to generate_spawns"""
+    return format_spawn_file(SpawnFile(), generate_spawns(map_number, count, seed, **options),
+                             lambda monster_id: f"Synthetic {monster_id}")
+
+
+def generate_tree(root, maps=10, spawns=1000, monsters=1000, seed=0, event_maps=2, invasion_maps=3,
+                  **options):
+    """Write Monster/Monster.txt and a MonsterSetBase/ tree (with Event/ and Invasion/) under ``root``.
+
+    There are ``maps`` regular maps and ``event_maps`` event maps of
+    ``spawns`` spawns each, plus an Invasion/InvasionSetBase.txt that covers
+    ``invasion_maps`` maps.  Returns the paths written.
+    """
+    npc_ids, monster_ids = monster_ids_by_type(monsters, seed)
+    options.setdefault("npc_ids", npc_ids or (0,))
+    options.setdefault("monster_ids", monster_ids or (0,))
+    files = {os.path.join("Monster", "Monster.txt"): generate_monster_txt(monsters, seed)}
+
+    for map_number in range(maps):
+        files[spawn_file_path(f"{map_number:03d} - Synthetic {map_number}.txt", SPAWN_ROOT)] = \
+            generate_spawn_file(map_number, spawns, seed + map_number, **options)
+    for n in range(event_maps):
+        map_number = maps + n
+        files[spawn_file_path(f"Event/{map_number:03d} - Synthetic Event {n + 1}.txt", SPAWN_ROOT)] = \
+            generate_spawn_file(map_number, spawns, seed + map_number, mix={4: 1.0}, **options)
+    if invasion_maps:
+        # One file, rows of several maps (like the real InvasionSetBase.txt)
+        invasion = []
+        for map_number in range(min(invasion_maps, max(maps, 1))):
+            invasion.extend(generate_spawns(map_number, max(1, spawns // 10), seed - map_number - 1,
+                                            mix={3: 0.7, 5: 0.3}, **options))
+        files[spawn_file_path("Invasion/InvasionSetBase.txt", SPAWN_ROOT)] = \
+            format_spawn_file(SpawnFile(), invasion, lambda monster_id: f"Synthetic {monster_id}")
+
+    written = []
+    for rel_path, text in files.items():
+        path = os.path.join(root, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding=ENCODING, newline='') as f:
+            f.write(text)
+        written.append(path)
+    return written
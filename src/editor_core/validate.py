@@ -0,0 +1,107 @@
+"""Headless checks for the MonsterSetBase tree."""
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from .catalog import SPAWN_ROOT, list_spawn_files, spawn_file_path, split_map_name
+from .fileio import save_text_file
+from .monster_txt import ENCODING
+from .spawn_file import SECTION_COLUMNS, format_spawn_file, read_spawn_file
+
+COORD_KEYS = ('x', 'y', 'end_x', 'end_y')
+
+Issue = namedtuple('Issue', 'path line severity message')
+FileReport = namedtuple('FileReport', 'path spawns issues rewritten')
+
+# Per-process lookup tables, filled by _init_worker
+_monster_names = {}
+
+
+def _init_worker(monster_names):
+    global _monster_names
+    _monster_names = monster_names
+
+
+def expected_map_number(path):
+    """Map number encoded in a '007 - Atlans.txt' style file name, or None"""
+    return split_map_name(os.path.basename(path))[0]
+
+
+def check_spawns(path, doc, spawns, monster_names):
+    """Return the list of Issues found in one parsed spawn file"""
+    issues = []
+    expected_map = expected_map_number(path)
+    seen = {}
+    for spawn in spawns:
+        kind = spawn.section
+        line = doc.rows[spawn.row][3]
+
+        bad = [key for key in COORD_KEYS if not 0 <= getattr(spawn, key) <= 255]
+        if bad:
+            coords = ", ".join(f"{key}={getattr(spawn, key)}" for key in bad)
+            issues.append(Issue(path, line, "error", f"coordinates out of range 0-255: {coords}"))
+
+        if spawn.monster_id not in monster_names:
+            issues.append(Issue(path, line, "error", f"unknown monster ID {spawn.monster_id}"))
+
+        if expected_map is not None and spawn.map_number != expected_map:
+            issues.append(Issue(path, line, "error",
+                                f"MapNumber {spawn.map_number} does not match file prefix {expected_map}"))
+
+        key = (kind,) + spawn.values(SECTION_COLUMNS[kind])
+        if key in seen:
+            issues.append(Issue(path, line, "warning", f"duplicate of the spawn on line {seen[key]}"))
+        else:
+            seen[key] = line
+    return issues
+
+
+def validate_file(path, rewrite=False, backup_dir=None):
+    """Parse and check one spawn file; with ``rewrite`` normalize its layout.
+
+    A rewritten file's previous version goes to ``backup_dir`` (if given),
+    like a save from the editor.
+    """
+    try:
+        doc, spawns = read_spawn_file(path)
+    except (OSError, UnicodeError) as e:
+        return FileReport(path, 0, [Issue(path, 0, "error", f"cannot read file: {e}")], False)
+
+    issues = check_spawns(path, doc, spawns, _monster_names)
+    rewritten = False
+    if rewrite:
+        text = format_spawn_file(doc, spawns, lambda monster_id: _monster_names.get(monster_id, "Unknown"),
+                                 normalize=True)
+        rewritten = save_text_file(path, text, encoding=ENCODING, backup_dir=backup_dir).written
+    return FileReport(path, len(spawns), issues, rewritten)
+
+
+def _validate_task(args):
+    return validate_file(*args)
+
+
+def find_spawn_files(root="."):
+    """List every spawn file under MonsterSetBase/ and its subfolders, sorted"""
+    directory = os.path.join(root, SPAWN_ROOT)
+    if not os.path.isdir(directory):
+        return []
+    return [spawn_file_path(rel_path, directory) for rel_path in list_spawn_files(directory)]
+
+
+def validate_tree(paths, monster_names, rewrite=False, jobs=None, backup_dir=None):
+    """Validate ``paths`` on a process pool; returns FileReports in input order.
+
+    ``monster_names`` maps every known monster ID to its name.  ``jobs=1``
+    runs in the calling process.  ``backup_dir(path)`` names the folder a
+    rewritten file is backed up to (e.g. ``Repository.backup_dir``).
+    """
+    tasks = [(path, rewrite, backup_dir(path) if rewrite and backup_dir else None) for path in paths]
+    if jobs == 1 or len(tasks) < 2:
+        _init_worker(monster_names)
+        return [_validate_task(task) for task in tasks]
+
+    workers = min(jobs or os.cpu_count() or 1, len(tasks))
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(monster_names,)) as pool:
+        return list(pool.map(_validate_task, tasks, chunksize=chunksize))
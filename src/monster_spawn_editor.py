@@ -1,10 +1,112 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from PIL import Image, ImageTk
+import argparse
+import logging
+import math
+import multiprocessing
 import os
+import queue
+import sys
+import threading
+import time
+from collections import namedtuple
 import re
 import random
-import copy  # For deep copying spawns for undo/redo functionality
+
+from editor_core import LRUCache, Spawn, monster_type_from_attribute
+from editor_core.coords import cell_pixels, map_to_scene, scene_to_map, scene_to_map_float
+from editor_core.bulk import delete_spawns, retarget_spawns, scale_quantity, set_spawn_fields, translate_spawns
+from editor_core.catalog import split_map_name
+from editor_core.history import DeleteSpawns, InsertSpawns, ModifySpawns
+from editor_core.scene import SPAWN_TAG, SpawnScene
+from editor_core.search import MonsterIndex
+from editor_core.prefetch import Prefetcher
+from editor_core.profiling import PROFILER, profiled
+from editor_core.repository import Repository
+from editor_core.session import MapSession
+from editor_core.synthetic import DISTRIBUTIONS, generate_tree
+from editor_core.validate import find_spawn_files, validate_tree
+from virtual_list import VirtualList
+
+log = logging.getLogger("monster_spawn_editor")
+
+# Level below DEBUG for per-event and per-spawn messages (mouse motion, coordinate math)
+TRACE = 5
+logging.addLevelName(TRACE, "TRACE")
+
+# Environment variable read when --log-level isn't given, e.g. MONSTER_EDITOR_LOG=debug
+LOG_ENV_VAR = "MONSTER_EDITOR_LOG"
+
+# Mouse motion is coalesced to one tooltip update per frame (~60 Hz)
+MOTION_FRAME_MS = 16
+
+# The map is drawn as square tiles, only for the visible part of the canvas plus a margin
+MAP_TILE_SIZE = 256
+MAP_TILE_MARGIN = 1  # extra rings of tiles rendered around the viewport
+# Rendered tiles are cached by (image, scale, column, row); the budget is in pixels (~4 bytes each in Tk)
+MAP_BITMAP_BUDGET = 32 * 1024 * 1024
+# A window resize shows a fast preview, then a LANCZOS render once resizing stopped for this long
+RESIZE_SETTLE_MS = 150
+ZOOM_FACTOR = 1.2
+# The monster list is filtered once typing pauses for this long
+SEARCH_DEBOUNCE_MS = 120
+# How often the UI picks up map catalogue entries from the scanner thread
+CATALOG_POLL_MS = 50
+MIN_ZOOM = 0.1
+MAX_ZOOM = 5.0
+# Maps next to the current one in the list (each side) and recently used maps preloaded in the background
+PREFETCH_NEIGHBOURS = 2
+RECENT_MAPS = 4
+# Budget for decoded map images kept by the prefetcher, in bytes
+MAP_IMAGE_CACHE_BYTES = 256 * 1024 * 1024
+# Parsed spawn files kept by the prefetcher (opened maps move into their MapSession)
+SPAWN_PREFETCH_FILES = 16
+# Modifier bits of event.state
+SHIFT_MASK = 0x0001
+CONTROL_MASK = 0x0004
+# How often the profiling readout (status bar and stats window) is refreshed while profiling is on
+PROFILE_REFRESH_MS = 500
+
+def quantize_scale(scale):
+    """Round a map scale down to the 1% steps used as bitmap cache keys"""
+    return max(0.01, math.floor(scale * 100 + 1e-9) / 100)
+
+def fitted_scale(width, height, canvas_width, canvas_height):
+    """Scale that fits a width x height map into the canvas, never above 100%"""
+    return quantize_scale(min(canvas_width / width, canvas_height / height, 1.0))
+
+DecodedMap = namedtuple('DecodedMap', 'image fitted scale')
+
+@profiled()
+def decode_map_image(path, canvas_width, canvas_height):
+    """Decode a map image and scale it to fit the canvas; runs on prefetch threads, so no Tk calls"""
+    from PIL import Image  # PIL is only loaded once a map is shown
+    image = Image.open(path)
+    image.load()
+    scale = fitted_scale(image.width, image.height, canvas_width, canvas_height)
+    fitted = image
+    if scale != 1.0:
+        size = (max(1, int(image.width * scale)), max(1, int(image.height * scale)))
+        fitted = image.resize(size, Image.Resampling.LANCZOS)
+    return DecodedMap(image, fitted, scale)
+
+def decoded_map_bytes(decoded):
+    images = {id(decoded.image): decoded.image, id(decoded.fitted): decoded.fitted}.values()
+    return sum(image.width * image.height * len(image.getbands()) for image in images)
+
+LOG_LEVELS = {"trace": TRACE, "debug": logging.DEBUG, "info": logging.INFO,
+              "warning": logging.WARNING, "error": logging.ERROR}
+
+def configure_logging(level=None, log_file=None):
+    """Set up log output; the level comes from --log-level, then MONSTER_EDITOR_LOG, then 'warning'"""
+    level = (level or os.environ.get(LOG_ENV_VAR) or "warning").lower()
+    # The windowed build has no console, so fall back to a log file there
+    if log_file or sys.stderr is None:
+        handler = logging.FileHandler(log_file or "MonsterSpawnEditor.log", encoding="utf-8", delay=True)
+    else:
+        handler = logging.StreamHandler()
+    logging.basicConfig(level=LOG_LEVELS.get(level, logging.WARNING), handlers=[handler], force=True,
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
 
 class MonsterSpawnEditor:
     def __init__(self, root):
@@ -14,14 +116,20 @@ class MonsterSpawnEditor:
         # Set program icon if available
         self.set_program_icon()
         
-        # Initialize undo/redo stacks
-        self.undo_stack = []
-        self.redo_stack = []
-        self.max_history = 20  # Maximum number of actions to keep in history
-        
-        # Dictionary to store spawns for each map
-        self.map_spawns = {}
+        # Every visited map keeps its spawns and undo history in a MapSession;
+        # self.spawns and self.history always refer to the current one
+        self.sessions = {}
+        self.session = MapSession()
         self.modified_maps = set()  # Track which maps have been modified
+        # Spawn files found under MonsterSetBase/, keyed by path relative to it
+        self.map_catalog = {}
+        self.map_names = {}         # map number -> name, from the top-level files
+        self.catalog_queue = None
+        # Spawn files and images of the maps around the current one, loaded on worker threads
+        self.recent_maps = []
+        self.spawn_prefetch = Prefetcher(self.read_map_file, SPAWN_PREFETCH_FILES, name="spawn-files")
+        self.image_prefetch = Prefetcher(lambda key: decode_map_image(*key), MAP_IMAGE_CACHE_BYTES,
+                                         weigh=decoded_map_bytes, name="map-images")
         
         # MU Online style
         style = ttk.Style()
@@ -63,19 +171,35 @@ class MonsterSpawnEditor:
         self.root.rowconfigure(0, weight=1)     # Główny wiersz rozciąga się
         self.root.rowconfigure(1, weight=0)     # Status bar ma stałą wysokość
         
+        # Monster.txt, MonsterSetBase/, Images/ and Backups/ of the current folder
+        self.repository = Repository()
+        
         # Initialize dictionaries
         self.monsters = {}
         self.monster_stats = {}
         
         # Initialize image variables
         self.current_map_image = None
-        self.photo_image = None
+        self.image_catalog = self.repository.images
+        self.images_dir_checked = False
+        self.fitted_image = None   # original_image already scaled to fitted_scale
+        self.fitted_scale = None
         self.original_width = 0
         self.original_height = 0
         self.scale = 1.0  # Default scale
+        self.map_image_path = None
+        self.map_bitmaps = LRUCache(MAP_BITMAP_BUDGET, weigh=lambda photo: photo.width() * photo.height())
+        self.map_tiles = {}       # (column, row) -> [canvas item, PhotoImage, tile key, is preview]
+        self.tile_key = None      # (image path, scale) the tiles should be rendered at
+        self.tile_preview = False
+        self.tile_job = None
+        self.resize_job = None
+        # Zoom is a number of ZOOM_FACTOR steps from the fitted scale, so zooming back hits the cache
+        self.zoom_base = 1.0
+        self.zoom_step = 0
         
         # Load monster data
-        self.load_monster_data("Monster/Monster.txt")
+        self.load_monster_data()
         
         # Load monster stats
         self.load_monster_stats()
@@ -100,20 +224,31 @@ class MonsterSpawnEditor:
         self.start_y = None
         self.selection_rect = None
         self.is_selecting = False
-        
-        # Store spawns
-        self.spawns = []
-        
-        # Coordinate display variables
-        self.coord_text = None
-        self.coord_bg = None
+        # Multi-selection for bulk edits (Shift+drag, Ctrl+click, Ctrl/Shift+click in the list)
+        self.selected_spawns = []
+        self.band_start = None
+        self.band_rect = None
+        self.bulk_window = None
         
         # Add status bar at the bottom
         self.create_status_bar()
         
+        # Load maps (scanned in the background, the list fills in as files are read)
+        self.load_available_maps()
+        
         # Bind closing event
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
 
+    @property
+    def spawns(self):
+        """Spawn list of the current map"""
+        return self.session.spawns
+
+    @property
+    def history(self):
+        """Undo/redo history of the current map"""
+        return self.session.history
+
     def set_program_icon(self):
         """Set the program icon if the icon file exists"""
         icon_path = "icon.ico"
@@ -125,76 +260,37 @@ class MonsterSpawnEditor:
                 myappid = f'shizoo.monsterspawneditor.1.0'  # arbitrary string
                 ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(myappid)
             except Exception as e:
-                print(f"Warning: Could not set taskbar icon: {str(e)}")
+                log.warning("Could not set taskbar icon: %s", e)
         else:
-            print("Icon file not found. Place 'icon.ico' in the program directory to set custom icon.")
+            log.info("Icon file not found. Place 'icon.ico' in the program directory to set custom icon.")
 
-    def load_monster_data(self, filename):
+    @profiled()
+    def load_monster_data(self):
         """Load basic monster data (ID, name, and type) from Monster.txt"""
+        filename = self.repository.monster_file
         try:
             # Sprawdź czy katalog Monster istnieje, jeśli nie - utwórz go
-            if not os.path.exists("Monster"):
-                try:
-                    os.makedirs("Monster")
+            try:
+                if self.repository.create_monster_dir():
                     self.status_var.set("Created Monster directory")
                     messagebox.showinfo("Directory Created", "Monster directory was created. Place your Monster.txt file in this directory.")
                     return
-                except Exception as e:
-                    messagebox.showerror("Error", f"Failed to create Monster directory: {str(e)}")
-                    return
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to create Monster directory: {str(e)}")
+                return
             
             # Sprawdź czy plik Monster.txt istnieje
-            if not os.path.exists(filename):
+            if not self.repository.has_monster_file():
                 self.status_var.set(f"File {filename} not found")
                 messagebox.showinfo("File Not Found", f"{filename} not found. Create or copy this file to the Monster directory.")
                 return
             
-            with open(filename, 'r') as f:
-                lines = f.readlines()
-                for line in lines:
-                    if line.strip() and not line.startswith('//'):
-                        # Split by whitespace but preserve quoted strings
-                        parts = []
-                        in_quotes = False
-                        current_part = []
-                        
-                        for char in line.strip():
-                            if char == '"':
-                                in_quotes = not in_quotes
-                                if not in_quotes and current_part:
-                                    parts.append(''.join(current_part))
-                                    current_part = []
-                            elif char.isspace() and not in_quotes:
-                                if current_part:
-                                    parts.append(''.join(current_part))
-                                    current_part = []
-                            else:
-                                current_part.append(char)
-                        
-                        if current_part:
-                            parts.append(''.join(current_part))
-                        
-                        if len(parts) >= 3 and parts[0].isdigit():
-                            monster_id = int(parts[0])
-                            # Extract full name (everything between quotes)
-                            full_name = ""
-                            match = re.search(r'"([^"]*)"', line)
-                            if match:
-                                full_name = match.group(1)
-                            else:
-                                full_name = parts[2].strip('"')
-                            
-                            # Default to monster type until we have more info
-                            monster_type = 2  # Default to monster
-                            
-                            self.monsters[monster_id] = {
-                                'name': full_name,
-                                'type': monster_type
-                            }
-                            
-                            # Debug output for important monsters
-                            if "spider" in full_name.lower():
-                                print(f"Found Spider in load_monster_data: ID={monster_id}, Name={full_name}, InitialType={monster_type}")
+            # Parse Monster.txt once; load_monster_stats reuses the same table
+            self.monster_file = filename
+            self.monster_table = self.repository.load_monsters()
+            table = self.monster_table
+            self.monsters = {monster_id: {'name': table.name(monster_id), 'type': table.monster_type(monster_id)}
+                             for monster_id in table}
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load monster data: {str(e)}")
             # Inicjalizuj pustą listę, aby uniknąć błędów w innych miejscach
@@ -209,6 +305,8 @@ class MonsterSpawnEditor:
         menubar.add_cascade(label="File", menu=file_menu)
         file_menu.add_command(label="Load Map", command=self.load_map_dialog, accelerator="Ctrl+O")
         file_menu.add_command(label="Save", command=self.save_changes, accelerator="Ctrl+S")
+        file_menu.add_command(label="Save All", command=self.save_all, accelerator="Ctrl+Shift+S")
+        file_menu.add_command(label="Save Monster Stats", command=self.save_monster_stats)
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.on_closing, accelerator="Alt+F4")
         
@@ -225,6 +323,10 @@ class MonsterSpawnEditor:
         
         edit_menu.add_separator()  # This will be index 2
         edit_menu.add_command(label="Delete Selected Spawn", command=self.delete_selected_spawn, accelerator="Del")
+        edit_menu.add_separator()
+        edit_menu.add_command(label="Bulk Edit Selected...", command=self.show_bulk_edit, accelerator="Ctrl+E")
+        edit_menu.add_command(label="Select Listed Spawns", command=self.select_listed_spawns)
+        edit_menu.add_command(label="Clear Selection", command=self.clear_spawn_selection, accelerator="Esc")
         
         self.edit_menu = edit_menu  # Store reference to edit menu
         
@@ -241,6 +343,19 @@ class MonsterSpawnEditor:
         view_menu.add_command(label="Zoom Out", command=self.zoom_out, accelerator="Ctrl+-")
         view_menu.add_command(label="Reset Zoom", command=self.reset_zoom, accelerator="Ctrl+0")
         
+        # Przełącznik logowania debug w trakcie działania programu
+        view_menu.add_separator()
+        self.debug_log_var = tk.BooleanVar(value=logging.getLogger().isEnabledFor(logging.DEBUG))
+        view_menu.add_checkbutton(label="Debug Log", variable=self.debug_log_var, command=self.toggle_debug_log)
+        
+        # Pomiar czasu handlerów; wyłączony nic nie kosztuje
+        self.profiling_var = tk.BooleanVar(value=PROFILER.enabled)
+        view_menu.add_checkbutton(label="Profiling", variable=self.profiling_var, command=self.toggle_profiling)
+        self.cprofile_var = tk.BooleanVar(value=False)
+        view_menu.add_checkbutton(label="cProfile Capture", variable=self.cprofile_var, command=self.toggle_cprofile)
+        view_menu.add_command(label="Profiling Stats...", command=self.show_profiling_stats)
+        view_menu.add_command(label="Dump Profiling Stats...", command=self.dump_profiling_stats)
+        
         help_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Help", menu=help_menu)
         help_menu.add_command(label="Instructions", command=self.show_instructions)
@@ -249,6 +364,7 @@ class MonsterSpawnEditor:
         # Bind keyboard shortcuts
         self.root.bind("<Control-o>", lambda e: self.load_map_dialog())
         self.root.bind("<Control-s>", lambda e: self.save_changes())
+        self.root.bind("<Control-S>", lambda e: self.save_all())
         self.root.bind("<Delete>", lambda e: self.delete_selected_spawn())
         self.root.bind("<Control-plus>", lambda e: self.zoom_in())
         self.root.bind("<Control-equal>", lambda e: self.zoom_in())  # Dla klawiatury amerykańskiej
@@ -256,6 +372,8 @@ class MonsterSpawnEditor:
         self.root.bind("<Control-0>", lambda e: self.reset_zoom())
         self.root.bind("<Control-z>", lambda e: self.undo())
         self.root.bind("<Control-y>", lambda e: self.redo())
+        self.root.bind("<Control-e>", lambda e: self.show_bulk_edit())
+        self.root.bind("<Escape>", lambda e: self.clear_spawn_selection())
 
     def create_panels(self):
         # Left panel
@@ -320,6 +438,15 @@ class MonsterSpawnEditor:
         self.modified_var = tk.StringVar(value="")
         modified_label = ttk.Label(status_frame, textvariable=self.modified_var, anchor=tk.E, foreground="red")
         modified_label.grid(row=0, column=3, sticky=(tk.E), padx=(10, 0))
+        
+        # Profiling readout (empty unless View > Profiling is on)
+        self.profile_var = tk.StringVar(value="")
+        profile_label = ttk.Label(status_frame, textvariable=self.profile_var, anchor=tk.E)
+        profile_label.grid(row=0, column=4, sticky=(tk.E), padx=(10, 0))
+        self.profile_job = None
+        self.profile_window = None
+        if PROFILER.enabled:
+            self.refresh_profiling()
 
     def create_map_selection(self):
         map_frame = ttk.LabelFrame(self.left_panel, text="Map Selection")
@@ -343,9 +470,6 @@ class MonsterSpawnEditor:
         map_y_scroll = ttk.Scrollbar(map_list_frame, orient="vertical", command=self.map_listbox.yview)
         map_y_scroll.grid(row=0, column=1, sticky=(tk.N, tk.S))
         self.map_listbox.configure(yscrollcommand=map_y_scroll.set)
-        
-        # Load maps
-        self.load_available_maps()
 
     def create_monster_list(self):
         monster_frame = ttk.LabelFrame(self.left_panel, text="New Mob Selection")
@@ -371,18 +495,13 @@ class MonsterSpawnEditor:
         monster_list_frame.columnconfigure(0, weight=1)
         monster_list_frame.rowconfigure(0, weight=1)
         
-        self.monster_listbox = tk.Listbox(monster_list_frame, height=10, width=25)
-        self.monster_listbox.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        self.monster_listbox.bind('<<ListboxSelect>>', self.on_monster_selected)
-        
-        # Add scrollbars - DODANO POZIOMY SCROLLBAR
-        monster_y_scroll = ttk.Scrollbar(monster_list_frame, orient="vertical", command=self.monster_listbox.yview)
-        monster_y_scroll.grid(row=0, column=1, sticky=(tk.N, tk.S))
-        
-        monster_x_scroll = ttk.Scrollbar(monster_list_frame, orient="horizontal", command=self.monster_listbox.xview)
-        monster_x_scroll.grid(row=1, column=0, sticky=(tk.W, tk.E))
-        
-        self.monster_listbox.configure(yscrollcommand=monster_y_scroll.set, xscrollcommand=monster_x_scroll.set)
+        # Lista wyświetla tylko widoczne wiersze; monster_rows mapuje wiersz -> ID potwora (lub nagłówek)
+        self.monster_rows = []
+        self.monster_index = None  # MonsterIndex, built on first use and after stats change
+        self.search_job = None
+        self.monster_list = VirtualList(monster_list_frame, self.monster_row_text,
+                                        on_select=self.on_monster_selected, height=10, width=25)
+        self.monster_list.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
         # Quantity field for monsters (not used for NPCs)
         quantity_frame = ttk.Frame(monster_frame)
@@ -613,15 +732,15 @@ class MonsterSpawnEditor:
         mob_type_frame = ttk.LabelFrame(controls_frame, text="Mob Type")
         mob_type_frame.grid(row=0, column=1, sticky=(tk.W, tk.N, tk.E), padx=(5, 0), pady=5)
         
-        self.mob_type_var = tk.IntVar(value=2)  # Default to Standard
+        # Mob Type is the monster's Attribute in Monster.txt (0 NPC, 1 Trap, 2 Monster)
+        self.mob_type_var = tk.IntVar(value=2)  # Default to Monster
+        self.loaded_mob_type = None  # type of the selected monster as read from Monster.txt
         
         # Create radio buttons for mob types in a more compact layout
         mob_types = [
             (0, "NPC", "yellow"),
-            (2, "Standard", "red"),
-            (1, "Multiple", "blue"),
-            (3, "Multiple", "green"),
-            (4, "Event", "cyan")
+            (2, "Monster", "red"),
+            (1, "Trap", "blue"),
         ]
         
         for i, (value, text, color) in enumerate(mob_types):
@@ -662,13 +781,36 @@ class MonsterSpawnEditor:
         y_scroll = ttk.Scrollbar(map_frame, orient="vertical", command=self.map_canvas.yview)
         y_scroll.grid(row=0, column=1, sticky=(tk.N, tk.S))
         
-        self.map_canvas.configure(xscrollcommand=x_scroll.set, yscrollcommand=y_scroll.set)
+        # Widoczne kafelki mapy są dorysowywane po każdym przewinięciu
+        def on_xscroll(first, last):
+            x_scroll.set(first, last)
+            self.schedule_tile_update()
+
+        def on_yscroll(first, last):
+            y_scroll.set(first, last)
+            self.schedule_tile_update()
+
+        self.map_canvas.configure(xscrollcommand=on_xscroll, yscrollcommand=on_yscroll)
+        
+        # Spawn markers are retained between redraws; events are bound once on their tag
+        self.spawn_scene = SpawnScene(self.map_canvas, self.map_to_scene_coords)
+        self.map_canvas.tag_bind(SPAWN_TAG, "<Enter>", self.on_spawn_enter)
+        self.map_canvas.tag_bind(SPAWN_TAG, "<Leave>", self.hide_spawn_tooltip)
+        self.map_canvas.tag_bind(SPAWN_TAG, "<Button-1>", self.on_spawn_click)
+        
+        # Tooltip ze współrzędnymi kursora - tworzony raz, potem tylko przesuwany
+        self.create_coord_overlay()
         
         # Bind events
         self.map_canvas.bind("<Motion>", self.on_mouse_move)
         self.map_canvas.bind("<Button-1>", self.on_mouse_down)
         self.map_canvas.bind("<B1-Motion>", self.on_mouse_drag)
         self.map_canvas.bind("<ButtonRelease-1>", self.on_mouse_up)
+        # Shift+drag zaznacza spawny prostokątem, Ctrl+klik dodaje/usuwa spawn z zaznaczenia
+        self.map_canvas.bind("<Shift-Button-1>", self.on_band_start)
+        self.map_canvas.bind("<Shift-B1-Motion>", self.on_band_drag)
+        self.map_canvas.bind("<Shift-ButtonRelease-1>", self.on_band_end)
+        self.map_canvas.bind("<Control-Button-1>", self.on_toggle_click)
         
         # Bind window resize event to update canvas scaling
         self.root.bind("<Configure>", self.on_window_resize)
@@ -691,8 +833,9 @@ class MonsterSpawnEditor:
         search_frame.columnconfigure(1, weight=1)  # Pole wyszukiwania rozciąga się
         
         ttk.Label(search_frame, text="Search:").grid(row=0, column=0, sticky=tk.W)
+        self.spawn_search_job = None
         self.spawn_search_var = tk.StringVar()
-        self.spawn_search_var.trace('w', self.update_spawn_list)
+        self.spawn_search_var.trace('w', self.filter_spawns)
         search_entry = ttk.Entry(search_frame, textvariable=self.spawn_search_var, width=30)
         search_entry.grid(row=0, column=1, sticky=(tk.W, tk.E))
         
@@ -712,19 +855,12 @@ class MonsterSpawnEditor:
         spawn_list_frame.columnconfigure(0, weight=1)
         spawn_list_frame.rowconfigure(0, weight=1)
         
-        # Spawn list
-        self.spawn_listbox = tk.Listbox(spawn_list_frame, height=10, width=50)
-        self.spawn_listbox.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        self.spawn_listbox.bind('<<ListboxSelect>>', self.on_spawn_selected)
-        
-        # Scrollbar for spawn list - DODANO POZIOMY SCROLLBAR
-        spawn_y_scrollbar = ttk.Scrollbar(spawn_list_frame, orient="vertical", command=self.spawn_listbox.yview)
-        spawn_y_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
-        
-        spawn_x_scrollbar = ttk.Scrollbar(spawn_list_frame, orient="horizontal", command=self.spawn_listbox.xview)
-        spawn_x_scrollbar.grid(row=1, column=0, sticky=(tk.W, tk.E))
-        
-        self.spawn_listbox.configure(yscrollcommand=spawn_y_scrollbar.set, xscrollcommand=spawn_x_scrollbar.set)
+        # Spawn list - tylko widoczne wiersze; spawn_rows mapuje wiersz -> indeks spawna (lub nagłówek)
+        self.spawn_rows = []
+        self.spawn_row_of = {}  # spawn index -> row
+        self.spawn_list = VirtualList(spawn_list_frame, self.spawn_row_text, on_select=self.on_spawn_selected,
+                                      height=10, width=50, on_mark=self.on_spawn_rows_marked)
+        self.spawn_list.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
         # Button frame
         button_frame = ttk.Frame(spawn_frame)
@@ -733,101 +869,25 @@ class MonsterSpawnEditor:
         # Remove button
         delete_button = ttk.Button(button_frame, text="Remove", command=self.delete_selected_spawn)
         delete_button.grid(row=0, column=0, sticky=(tk.E), padx=5)
+        
+        bulk_button = ttk.Button(button_frame, text="Bulk Edit...", command=self.show_bulk_edit)
+        bulk_button.grid(row=0, column=1, sticky=(tk.E), padx=5)
 
     def load_monster_stats(self):
         """Load detailed monster stats and determine correct monster types"""
         try:
-            with open("Monster/Monster.txt", 'r') as f:
-                lines = f.readlines()
-                for line in lines:
-                    if line.strip() and not line.startswith('//'):
-                        # Split by whitespace but preserve quoted strings
-                        parts = []
-                        in_quotes = False
-                        current_part = []
-                        
-                        for char in line.strip():
-                            if char == '"':
-                                in_quotes = not in_quotes
-                                if not in_quotes and current_part:
-                                    parts.append(''.join(current_part))
-                                    current_part = []
-                            elif char.isspace() and not in_quotes:
-                                if current_part:
-                                    parts.append(''.join(current_part))
-                                    current_part = []
-                            else:
-                                current_part.append(char)
-                        
-                        if current_part:
-                            parts.append(''.join(current_part))
-                        
-                        if len(parts) >= 17 and parts[0].isdigit():  # Make sure we have enough columns to read attribute
-                            try:
-                                monster_id = int(parts[0])
-                                
-                                # Extract full name (everything between quotes)
-                                full_name = ""
-                                match = re.search(r'"([^"]*)"', line)
-                                if match:
-                                    full_name = match.group(1)
-                                else:
-                                    full_name = parts[2].strip('"')
-                                
-                                # Get attack type (column 13) and attribute (column 19)
-                                attack_type = -1
-                                attribute = -1
-                                
-                                if len(parts) > 13 and parts[13].isdigit():
-                                    attack_type = int(parts[13])
-                                
-                                if len(parts) > 19 and parts[19].isdigit():  # Changed from 17 to 19
-                                    attribute = int(parts[19])
-                                    # Limit attribute to valid values (0, 1, 2)
-                                    if attribute not in [0, 1, 2]:
-                                        print(f"Warning: Invalid attribute value {attribute} for monster {monster_id}, setting to 2 (monster)")
-                                        attribute = 2  # Default to monster type if invalid
-                                
-                                # Debug output for all monsters
-                                print(f"Processing monster: ID={monster_id}, Name={full_name}")
-                                print(f"Parts: {parts}")
-                                print(f"Number of parts: {len(parts)}")
-                                print(f"Attack type: {attack_type}, Attribute: {attribute}")
-                                
-                                # Use attribute to determine monster type:
-                                # 0 = NPC, 1 = Trap, 2 = Monster
-                                monster_type = attribute  # Use attribute value directly as monster type
-                                
-                                # Store all monster data in stats
-                                self.monster_stats[monster_id] = {
-                                    'id': monster_id,
-                                    'name': full_name,
-                                    'type': monster_type,
-                                    'level': int(parts[3]) if parts[3].isdigit() else 0,
-                                    'hp': int(parts[4]) if parts[4].isdigit() else 0,
-                                    'mp': int(parts[5]) if parts[5].isdigit() else 0,
-                                    'mindmg': int(parts[6]) if parts[6].isdigit() else 0,
-                                    'maxdmg': int(parts[7]) if parts[7].isdigit() else 0,
-                                    'defense': int(parts[8]) if parts[8].isdigit() else 0,
-                                    'attackrate': int(parts[10]) if parts[10].isdigit() else 0,
-                                    'moverange': int(parts[12]) if parts[12].isdigit() else 0,
-                                    'attacktype': attack_type,
-                                    'viewrange': int(parts[14]) if parts[14].isdigit() else 0,
-                                    'attribute': attribute  # Store attribute value
-                                }
-                                
-                                # Update the monster type in the monsters dictionary
-                                if monster_id in self.monsters:
-                                    self.monsters[monster_id]['type'] = monster_type
-                                    
-                                # Debug output for spiders
-                                if "spider" in full_name.lower():
-                                    print(f"Spider stats loaded: ID={monster_id}, Name={full_name}, " +
-                                          f"AttackType={attack_type}, Attribute={attribute}, FinalType={monster_type}")
-                                
-                            except (IndexError, ValueError) as e:
-                                print(f"Warning: Could not parse monster stats for line: {line.strip()}")
-                                continue
+            table = getattr(self, 'monster_table', None)
+            if table is None:
+                table = self.monster_table = self.repository.load_monsters()
+            
+            for monster_id in table:
+                # Type comes from the Attribute column: 0 = NPC, 1 = Trap, 2 = Monster
+                stats = table.record(monster_id)
+                self.monster_stats[monster_id] = stats
+                
+                # Update the monster type in the monsters dictionary
+                if monster_id in self.monsters:
+                    self.monsters[monster_id]['type'] = stats['type']
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load monster stats: {str(e)}")
 
@@ -835,27 +895,83 @@ class MonsterSpawnEditor:
         self.map_listbox.delete(0, tk.END)
         
         # Sprawdź czy katalog istnieje, jeśli nie - utwórz go
-        if not os.path.exists("MonsterSetBase"):
-            try:
-                os.makedirs("MonsterSetBase")
+        try:
+            if self.repository.create_spawn_root():
                 self.status_var.set("Created MonsterSetBase directory")
                 messagebox.showinfo("Directory Created", "MonsterSetBase directory was created. Place your map files in this directory.")
                 return
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to create MonsterSetBase directory: {str(e)}")
-                return
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to create MonsterSetBase directory: {str(e)}")
+            return
         
-        # Wczytaj pliki map
+        # Pliki map skanujemy w osobnym wątku (razem z Event/ i Invasion/),
+        # lista wypełnia się w miarę jak wpisy przychodzą
+        self.map_catalog = {}
+        self.map_names = {}
+        self.catalog_queue = queue.Queue()
+        threading.Thread(target=self.scan_map_catalog, args=(self.catalog_queue,),
+                         name="map-catalog", daemon=True).start()
+        self.status_var.set("Scanning MonsterSetBase...")
+        self.root.after(CATALOG_POLL_MS, self.poll_map_catalog, self.catalog_queue)
+
+    def scan_map_catalog(self, results):
+        """Scanner thread: put a CatalogEntry per spawn file on ``results``, then None (no Tk calls here)"""
         try:
-            files = sorted(os.listdir("MonsterSetBase"))
-            for file in files:
-                if file.endswith(".txt") and not file.startswith("Event"):
-                    self.map_listbox.insert(tk.END, file)
-            
-            if not files:
-                self.status_var.set("No map files found in MonsterSetBase directory")
+            for entry in self.repository.scan_maps():
+                results.put(entry)
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to load maps: {str(e)}")
+            log.exception("Map catalogue scan failed")
+            results.put(e)
+        finally:
+            results.put(None)
+
+    def poll_map_catalog(self, results):
+        """Move scanned entries into the map list; reschedules itself until the scan is done"""
+        if results is not self.catalog_queue:
+            return  # a newer scan replaced this one
+        while True:
+            try:
+                entry = results.get_nowait()
+            except queue.Empty:
+                self.root.after(CATALOG_POLL_MS, self.poll_map_catalog, results)
+                return
+            if entry is None:
+                break
+            if isinstance(entry, Exception):
+                messagebox.showerror("Error", f"Failed to load maps: {str(entry)}")
+                continue
+            if entry.error:
+                log.warning("Cannot read %s: %s", entry.path, entry.error)
+            self.map_catalog[entry.path] = entry
+            if "/" not in entry.path and entry.map_number is not None:
+                self.map_names.setdefault(entry.map_number, split_map_name(entry.path)[1])
+            self.map_listbox.insert(tk.END, entry.path)
+            if entry.path == getattr(self, 'selected_map_file', None):
+                self.map_listbox.selection_set(tk.END)
+
+        if self.map_catalog:
+            spawns = sum(entry.spawns for entry in self.map_catalog.values())
+            self.status_var.set(f"Found {len(self.map_catalog)} map files ({spawns} spawns)")
+        else:
+            self.status_var.set("No map files found in MonsterSetBase directory")
+
+    def map_image_name(self, map_file):
+        """Map name used to find the image of a spawn file"""
+        map_number, name = split_map_name(map_file)
+        if map_number is None:
+            # Files spanning several maps (InvasionSetBase.txt) show their most common map
+            entry = self.map_catalog.get(map_file)
+            if entry and entry.map_number is not None:
+                name = self.map_names.get(entry.map_number, name)
+        return name
+
+    def default_map_number(self, map_file):
+        """MapNumber given to new spawns in a spawn file"""
+        map_number = split_map_name(map_file)[0]
+        if map_number is None:
+            entry = self.map_catalog.get(map_file)
+            map_number = entry.map_number if entry and entry.map_number is not None else 0
+        return map_number
 
     def load_map_dialog(self):
         # Open file dialog to select map file
@@ -865,95 +981,45 @@ class MonsterSpawnEditor:
             filetypes=[("Text Files", "*.txt")]
         )
         if file_path:
-            map_file = os.path.basename(file_path)
-            self.load_map(map_file)
+            # Files under MonsterSetBase/ (including Event/ and Invasion/) keep their relative path
+            map_file = os.path.relpath(os.path.abspath(file_path), os.path.abspath("MonsterSetBase"))
+            if map_file.startswith(os.pardir):
+                map_file = os.path.basename(file_path)
+            self.load_map(map_file.replace(os.sep, "/"))
 
+    @profiled()
     def load_map(self, map_file):
-        # Clear undo/redo stacks when loading a new map
-        self.undo_stack.clear()
-        self.redo_stack.clear()
-        self.update_undo_redo_states()
-        
+        # Mapa już otwarta: przełącz na nią, a plik wczytaj ponownie tylko po potwierdzeniu
+        if map_file in self.sessions:
+            if map_file not in self.modified_maps or not messagebox.askyesno(
+                    "Discard Changes?",
+                    f"{map_file} has unsaved changes.\n\nDiscard them (and their undo history) "
+                    f"and reload the file from disk?",
+                    icon="warning"):
+                self.switch_to_session(map_file)
+                return
         try:
-            # Load map data
-            with open(f"MonsterSetBase/{map_file}", 'r') as f:
-                self.spawns = []
-                section_type = None
-                for line in f:
-                    line = line.strip()
-                    # Skip empty lines and comments
-                    if not line or line.startswith('//'):
-                        continue
-                    # Check for section markers
-                    if line == "0":
-                        section_type = 0  # NPCs
-                        continue
-                    elif line == "1":
-                        section_type = 1  # Monsters/Traps
-                        continue
-                    elif line.lower() == "end":
-                        section_type = None
-                        continue
-                    parts = line.split()
-                    if section_type == 0 and len(parts) >= 6:  # NPC format
-                        self.spawns.append({
-                            'monster_id': int(parts[0]),
-                            'map_number': int(parts[1]),
-                            'range': int(parts[2]),
-                            'x': int(parts[3]),
-                            'y': int(parts[4]),
-                            'end_x': int(parts[3]),  # Same as x for NPCs
-                            'end_y': int(parts[4]),  # Same as y for NPCs
-                            'direction': int(parts[5]),
-                            'quantity': 1,  # Always 1 for NPCs
-                            'type': 0  # NPC
-                        })
-                    elif section_type == 1 and len(parts) >= 9:  # Monster format
-                        self.spawns.append({
-                            'monster_id': int(parts[0]),
-                            'map_number': int(parts[1]),
-                            'range': int(parts[2]),
-                            'x': int(parts[3]),
-                            'y': int(parts[4]),
-                            'end_x': int(parts[5]),
-                            'end_y': int(parts[6]),
-                            'direction': int(parts[7]),
-                            'quantity': int(parts[8]),
-                            'type': 1 if self.monsters.get(int(parts[0]), {}).get('type') == 1 else 2  # Trap or Monster
-                        })
-                    elif len(parts) >= 6:  # Legacy format
-                        monster_id = int(parts[0])
-                        monster_type = self.monsters.get(monster_id, {}).get('type', 2)
-                        self.spawns.append({
-                            'monster_id': monster_id,
-                            'map_number': int(parts[1]),
-                            'range': int(parts[2]),
-                            'x': int(parts[3]),
-                            'y': int(parts[4]),
-                            'end_x': int(parts[3]),  # Same as x for legacy format
-                            'end_y': int(parts[4]),  # Same as y for legacy format
-                            'direction': int(parts[5]),
-                            'quantity': 1,  # Default for legacy format
-                            'type': monster_type
-                        })
-                    else:
-                        print(f"Warning: Skipping malformed line: {line}")
-                        # Możesz też dodać ostrzeżenie dla użytkownika:
-                        # messagebox.showwarning("Malformed line", f"Skipped line: {line}")
-                        
-            # Save spawns to memory
-            self.map_spawns[map_file] = copy.deepcopy(self.spawns)
+            # Load map data - every section type (0-5) is kept, together with
+            # the original lines, so saving doesn't lose anything we don't edit
+            mtime, document, spawns = self.spawn_prefetch.take(map_file)
+            if mtime != self.repository.map_mtime(map_file):
+                mtime, document, spawns = self.read_map_file(map_file)  # changed on disk since it was prefetched
+            session = MapSession(map_file, document, spawns)
+            # A fresh session starts with an empty undo history
+            self.sessions[map_file] = session
+            self.session = session
+            self.selected_map_file = map_file
+            self.selected_spawn_index = -1
+            self.selected_spawns = []
+            self.modified_maps.discard(map_file)
+            self.update_modified_indicator()
+            self.update_undo_redo_states()
             
             # Po wczytaniu mapy automatycznie zaznacz ją na liście
-            for idx in range(self.map_listbox.size()):
-                if self.map_listbox.get(idx) == map_file:
-                    self.map_listbox.selection_clear(0, tk.END)
-                    self.map_listbox.selection_set(idx)
-                    self.map_listbox.activate(idx)
-                    break
+            self.select_map_in_list(map_file)
             # Load and display map image (lepsze mapowanie)
-            map_name = map_file.split(" - ")[1].split(".")[0]
-            image_path = self.find_map_image(map_name)
+            map_name = self.map_image_name(map_file)
+            image_path = self.map_image_path(map_file)
             expected_file = f"Images/{map_name.strip().replace(' ', '_')}.png"
             if not image_path or not os.path.exists(image_path):
                 messagebox.showwarning(
@@ -965,9 +1031,51 @@ class MonsterSpawnEditor:
             self.display_map_image(image_path)
             self.display_spawns()
             self.update_spawn_list()  # Update the spawn list
+            self.root.after_idle(self.prefetch_around, map_file)
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load map: {str(e)}")
+
+    @profiled()
+    def read_map_file(self, map_file):
+        """Parse a spawn file into (mtime, document, spawns); also runs on prefetch threads"""
+        return self.repository.read_map(
+            map_file, lambda monster_id: self.monsters.get(monster_id, {}).get('type', 2)
+        )
+
+    def map_image_key(self, image_path):
+        """Prefetch key of a map image decoded for the current canvas size"""
+        canvas_width = self.map_canvas.winfo_width()
+        canvas_height = self.map_canvas.winfo_height()
+        return (image_path, canvas_width if canvas_width > 1 else 800, canvas_height if canvas_height > 1 else 600)
+
+    def prefetch_around(self, map_file):
+        """Preload the maps next to ``map_file`` in the list and the recently used ones"""
+        if map_file != getattr(self, 'selected_map_file', None):
+            return  # the user has already moved on
+        if map_file in self.recent_maps:
+            self.recent_maps.remove(map_file)
+        self.recent_maps.insert(0, map_file)
+        del self.recent_maps[RECENT_MAPS + 1:]
+        
+        names = self.map_listbox.get(0, tk.END)
+        candidates = []
+        if map_file in names:
+            idx = names.index(map_file)
+            for distance in range(1, PREFETCH_NEIGHBOURS + 1):
+                candidates.extend(names[i] for i in (idx + distance, idx - distance) if 0 <= i < len(names))
+        candidates.extend(self.recent_maps[1:])
+        
+        # Otwarte mapy mają już swoje sesje, potrzebny im tylko obraz
+        self.spawn_prefetch.prefetch([name for name in candidates if name not in self.sessions])
+        images = [self.map_image_key(self.map_image_path)] if self.map_image_path else []
+        for name in candidates:
+            image_path = self.map_image_path(name)
+            if image_path:
+                images.append(self.map_image_key(image_path))
+        self.image_prefetch.prefetch(images)
+        log.debug("Prefetching %d spawn files and %d images around %s",
+                  len(self.spawn_prefetch.pending), len(self.image_prefetch.pending), map_file)
             
     def update_modified_indicator(self):
         """Update the modified indicator in status bar"""
@@ -977,88 +1085,51 @@ class MonsterSpawnEditor:
             else:
                 self.modified_var.set("")
 
-    def find_map_image(self, map_name):
-        import os
-        
-        # Sprawdź czy katalog Images istnieje, jeśli nie - utwórz go
-        if not os.path.exists("Images"):
+    def find_map_image(self, map_name, map_number=None):
+        """Image path for a map from the image catalogue, or None"""
+        path = self.image_catalog.resolve(map_name, map_number)
+        # Sprawdź czy katalog Images istnieje, jeśli nie - utwórz go (tylko raz)
+        if not self.image_catalog.exists and not self.images_dir_checked:
+            self.images_dir_checked = True
             try:
-                os.makedirs("Images")
+                self.repository.create_image_dir()
                 self.status_var.set("Created Images directory")
                 messagebox.showinfo("Directory Created", "Images directory was created. Place your map images in this directory.")
-                return None
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to create Images directory: {str(e)}")
-                return None
-        
-        kanturu_map_exceptions = {
-            'Kanturu 1': 'Kanturu_Ruins.png',
-            'Kanturu 2': 'Kanturu_Relics.png',
-        }
-        if map_name in kanturu_map_exceptions:
-            path = f"Images/{kanturu_map_exceptions[map_name]}"
-            if os.path.exists(path):
-                return path
-        base = map_name.strip().replace(" ", "_")
-        candidates = [
-            f"Images/{base}.png",
-            f"Images/{base.lower()}.png",
-            f"Images/{base.upper()}.png",
-            f"Images/{map_name.strip()}.png",
-            f"Images/{map_name.strip().lower()}.png",
-            f"Images/{map_name.strip().upper()}.png",
-        ]
-        for path in candidates:
-            if os.path.exists(path):
-                return path
-        # Fallback: spróbuj znaleźć plik, który zawiera nazwę mapy (ignorując wielkość liter i podkreślenia)
-        try:
-            files = os.listdir("Images")
-            for f in files:
-                if f.lower().endswith(".png") and base.lower() in f.lower():
-                    return os.path.join("Images", f)
-        except Exception:
-            pass
-        # Jeśli nie znaleziono, zwróć None
-        return None
+        return path
+
+    def map_image_path(self, map_file):
+        """Image path for a spawn file, by map number and name"""
+        map_number = split_map_name(map_file)[0]
+        if map_number is None and map_file in self.map_catalog:
+            map_number = self.map_catalog[map_file].map_number
+        return self.find_map_image(self.map_image_name(map_file), map_number)
 
+    @profiled()
     def display_map_image(self, image_path):
-        self.map_canvas.delete("all")  # Zawsze czyść canvas
+        # Czyść canvas, ale zostaw tooltip ze współrzędnymi (jest tworzony tylko raz)
+        self.map_canvas.delete("!coords")
+        self.spawn_scene.reset()
+        self.selection_rect = None
+        self.map_tiles.clear()
+        self.tile_key = None
+        self.map_image_path = image_path
         if image_path and os.path.exists(image_path):
             try:
-                image = Image.open(image_path)
-                self.original_width = image.width
-                self.original_height = image.height
-                self.original_image = image  # Zachowaj oryginalny obraz
-                
-                # Pobierz aktualny rozmiar canvas
-                canvas_width = self.map_canvas.winfo_width()
-                canvas_height = self.map_canvas.winfo_height()
-                
-                # Jeśli canvas nie ma jeszcze właściwego rozmiaru, użyj domyślnych wartości
-                if canvas_width <= 1:
-                    canvas_width = 800
-                if canvas_height <= 1:
-                    canvas_height = 600
+                # Obraz jest zwykle już zdekodowany i przeskalowany przez prefetch
+                # (jeśli nie, dekodujemy go teraz); rozmiar canvas jest częścią klucza
+                key = self.map_image_key(image_path)
+                decoded = self.image_prefetch.get(key)
+                self.original_width = decoded.image.width
+                self.original_height = decoded.image.height
+                self.original_image = decoded.image  # Zachowaj oryginalny obraz
+                self.fitted_image = decoded.fitted
+                self.fitted_scale = decoded.scale
                 
-                # Oblicz skalę, aby obraz zmieścił się w canvas
-                scale_x = canvas_width / image.width
-                scale_y = canvas_height / image.height
-                self.scale = min(scale_x, scale_y)
-                
-                # Skaluj obraz, jeśli jest za duży dla canvas
-                if self.scale < 1:
-                    new_width = int(image.width * self.scale)
-                    new_height = int(image.height * self.scale)
-                    resized_image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                    self.photo_image = ImageTk.PhotoImage(resized_image)
-                    self.map_canvas.create_image(0, 0, image=self.photo_image, anchor="nw")
-                    self.map_canvas.configure(scrollregion=(0, 0, new_width, new_height))
-                else:
-                    # Jeśli obraz jest mniejszy niż canvas, wyświetl bez skalowania
-                    self.photo_image = ImageTk.PhotoImage(image)
-                    self.map_canvas.create_image(0, 0, image=self.photo_image, anchor="nw")
-                    self.map_canvas.configure(scrollregion=(0, 0, image.width, image.height))
+                # Skala dopasowana do canvas (obrazy mniejsze niż canvas nie są powiększane)
+                self.set_fitted_scale(key[1], key[2])
+                self.show_map_bitmap()
                 
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to load map image: {str(e)}")
@@ -1067,10 +1138,10 @@ class MonsterSpawnEditor:
             self.original_width = 800
             self.original_height = 600
             self.scale = 1.0
-            self.photo_image = None
             self.original_image = None
+            self.fitted_image = None
             
-            self.map_canvas.create_rectangle(0, 0, self.original_width, self.original_height, fill="#222", outline="")
+            self.map_canvas.create_rectangle(0, 0, self.original_width, self.original_height, fill="#222", outline="", tags="map")
             self.map_canvas.configure(scrollregion=(0, 0, self.original_width, self.original_height))
         
         # Wymuś ponowne bindowanie <Motion> po każdej zmianie mapy
@@ -1079,83 +1150,80 @@ class MonsterSpawnEditor:
         # Pokaż spawny na nowej mapie
         self.display_spawns()
 
+    def scroll_offset(self):
+        """Scene pixel at the top-left corner of the canvas window"""
+        return (self.map_canvas.xview()[0] * self.original_width * self.scale,
+                self.map_canvas.yview()[0] * self.original_height * self.scale)
+
     def canvas_to_map_coords(self, canvas_x, canvas_y):
         """Convert canvas coordinates to map coordinates (0-255 range)"""
-        # Get current scroll position
-        scroll_x = self.map_canvas.xview()[0] * self.original_width
-        scroll_y = self.map_canvas.yview()[0] * self.original_height
-        
-        # Convert canvas coordinates to original image coordinates
-        raw_x = (canvas_x / self.scale) + scroll_x
-        raw_y = (canvas_y / self.scale) + scroll_y
-        
-        # Print raw values for debugging
-        print(f"Canvas: ({canvas_x}, {canvas_y}) -> Raw: ({raw_x}, {raw_y})")
-        
-        # Zabezpieczenie przed dzieleniem przez zero
-        if not hasattr(self, 'original_width') or self.original_width <= 0:
-            print("Warning: original_width is zero or not set")
-            return 0, 0
-        
-        if not hasattr(self, 'original_height') or self.original_height <= 0:
-            print("Warning: original_height is zero or not set")
+        if self.original_width <= 0 or self.original_height <= 0:
+            log.debug("Map size is zero or not set")
             return 0, 0
-        
-        # Convert to game coordinates (0-255 range)
-        # Używamy wartości zmiennoprzecinkowych dla lepszej precyzji
-        map_y_float = (raw_x / self.original_width) * 255.0
-        map_x_float = (raw_y / self.original_height) * 255.0
-        
-        # Stosuj zaokrąglenie matematyczne
-        map_y = int(round(map_y_float))
-        map_x = int(round(map_x_float))
-        
-        # Ensure coordinates stay within bounds
-        map_x = max(0, min(255, map_x))
-        map_y = max(0, min(255, map_y))
-        
-        print(f"Final map coords: ({map_x}, {map_y})")
-        
+        scroll_x, scroll_y = self.scroll_offset()
+        map_x, map_y = scene_to_map(canvas_x + scroll_x, canvas_y + scroll_y,
+                                    self.original_width, self.original_height, self.scale)
+        log.log(TRACE, "Canvas: (%s, %s) -> Map: (%s, %s)", canvas_x, canvas_y, map_x, map_y)
         return map_x, map_y
 
     def map_to_canvas_coords(self, map_x, map_y):
         """Convert map coordinates (0-255 range) to canvas coordinates"""
-        # Zabezpieczenie przed dzieleniem przez zero
-        if not hasattr(self, 'original_width') or self.original_width <= 0:
-            print("Warning: original_width is zero or not set")
-            return 0, 0
-        
-        if not hasattr(self, 'original_height') or self.original_height <= 0:
-            print("Warning: original_height is zero or not set")
+        if self.original_width <= 0 or self.original_height <= 0:
+            log.debug("Map size is zero or not set")
             return 0, 0
-        
-        # Get current scroll position
-        scroll_x = self.map_canvas.xview()[0] * self.original_width
-        scroll_y = self.map_canvas.yview()[0] * self.original_height
-        
-        # Convert from game coordinates (0-255) to image pixel coordinates
-        raw_x = (map_y / 255.0) * self.original_width
-        raw_y = (map_x / 255.0) * self.original_height
-        
-        # Apply scale and scroll offset
-        canvas_x = (raw_x - scroll_x) * self.scale
-        canvas_y = (raw_y - scroll_y) * self.scale
-        
-        print(f"Map: ({map_x}, {map_y}) -> Canvas: ({canvas_x}, {canvas_y})")
-        
-        return canvas_x, canvas_y
+        scroll_x, scroll_y = self.scroll_offset()
+        scene_x, scene_y = map_to_scene(map_x, map_y, self.original_width, self.original_height, self.scale)
+        log.log(TRACE, "Map: (%s, %s) -> Canvas: (%s, %s)", map_x, map_y, scene_x - scroll_x, scene_y - scroll_y)
+        return scene_x - scroll_x, scene_y - scroll_y
+
+    def map_to_scene_coords(self, map_x, map_y):
+        """Convert map coordinates (0-255 range) to scrollable canvas coordinates"""
+        return map_to_scene(map_x, map_y, self.original_width, self.original_height, self.scale)
+
+    def create_coord_overlay(self):
+        """Create the cursor coordinate tooltip; on_mouse_move only moves and re-labels it"""
+        self.coord_bg = self.map_canvas.create_rectangle(
+            0, 0, 0, 0,
+            fill="#000066",     # Ciemnogranatowe tło
+            outline="#FFFFFF",  # Biała ramka
+            width=2,           # Grubsza ramka
+            tags="coords",
+            state="hidden"
+        )
+        self.coord_text = self.map_canvas.create_text(
+            0, 0,
+            text="",
+            fill="#FFFFFF",     # Biały tekst
+            font=("Arial", 12, "bold"),
+            anchor="nw",
+            tags="coords",
+            state="hidden"
+        )
+        self.pending_motion = None
+        self.motion_job = None
 
     def on_mouse_move(self, event):
-        print("on_mouse_move event", event.x, event.y)  # debug
-        map_x, map_y = self.canvas_to_map_coords(event.x, event.y)
+        # Zdarzenia ruchu myszy łączone są w jedną aktualizację na klatkę
+        self.pending_motion = (event.x, event.y)
+        if self.motion_job is None:
+            self.motion_job = self.root.after(MOTION_FRAME_MS, self.flush_mouse_move)
+
+    @profiled()
+    def flush_mouse_move(self):
+        """Apply the latest pending motion event to the status bar and the coordinate tooltip"""
+        if self.motion_job is not None:
+            self.root.after_cancel(self.motion_job)
+            self.motion_job = None
+        if self.pending_motion is None:
+            return
+        x, y = self.pending_motion
+        self.pending_motion = None
+        
+        map_x, map_y = self.canvas_to_map_coords(x, y)
         # Update the coordinates in the status bar
         if hasattr(self, 'coordinates_var'):
-            self.coordinates_var.set(f"X: {map_x} Y: {map_y}")
-        # Remove old coordinate display if it exists
-        if self.coord_text:
-            self.map_canvas.delete(self.coord_text)
-        if self.coord_bg:
-            self.map_canvas.delete(self.coord_bg)
+            areas = len(self.spawn_scene.grid.covering(map_x, map_y))
+            self.coordinates_var.set(f"X: {map_x} Y: {map_y}" + (f"  Areas: {areas}" if areas else ""))
         
         # Format text with fixed width for better alignment
         text = f"X: {map_x:3d}  Y: {map_y:3d}"
@@ -1164,28 +1232,18 @@ class MonsterSpawnEditor:
         text_width = len(text) * 7  # Approximate width based on characters
         text_height = 20  # Fixed height for text
         
-        # Create background rectangle with ample padding
-        self.coord_bg = self.map_canvas.create_rectangle(
-            event.x + 10, 
-            event.y - 30,
-            event.x + 10 + text_width + 10,  # Add padding
-            event.y - 30 + text_height + 10, # Add padding
-            fill="#000066",     # Ciemnogranatowe tło
-            outline="#FFFFFF",  # Biała ramka
-            width=2,           # Grubsza ramka
-            tags="coords"
-        )
-        
-        # Create coordinate text centered on background
-        self.coord_text = self.map_canvas.create_text(
-            event.x + 15, 
-            event.y - 25,
-            text=text,
-            fill="#FFFFFF",     # Biały tekst
-            font=("Arial", 12, "bold"),
-            anchor="nw",
-            tags="coords"
+        # Move the background rectangle, with ample padding
+        self.map_canvas.coords(
+            self.coord_bg,
+            x + 10,
+            y - 30,
+            x + 10 + text_width + 10,  # Add padding
+            y - 30 + text_height + 10  # Add padding
         )
+        # Coordinate text centered on background
+        self.map_canvas.coords(self.coord_text, x + 15, y - 25)
+        self.map_canvas.itemconfigure(self.coord_text, text=text)
+        self.map_canvas.itemconfigure("coords", state="normal")
         
         # Make sure the coordinate display is always on top
         self.map_canvas.tag_raise("coords")
@@ -1193,7 +1251,11 @@ class MonsterSpawnEditor:
         # Zapisz ostatnio wyświetlane współrzędne, aby można było ich użyć później
         self.last_displayed_coords = (map_x, map_y)
 
+    @profiled()
     def on_mouse_down(self, event):
+        # Kliknięcie używa współrzędnych z tooltipa, więc najpierw zastosuj zaległy ruch myszy
+        self.on_mouse_move(event)
+        self.flush_mouse_move()
         # Usuwaj wszystkie tooltipy przy każdym kliknięciu na mapie
         self.hide_spawn_tooltip(None)
         # Sprawdź, czy kliknięto w istniejącego spawna (nie próbuj dodawać nowego)
@@ -1201,11 +1263,10 @@ class MonsterSpawnEditor:
         self.clicked_existing_spawn = False
         if clicked_items:
             tags = self.map_canvas.gettags(clicked_items[0])
-            for tag in tags:
-                if tag.startswith('spawn_'):
-                    # To jest kliknięcie w istniejącego spawna, nie dodawaj nowego
-                    self.clicked_existing_spawn = True
-                    return
+            if SPAWN_TAG in tags:
+                # To jest kliknięcie w istniejącego spawna, nie dodawaj nowego
+                self.clicked_existing_spawn = True
+                return
         # Jeśli kliknięto w pobliżu spawna, podświetl go na liście
         nearest_idx = self.find_nearest_spawn(event.x, event.y, max_distance=8)
         if nearest_idx is not None:
@@ -1226,17 +1287,29 @@ class MonsterSpawnEditor:
         self.is_selecting = True
 
     def find_nearest_spawn(self, canvas_x, canvas_y, max_distance=8):
-        min_dist = float('inf')
-        nearest_idx = None
-        for i, spawn in enumerate(self.spawns):
-            sx, sy = self.map_to_canvas_coords(spawn['x'], spawn['y'])
-            dist = ((canvas_x - sx) ** 2 + (canvas_y - sy) ** 2) ** 0.5
-            if dist < min_dist and dist <= max_distance:
-                min_dist = dist
-                nearest_idx = i
-        return nearest_idx
-
+        """Index of the spawn closest to a window point, within max_distance pixels"""
+        if self.original_width <= 0 or self.original_height <= 0 or self.scale <= 0:
+            return None
+        scene_x = self.map_canvas.canvasx(canvas_x)
+        scene_y = self.map_canvas.canvasy(canvas_y)
+        # Pozycja kliknięcia i promień w jednostkach mapy (oś X mapy to oś Y obrazu)
+        map_x, map_y = scene_to_map_float(scene_x, scene_y, self.original_width, self.original_height, self.scale)
+        radius = max_distance / cell_pixels(self.original_width, self.original_height, self.scale)
+
+        # Kandydaci z siatki, dokładny dystans liczony w pikselach
+        nearest = None
+        min_dist = max_distance
+        for spawn in self.spawn_scene.grid.near(map_x, map_y, radius):
+            sx, sy = self.map_to_scene_coords(spawn.x, spawn.y)
+            dist = ((scene_x - sx) ** 2 + (scene_y - sy) ** 2) ** 0.5
+            if dist <= min_dist:
+                nearest, min_dist = spawn, dist
+        return self.spawn_index(nearest) if nearest is not None else None
+
+    @profiled()
     def on_mouse_drag(self, event):
+        if self.band_start is not None:
+            return self.on_band_drag(event)  # Shift puszczony w trakcie zaznaczania
         if not self.is_selecting:
             return
             
@@ -1244,14 +1317,17 @@ class MonsterSpawnEditor:
         curr_y = self.map_canvas.canvasy(event.y)
         
         if self.selection_rect:
-            self.map_canvas.delete(self.selection_rect)
-            
-        self.selection_rect = self.map_canvas.create_rectangle(
-            self.start_x, self.start_y, curr_x, curr_y,
-            outline="blue", dash=(4, 4)
-        )
+            self.map_canvas.coords(self.selection_rect, self.start_x, self.start_y, curr_x, curr_y)
+        else:
+            self.selection_rect = self.map_canvas.create_rectangle(
+                self.start_x, self.start_y, curr_x, curr_y,
+                outline="blue", dash=(4, 4)
+            )
 
+    @profiled()
     def on_mouse_up(self, event):
+        if self.band_start is not None:
+            return self.on_band_end(event)
         if hasattr(self, 'clicked_existing_spawn') and self.clicked_existing_spawn:
             self.clicked_existing_spawn = False
             return
@@ -1270,6 +1346,7 @@ class MonsterSpawnEditor:
             )
         if self.selection_rect:
             self.map_canvas.delete(self.selection_rect)
+            self.selection_rect = None
 
     def add_single_spawn(self, canvas_x, canvas_y):
         if not hasattr(self, 'selected_map_file'):
@@ -1284,7 +1361,7 @@ class MonsterSpawnEditor:
             map_x, map_y = self.canvas_to_map_coords(canvas_x, canvas_y)
         
         self.add_spawn(map_x, map_y)
-        print(f"add_single_spawn: Using coords from tooltip: ({map_x}, {map_y})")
+        log.debug("add_single_spawn: Using coords from tooltip: (%s, %s)", map_x, map_y)
         messagebox.showinfo("Info", f"Added spawn at X:{map_x} Y:{map_y}")
 
     def generate_random_spawns(self, start_x, start_y, end_x, end_y):
@@ -1312,7 +1389,7 @@ class MonsterSpawnEditor:
             center_x = (start_map_x + end_map_x) // 2
             center_y = (start_map_y + end_map_y) // 2
             self.add_spawn(center_x, center_y)
-            print(f"generate_random_spawns (NPC): ({center_x}, {center_y})")
+            log.debug("generate_random_spawns (NPC): (%s, %s)", center_x, center_y)
             messagebox.showinfo("Info", f"Added NPC at X:{center_x} Y:{center_y}")
         else:
             self.add_spawn(
@@ -1321,13 +1398,12 @@ class MonsterSpawnEditor:
                 max(start_map_x, end_map_x),
                 max(start_map_y, end_map_y)
             )
-            print(f"generate_random_spawns (area): ({min(start_map_x, end_map_x)}, {min(start_map_y, end_map_y)}) to ({max(start_map_x, end_map_x)}, {max(start_map_y, end_map_y)})")
+            log.debug("generate_random_spawns (area): (%s, %s) to (%s, %s)",
+                      min(start_map_x, end_map_x), min(start_map_y, end_map_y),
+                      max(start_map_x, end_map_x), max(start_map_y, end_map_y))
             messagebox.showinfo("Info", f"Added spawn area: X:{min(start_map_x, end_map_x)}-{max(start_map_x, end_map_x)} Y:{min(start_map_y, end_map_y)}-{max(start_map_y, end_map_y)}")
 
     def add_spawn(self, x, y, end_x=None, end_y=None):
-        # Save current state before adding
-        self.save_state("Add Spawn")
-        
         # Używaj zapamiętanych wyborów
         monster_id = getattr(self, 'selected_monster_id', None)
         map_file = getattr(self, 'selected_map_file', None)
@@ -1343,123 +1419,168 @@ class MonsterSpawnEditor:
         if monster_type != 0:
             quantity = self.quantity_var.get()
         direction = self.direction_var.get()
-        # Pobierz numer mapy z nazwy pliku
-        try:
-            map_number = int(map_file.split(" - ")[0])
-        except Exception:
-            map_number = 0
-        spawn = {
-            'monster_id': monster_id,
-            'map_number': map_number,
-            'range': self.range_var.get(),
-            'x': x,
-            'y': y,
-            'end_x': end_x,
-            'end_y': end_y,
-            'direction': direction,
-            'quantity': quantity,
-            'type': monster_type
-        }
-        self.spawns.append(spawn)
-        self.display_spawns()
+        # Pobierz numer mapy z nazwy pliku (albo z katalogu dla plików z wieloma mapami)
+        map_number = self.default_map_number(map_file)
+        spawn = Spawn(
+            monster_id=monster_id,
+            map_number=map_number,
+            range=self.range_var.get(),
+            x=x,
+            y=y,
+            end_x=end_x,
+            end_y=end_y,
+            direction=direction,
+            quantity=quantity,
+            type=monster_type,
+            section=0 if monster_type == 0 else 1,
+            value=0
+        )
+        self.execute_command(InsertSpawns("Add Spawn", [(len(self.spawns), spawn)],
+                                          getattr(self, 'selected_spawn_index', -1)))
+        self.spawn_scene.add(spawn)
+        self.map_canvas.tag_raise("coords")
         self.update_spawn_list()
-        
-        # Mark map as modified
-        if hasattr(self, 'selected_map_file'):
-            self.modified_maps.add(self.selected_map_file)
-            self.update_modified_indicator()
 
+    @profiled()
     def display_spawns(self):
-        """Display all spawns on the map unless hide_mobs is checked"""
-        self.map_canvas.delete("spawn")
-        if self.coord_text:
-            self.map_canvas.delete(self.coord_text)
-        if self.coord_bg:
-            self.map_canvas.delete(self.coord_bg)
-        # If hide_mobs is checked, don't display any spawns
-        if hasattr(self, 'hide_mobs_var') and self.hide_mobs_var.get():
-            return
+        """Bring the spawn markers in line with self.spawns, redrawing only spawns that changed"""
+        scene = self.spawn_scene
+        scene.set_hidden(hasattr(self, 'hide_mobs_var') and self.hide_mobs_var.get())
+        scene.sync(self.spawns)
+        self.update_spawn_highlight()
+        # Keep the coordinate tooltip above newly created markers
+        self.map_canvas.tag_raise("coords")
+
+    def update_spawn_highlight(self):
+        """Re-style only the markers whose selection state changed"""
         selected_spawn = None
-        if hasattr(self, 'selected_spawn_index') and self.selected_spawn_index >= 0:
-            selected_spawn = self.spawns[self.selected_spawn_index]
-        if self.monster_listbox.curselection():
-            monster_text = self.monster_listbox.get(self.monster_listbox.curselection())
-            if not monster_text.startswith("==="):
-                selected_monster_id = int(monster_text.split(":")[0])
-        for i, spawn in enumerate(self.spawns):
-            # Convert map coordinates to canvas coordinates
-            canvas_x, canvas_y = self.map_to_canvas_coords(spawn['x'], spawn['y'])
-            is_selected = (i == self.selected_spawn_index if hasattr(self, 'selected_spawn_index') else False)
-            is_same_monster = False
-            if hasattr(self, 'selected_monster_id'):
-                is_same_monster = spawn['monster_id'] == self.selected_monster_id
-            # Draw spawn point with color based on mob type
-            color = "red"  # Default for standard monsters (type 2)
-            if spawn['type'] == 0:  # NPC
-                color = "yellow"
-            elif spawn['type'] == 1:  # Multiple 
-                color = "blue"
-            elif spawn['type'] == 3:  # Multiple (green)
-                color = "green"
-            elif spawn['type'] == 4:  # Event
-                color = "cyan"
-            radius = 6 if is_selected or is_same_monster else 4
-            outline_color = "white" if is_selected or is_same_monster else "black"
-            tag = f"spawn_{i}"
-            self.map_canvas.create_oval(
-                canvas_x-radius, canvas_y-radius,
-                canvas_x+radius, canvas_y+radius,
-                fill=color, outline=outline_color, width=2,
-                tags=("spawn", tag, f"monster_{spawn['monster_id']}")
-            )
-            # For monsters and traps with area, draw rectangle
-            if spawn['type'] != 0 and (spawn['x'] != spawn['end_x'] or spawn['y'] != spawn['end_y']):
-                canvas_end_x, canvas_end_y = self.map_to_canvas_coords(spawn['end_x'], spawn['end_y'])
-                self.map_canvas.create_rectangle(
-                    canvas_x, canvas_y, canvas_end_x, canvas_end_y,
-                    outline=color, dash=(2, 2), width=1,
-                    tags=("spawn", tag, f"monster_{spawn['monster_id']}")
-                )
-            # Add tooltip with monster info
-            monster_name = self.monsters.get(spawn['monster_id'], {}).get('name', "Unknown")
-            self.map_canvas.tag_bind(
-                f"monster_{spawn['monster_id']}", 
-                "<Enter>", 
-                lambda e, s=spawn, n=monster_name: self.show_spawn_tooltip(e, s, n)
-            )
-            self.map_canvas.tag_bind(
-                f"monster_{spawn['monster_id']}", 
-                "<Leave>", 
-                self.hide_spawn_tooltip
-            )
-            # Now bind click on this spawn to select it in the list
-            self.map_canvas.tag_bind(tag, "<Button-1>", lambda event, idx=i: self.select_spawn_in_list(idx))
+        idx = getattr(self, 'selected_spawn_index', -1)
+        if 0 <= idx < len(self.spawns):
+            selected_spawn = self.spawns[idx]
+        self.spawn_scene.set_selection(selected_spawn, getattr(self, 'selected_monster_id', None),
+                                       self.selected_spawns)
+
+    def spawn_index(self, spawn):
+        """Position of a spawn in self.spawns (by identity), or None"""
+        return self.session.index_of(spawn)
+
+    def on_spawn_enter(self, event):
+        """Show the tooltip of the spawn marker under the cursor"""
+        items = self.map_canvas.find_withtag(tk.CURRENT)
+        spawn = self.spawn_scene.spawn_at(items[0]) if items else None
+        if spawn is not None:
+            monster_name = self.monsters.get(spawn.monster_id, {}).get('name', "Unknown")
+            self.show_spawn_tooltip(event, spawn, monster_name)
+
+    def on_spawn_click(self, event):
+        """Select the clicked spawn marker in the list"""
+        if event.state & (SHIFT_MASK | CONTROL_MASK):
+            return  # Shift/Ctrl+click is handled by the multi-selection bindings
+        items = self.map_canvas.find_withtag(tk.CURRENT)
+        spawn = self.spawn_scene.spawn_at(items[0]) if items else None
+        idx = self.spawn_index(spawn) if spawn is not None else None
+        if idx is not None:
+            self.select_spawn_in_list(idx)
 
     def select_spawn_in_list(self, idx):
-        self.spawn_listbox.selection_clear(0, tk.END)
+        self.selected_spawns = []
         # Przesuń widok do wybranego spawna
-        self.spawn_listbox.selection_set(idx + self._spawn_listbox_offset(idx))
-        self.spawn_listbox.activate(idx + self._spawn_listbox_offset(idx))
-        self.spawn_listbox.see(idx + self._spawn_listbox_offset(idx))
+        row = self.spawn_row_of.get(idx)
+        if row is not None:
+            self.spawn_list.select(row)
         self.selected_spawn_index = idx
-        self.display_spawns()
+        self.update_spawn_highlight()
+
+    def set_spawn_selection(self, spawns):
+        """Select several spawns for bulk editing; they are kept in list order"""
+        order = self.session.positions()
+        unique = {id(spawn): spawn for spawn in spawns if id(spawn) in order}
+        self.selected_spawns = sorted(unique.values(), key=lambda spawn: order[id(spawn)])
+        self.selected_spawn_index = order[id(self.selected_spawns[0])] if len(self.selected_spawns) == 1 else -1
+        self.spawn_list.mark(self.marked_spawn_rows())
+        self.update_spawn_highlight()
+        self.update_bulk_window()
+        self.status_var.set(f"{len(self.selected_spawns)} spawn(s) selected")
+
+    def clear_spawn_selection(self):
+        self.cancel_band()
+        self.selected_spawns = []
+        self.selected_spawn_index = -1
+        self.spawn_list.mark([])
+        self.update_spawn_highlight()
+        self.update_bulk_window()
+
+    def selection_targets(self):
+        """Spawns a bulk edit applies to: the multi-selection, or else the selected spawn"""
+        if self.selected_spawns:
+            present = self.session.positions()
+            return [spawn for spawn in self.selected_spawns if id(spawn) in present]
+        idx = getattr(self, 'selected_spawn_index', -1)
+        return [self.spawns[idx]] if 0 <= idx < len(self.spawns) else []
+
+    def marked_spawn_rows(self):
+        """Spawn list rows of the multi-selection"""
+        if not self.selected_spawns:
+            return []
+        index_of = self.session.positions()
+        rows = (self.spawn_row_of.get(index_of.get(id(spawn))) for spawn in self.selected_spawns)
+        return [row for row in rows if row is not None]
+
+    def on_spawn_rows_marked(self, rows):
+        """Ctrl/Shift+click in the spawn list"""
+        indexes = (self.spawn_rows[row] for row in rows if 0 <= row < len(self.spawn_rows))
+        self.set_spawn_selection([self.spawns[i] for i in indexes if not isinstance(i, str)])
+
+    def select_listed_spawns(self):
+        """Select every spawn in the spawn list (the search filter applies)"""
+        self.set_spawn_selection([self.spawns[i] for i in self.spawn_rows if not isinstance(i, str)])
+
+    def on_toggle_click(self, event):
+        """Ctrl+click: add the spawn under the cursor to the selection, or take it out"""
+        self.hide_spawn_tooltip(None)
+        idx = self.find_nearest_spawn(event.x, event.y, max_distance=8)
+        if idx is None:
+            return
+        spawn = self.spawns[idx]
+        current = self.selection_targets()
+        if any(selected is spawn for selected in current):
+            current = [selected for selected in current if selected is not spawn]
+        else:
+            current.append(spawn)
+        self.set_spawn_selection(current)
 
-    def _spawn_listbox_offset(self, idx):
-        # Oblicz offset, bo spawn_listbox ma nagłówki "=== ... ==="
-        # Offset = liczba nagłówków przed idx
-        offset = 0
-        npcs = [s for s in self.spawns if s['type'] == 0]
-        monsters = [s for s in self.spawns if s['type'] != 0]
-        if npcs and monsters:
-            if idx < len(npcs):
-                offset = 1  # "=== NPCs ==="
-            else:
-                offset = 2 + len(npcs)  # "=== NPCs ===" + "=== Monsters & Traps ===" + npc lines
-        elif npcs:
-            offset = 1
-        elif monsters:
-            offset = 1
-        return offset
+    def on_band_start(self, event):
+        """Shift+drag: start a selection rectangle"""
+        self.hide_spawn_tooltip(None)
+        self.cancel_band()
+        self.band_start = (self.map_canvas.canvasx(event.x), self.map_canvas.canvasy(event.y))
+        self.band_rect = self.map_canvas.create_rectangle(*self.band_start, *self.band_start,
+                                                          outline="white", dash=(4, 4))
+
+    def on_band_drag(self, event):
+        if self.band_start is None:
+            return
+        self.map_canvas.coords(self.band_rect, *self.band_start,
+                               self.map_canvas.canvasx(event.x), self.map_canvas.canvasy(event.y))
+
+    @profiled()
+    def on_band_end(self, event):
+        """Select the spawns whose start point lies in the rectangle"""
+        if self.band_start is None:
+            return
+        start_x, start_y = self.band_start
+        end_x, end_y = self.map_canvas.canvasx(event.x), self.map_canvas.canvasy(event.y)
+        self.cancel_band()
+        size = (self.original_width, self.original_height, self.scale)
+        x0, y0 = scene_to_map(start_x, start_y, *size)
+        x1, y1 = scene_to_map(end_x, end_y, *size)
+        self.set_spawn_selection(self.spawn_scene.grid.within(x0, y0, x1, y1))
+
+    def cancel_band(self):
+        self.band_start = None
+        if self.band_rect is not None:
+            self.map_canvas.delete(self.band_rect)
+            self.band_rect = None
 
     def show_spawn_tooltip(self, event, spawn, monster_name):
         """Show tooltip with monster information when hovering over a spawn point"""
@@ -1470,16 +1591,16 @@ class MonsterSpawnEditor:
         self.tooltip.wm_overrideredirect(True)
         self.tooltip.wm_geometry(f"+{x+10}+{y+10}")
         # Format based on monster type
-        if spawn['type'] == 0:  # NPC
+        if spawn.type == 0:  # NPC
             label = tk.Label(self.tooltip, 
-                          text=f"{monster_name} (NPC)\nID: {spawn['monster_id']}\nPos: ({spawn['x']}, {spawn['y']}) [0-255]",
+                          text=f"{monster_name} (NPC)\nID: {spawn.monster_id}\nPos: ({spawn.x}, {spawn.y}) [0-255]",
                           justify=tk.LEFT, background="#ffffe0", relief=tk.SOLID, borderwidth=1)
         else:  # Monster or Trap
-            type_name = "Trap" if spawn['type'] == 1 else "Monster"
+            type_name = "Trap" if spawn.type == 1 else "Monster"
             label = tk.Label(self.tooltip, 
-                          text=(f"{monster_name} ({type_name})\nID: {spawn['monster_id']}\n"
-                               f"Range: {spawn['range']}\nQuantity: {spawn['quantity']}\n"
-                               f"Area: ({spawn['x']}, {spawn['y']}) - ({spawn['end_x']}, {spawn['end_y']}) [0-255]"),
+                          text=(f"{monster_name} ({type_name})\nID: {spawn.monster_id}\n"
+                               f"Range: {spawn.range}\nQuantity: {spawn.quantity}\n"
+                               f"Area: ({spawn.x}, {spawn.y}) - ({spawn.end_x}, {spawn.end_y}) [0-255]"),
                           justify=tk.LEFT, background="#ffffe0", relief=tk.SOLID, borderwidth=1)
         label.pack()
 
@@ -1489,83 +1610,74 @@ class MonsterSpawnEditor:
             self.tooltip.destroy()
             self.tooltip = None
 
-    def on_monster_selected(self, event):
-        selection = self.monster_listbox.curselection()
-        if selection:
-            monster_text = self.monster_listbox.get(selection[0])
-            if monster_text.startswith("==="):
-                return
+    @profiled()
+    def on_monster_selected(self, row):
+        monster_id = self.monster_rows[row] if 0 <= row < len(self.monster_rows) else None
+        if monster_id is None or isinstance(monster_id, str):
+            return  # Nagłówek sekcji
+        
+        self.selected_monster_id = monster_id
+        monster_type = self.monsters.get(monster_id, {}).get('type', 2)
+        
+        # Get the monster type directly from Monster.txt/monster_stats
+        if monster_id in self.monster_stats:
+            stats = self.monster_stats[monster_id]
             
-            # Extract monster ID from the text (format: "123: 🧍 Monster Name")
-            try:
-                monster_id = int(monster_text.split(":")[0])
-                self.selected_monster_id = monster_id
-                
-                # Get the monster type directly from Monster.txt/monster_stats
-                if monster_id in self.monster_stats:
-                    stats = self.monster_stats[monster_id]
-                    
-                    # Get attack type and attribute to determine correct monster type
-                    attack_type = stats.get('attacktype', -1)
-                    attribute = stats.get('attribute', -1)
-                    
-                    # Determine monster type based on attribute
-                    # 0 = NPC, 1 = Trap, 2 = Monster
-                    monster_type = attribute
-                    
-                    # Ensure type is correctly recorded in both dictionaries
-                    if monster_id in self.monster_stats:
-                        self.monster_stats[monster_id]['type'] = monster_type
-                    
-                    if monster_id in self.monsters:
-                        self.monsters[monster_id]['type'] = monster_type
-                    
-                    # Debug output with attribute number
-                    print(f"Selected monster: ID={monster_id}, Name={stats.get('name', 'Unknown')}, " +
-                          f"AttackType={attack_type}, Attribute={attribute}, FinalType={monster_type}")
-                    
-                    # Update all form fields with the correct monster stats
-                    for key, var in self.stat_vars.items():
-                        if key in stats:
-                            var.set(str(stats[key]))
-                        else:
-                            var.set("0")  # Default value
-                    
-                    # Set direction if available
-                    if hasattr(self, 'direction_var'):
-                        self.direction_var.set(stats.get('direction', -1))
-                    
-                    # Set mob type if available
-                    if hasattr(self, 'mob_type_var'):
-                        self.mob_type_var.set(monster_type)
-                
-                # Update quantity field based on monster type
-                if hasattr(self, 'quantity_spinbox'):
-                    if monster_type == 0:  # NPC
-                        self.quantity_spinbox.configure(state='disabled')
-                        self.quantity_var.set(1)
-                    else:
-                        self.quantity_spinbox.configure(state='normal')
-                
-                # Refresh display to highlight selected monster spawns
-                self.display_spawns()
-            except (ValueError, IndexError) as e:
-                print(f"Error parsing monster selection: {e}")
-                messagebox.showerror("Error", f"Failed to select monster: {str(e)}")
-
-    def filter_monsters(self, *args):
-        self.update_monster_list()
-
-    def update_monster_list(self):
-        """Update the monster list based on search text"""
-        self.monster_listbox.delete(0, tk.END)
-        search_text = self.search_var.get().lower()
+            # Get attack type and attribute to determine correct monster type
+            attack_type = stats.get('attacktype', -1)
+            attribute = stats.get('attribute', -1)
+            
+            # Determine monster type based on attribute
+            # 0 = NPC, 1 = Trap, 2 = Monster
+            monster_type = monster_type_from_attribute(attribute)
+            
+            # Ensure type is correctly recorded in both dictionaries
+            if monster_id in self.monster_stats:
+                self.monster_stats[monster_id]['type'] = monster_type
+            
+            if monster_id in self.monsters:
+                self.monsters[monster_id]['type'] = monster_type
+            if self.monster_index is not None:
+                self.monster_index.set_type(monster_id, monster_type)
+            
+            log.debug("Selected monster: ID=%s, Name=%s, AttackType=%s, Attribute=%s, FinalType=%s",
+                      monster_id, stats.get('name', 'Unknown'), attack_type, attribute, monster_type)
+            
+            # Update all form fields with the correct monster stats
+            for key, var in self.stat_vars.items():
+                if key in stats:
+                    var.set(str(stats[key]))
+                else:
+                    var.set("0")  # Default value
+            
+            # Set direction if available
+            if hasattr(self, 'direction_var'):
+                self.direction_var.set(stats.get('direction', -1))
         
-        # Create lists for different monster types
-        npcs = []
-        monsters = []
+        # Mob Type always follows the selected monster, so a stale one is never written back
+        self.show_mob_type(monster_id)
         
-        # Populate lists based on monster types from monster_stats
+        # Update quantity field based on monster type
+        if hasattr(self, 'quantity_spinbox'):
+            if monster_type == 0:  # NPC
+                self.quantity_spinbox.configure(state='disabled')
+                self.quantity_var.set(1)
+            else:
+                self.quantity_spinbox.configure(state='normal')
+        
+        # Refresh display to highlight selected monster spawns
+        self.update_spawn_highlight()
+
+    def filter_monsters(self, *args):
+        # Odfiltruj listę dopiero, gdy użytkownik przestanie pisać
+        if self.search_job is not None:
+            self.root.after_cancel(self.search_job)
+        self.search_job = self.root.after(SEARCH_DEBOUNCE_MS, self.update_monster_list)
+
+    @profiled()
+    def rebuild_monster_index(self):
+        """Index names, IDs and types of self.monsters for the monster picker"""
+        entries = []
         for monster_id, monster_data in self.monsters.items():
             # Get initial type from monster data
             monster_type = monster_data.get('type', 2)  # Default to monster (2)
@@ -1574,93 +1686,109 @@ class MonsterSpawnEditor:
             if hasattr(self, 'monster_stats') and monster_id in self.monster_stats:
                 monster_type = self.monster_stats[monster_id]['type']
                 monster_data['type'] = monster_type  # Update main record
-            
-            # Debug for spiders
-            if "spider" in monster_data['name'].lower():
-                print(f"Spider in update_monster_list: ID={monster_id}, Name={monster_data['name']}, Type={monster_type}")
-            
-            # Filter based on search text
-            if search_text in monster_data['name'].lower() or search_text in str(monster_id):
-                if monster_type == 0:  # NPCs have attacktype = 0
-                    npcs.append((monster_id, monster_data['name']))
-                else:  # All others are monsters (type 2, 3, 4)
-                    monsters.append((monster_id, monster_data['name']))
-        
-        # Add NPCs section
+            entries.append((monster_id, monster_data['name'], monster_type))
+        self.monster_index = MonsterIndex(entries)
+
+    @profiled()
+    def update_monster_list(self):
+        """Update the monster list based on search text"""
+        self.search_job = None
+        if self.monster_index is None:
+            self.rebuild_monster_index()
+        search_text = self.search_var.get()
+        npcs, monsters = self.monster_index.split_by_type(self.monster_index.search(search_text))
+        
+        # Wiersze listy: nagłówki sekcji (str) i ID potworów, posortowane po ID
+        rows = []
         if npcs:
-            self.monster_listbox.insert(tk.END, "=== NPCs ===")
-            # Sort by ID
-            for monster_id, name in sorted(npcs, key=lambda x: x[0]):
-                self.monster_listbox.insert(tk.END, f"{monster_id}: 🧍 {name}")
-        
-        # Add Monsters section
+            rows.append("NPCs")
+            rows.extend(npcs)
         if monsters:
-            self.monster_listbox.insert(tk.END, "=== Monsters ===")
-            # Sort by ID
-            for monster_id, name in sorted(monsters, key=lambda x: x[0]):
-                # Get the specific monster type for precise icon
-                monster_type = self.monsters[monster_id]['type']
-                type_symbol = "👹"  # Default monster icon
-                if monster_type == 3:
-                    type_symbol = "🟢"  # Green multiple
-                elif monster_type == 4:
-                    type_symbol = "🔵"  # Event
-                self.monster_listbox.insert(tk.END, f"{monster_id}: {type_symbol} {name}")
+            rows.append("Monsters")
+            rows.extend(monsters)
+        self.monster_rows = rows
+        selected = getattr(self, 'selected_monster_id', None)
+        self.monster_list.set_count(len(rows), rows.index(selected) if selected in rows else None)
                 
-        # Print debug info
-        print(f"Monster list updated with search: '{search_text}', found {len(npcs)} NPCs, {len(monsters)} monsters")
-
-    def save_changes(self):
-        map_file = getattr(self, 'selected_map_file', None)
-        if not map_file:
+        log.debug("Monster list updated with search: '%s', found %d NPCs, %d monsters", search_text, len(npcs), len(monsters))
+
+    def monster_row_text(self, row):
+        """Text of one row of the monster list"""
+        monster_id = self.monster_rows[row]
+        if isinstance(monster_id, str):
+            return f"=== {monster_id} ==="
+        name = self.monsters[monster_id]['name']
+        if self.monsters[monster_id]['type'] == 0:
+            return f"{monster_id}: 🧍 {name}"
+        # Get the specific monster type for precise icon
+        monster_type = self.monsters[monster_id]['type']
+        type_symbol = "👹"  # Default monster icon
+        if monster_type == 3:
+            type_symbol = "🟢"  # Green multiple
+        elif monster_type == 4:
+            type_symbol = "🔵"  # Event
+        return f"{monster_id}: {type_symbol} {name}"
+
+    def save_changes(self, map_file=None):
+        """Write one open map (the current one by default) back to MonsterSetBase/"""
+        map_file = map_file or getattr(self, 'selected_map_file', None)
+        if not map_file or map_file not in self.sessions:
             messagebox.showwarning("Warning", "Please select a map first")
             return
-        try:
-            filename = f"MonsterSetBase/{map_file}"
-            # Show info about filename format
-            messagebox.showinfo(
-                "Filename Reminder",
-                "Remember: The file name should be in the format '007 - Atlans.txt' (map number, dash, map name).\nSaving with a wrong name may cause issues in the game."
-            )
-            # Group spawns by type
-            npcs = [s for s in self.spawns if s['type'] == 0]
-            monsters = [s for s in self.spawns if s['type'] != 0]
-            with open(filename, 'w') as f:
-                # Write header
-                f.write("//=========================================================================================================================================" + "\n")
-                f.write("// NPCS\n")
-                f.write("//=========================================================================================================================================" + "\n")
-                f.write("0\n")
-                f.write("//Monster      MapNumber      Range      PositionX      PositionY      Direction      Comment\n")
-                # Write NPCs
-                for spawn in npcs:
-                    monster_name = self.monsters.get(spawn['monster_id'], {}).get('name', "Unknown")
-                    f.write(f"{spawn['monster_id']:<14}{spawn['map_number']:<14}{spawn['range']:<12}"
-                           f"{spawn['x']:<14}{spawn['y']:<14}{spawn['direction']:<14}//{monster_name}\n")
-                f.write("end\n\n")
-                # Write monsters section header
-                f.write("//=========================================================================================================================================" + "\n")
-                f.write("// MONSTERS\n")
-                f.write("//=========================================================================================================================================" + "\n")
-                f.write("1\n")
-                f.write("//Monster      MapNumber      Range      BeginPosX      BeginPosY      EndPosX      EndPosY      Direction      Quantity      Comment\n")
-                # Write monsters
-                for spawn in monsters:
-                    monster_name = self.monsters.get(spawn['monster_id'], {}).get('name', "Unknown")
-                    f.write(f"{spawn['monster_id']:<14}{spawn['map_number']:<14}{spawn['range']:<12}"
-                           f"{spawn['x']:<14}{spawn['y']:<14}{spawn['end_x']:<14}{spawn['end_y']:<14}"
-                           f"{spawn['direction']:<14}{spawn['quantity']:<14}//{monster_name}\n")
-                f.write("end\n")
-                
-            # Remove from modified maps list after saving
-            if map_file in self.modified_maps:
-                self.modified_maps.remove(map_file)
-                self.update_modified_indicator()
-                
-            messagebox.showinfo("Success", "Changes saved successfully")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to save changes: {str(e)}")
+        failed = self.save_maps([map_file])
+        if failed:
+            messagebox.showerror("Error", f"Failed to save changes: {failed[0].error}")
+
+    def save_all(self):
+        """Save every modified map in one batch; returns False if any failed"""
+        if not self.modified_maps:
+            self.status_var.set("No unsaved map changes")
+            return True
+        start = time.perf_counter()
+        failed = self.save_maps(sorted(self.modified_maps))
+        elapsed = (time.perf_counter() - start) * 1000
+        if failed:
+            details = "\n".join(f"{result.path}: {result.error}" for result in failed)
+            messagebox.showerror("Error", f"Failed to save {len(failed)} map(s):\n\n{details}")
+            return False
+        self.status_var.set(f"{self.status_var.get()} in {elapsed:.0f} ms")
+        return True
+
+    @profiled()
+    def save_maps(self, map_files):
+        """Save open maps in one batch, without dialogs; returns the SaveResults that failed.
+
+        Every file is written to a temp file and renamed over the old one, and
+        the previous version goes to Backups/ (the last BACKUP_KEEP are kept).
+        The texts are built from the stored sessions; the writes run
+        concurrently on a thread pool.
+        """
+        # Spawny wracają do sekcji, z których zostały wczytane;
+        # nowe trafiają do sekcji NPC (0) albo potworów (1)
+        results = self.repository.save_maps(
+            [self.sessions[map_file] for map_file in map_files],
+            lambda monster_id: self.monsters.get(monster_id, {}).get('name', "Unknown")
+        )
+        failed = []
+        for map_file, result in zip(map_files, results):
+            if result.error is not None:
+                log.error("Failed to save %s: %s", result.path, result.error)
+                failed.append(result)
+                continue
+            log.info("Saved %s%s", result.path, f" (backup {result.backup})" if result.backup else "")
+            self.modified_maps.discard(map_file)
+            # Plik na dysku się zmienił, więc wpis z prefetchu jest nieaktualny
+            self.spawn_prefetch.discard(map_file)
+        self.update_modified_indicator()
+        
+        saved = len(results) - len(failed)
+        if len(results) == 1:
+            self.status_var.set(f"Saved {map_files[0]}" if not failed else f"Failed to save {map_files[0]}")
+        else:
+            self.status_var.set(f"Saved {saved} of {len(results)} maps" + (f", {len(failed)} failed" if failed else ""))
+        return failed
 
+    @profiled()
     def on_map_selected(self, event):
         selection = self.map_listbox.curselection()
         if selection:
@@ -1669,35 +1797,9 @@ class MonsterSpawnEditor:
             if hasattr(self, 'selected_map_file') and self.selected_map_file == map_file:
                 return
                 
-            # Check if current map has unsaved changes and save them to memory
-            if hasattr(self, 'selected_map_file') and self.selected_map_file:
-                self.save_map_to_memory(self.selected_map_file)
-                
-            self.selected_map_file = map_file
-            
-            # Check if we already have spawns for this map in memory
-            if map_file in self.map_spawns:
-                # Load from memory
-                print(f"Loading map {map_file} from memory")
-                self.spawns = copy.deepcopy(self.map_spawns[map_file])
-                
-                # Clear undo/redo stacks when switching maps
-                self.undo_stack = []
-                self.redo_stack = []
-                self.update_undo_redo_states()
-                
-                # Load map image and display spawns
-                map_name = map_file.split(" - ")[1].split(".")[0]
-                image_path = self.find_map_image(map_name)
-                self.display_map_image(image_path)
-                self.display_spawns()
-                self.update_spawn_list()
-                
-                # Update status bar
-                if map_file in self.modified_maps:
-                    self.status_var.set(f"Loaded modified map: {map_file}")
-                else:
-                    self.status_var.set(f"Loaded map: {map_file}")
+            # Check if we already have this map open
+            if map_file in self.sessions:
+                self.switch_to_session(map_file)
             else:
                 # Load from file
                 self.load_map(map_file)
@@ -1705,91 +1807,231 @@ class MonsterSpawnEditor:
             # Update modified indicator
             self.update_modified_indicator()
 
+    def switch_to_session(self, map_file):
+        """Show a map that is already open (spawns and undo history are kept as they were)"""
+        log.debug("Loading map %s from memory", map_file)
+        self.selected_map_file = map_file
+        self.session = self.sessions[map_file]
+        self.selected_spawn_index = -1
+        self.selected_spawns = []
+        self.update_undo_redo_states()
+        self.select_map_in_list(map_file)
+        
+        # Load map image and display spawns
+        image_path = self.map_image_path(map_file)
+        self.display_map_image(image_path)
+        self.display_spawns()
+        self.update_spawn_list()
+        self.root.after_idle(self.prefetch_around, map_file)
+        self.update_modified_indicator()
+        
+        # Update status bar
+        if map_file in self.modified_maps:
+            self.status_var.set(f"Loaded modified map: {map_file}")
+        else:
+            self.status_var.set(f"Loaded map: {map_file}")
+
+    def select_map_in_list(self, map_file):
+        for idx in range(self.map_listbox.size()):
+            if self.map_listbox.get(idx) == map_file:
+                self.map_listbox.selection_clear(0, tk.END)
+                self.map_listbox.selection_set(idx)
+                self.map_listbox.activate(idx)
+                break
+
+    def filter_spawns(self, *args):
+        # Jak w filter_monsters: przebuduj listę dopiero po przerwie w pisaniu
+        if self.spawn_search_job is not None:
+            self.root.after_cancel(self.spawn_search_job)
+        self.spawn_search_job = self.root.after(SEARCH_DEBOUNCE_MS, self.update_spawn_list)
+
+    @profiled()
     def update_spawn_list(self, *args):
         """Update the spawn list with current spawns, with search filter"""
-        self.spawn_listbox.delete(0, tk.END)
+        if getattr(self, 'spawn_search_job', None) is not None:
+            # A direct refresh covers the pending filter run
+            self.root.after_cancel(self.spawn_search_job)
+            self.spawn_search_job = None
         search_text = self.spawn_search_var.get().lower() if hasattr(self, 'spawn_search_var') else ""
-        # Group spawns by type
-        npcs = [s for s in self.spawns if s['type'] == 0]
-        monsters = [s for s in self.spawns if s['type'] != 0]
+        # Group spawns by type (rows hold spawn indexes, so text is only built for visible rows)
+        npcs = []
+        monsters = []
+        for i, spawn in enumerate(self.spawns):
+            (npcs if spawn.type == 0 else monsters).append(i)
+        rows = []
         # Add NPCs section
         if npcs:
-            self.spawn_listbox.insert(tk.END, "=== NPCs ===")
-            for spawn in npcs:
-                monster_name = self.monsters.get(spawn['monster_id'], {}).get('name', "Unknown")
-                entry = f"🧍 {monster_name} at ({spawn['x']}, {spawn['y']})"
+            rows.append("=== NPCs ===")
+            for i in npcs:
+                spawn = self.spawns[i]
                 if (not search_text or
-                    search_text in monster_name.lower() or
-                    search_text in str(spawn['monster_id']) or
-                    search_text in "npc"):
-                    self.spawn_listbox.insert(tk.END, entry)
+                    search_text in "npc" or
+                    search_text in str(spawn.monster_id) or
+                    search_text in self.monsters.get(spawn.monster_id, {}).get('name', "Unknown").lower()):
+                    rows.append(i)
         # Add Monsters/Traps section
         if monsters:
-            self.spawn_listbox.insert(tk.END, "=== Monsters & Traps ===")
-            for spawn in monsters:
-                monster_name = self.monsters.get(spawn['monster_id'], {}).get('name', "Unknown")
-                type_icon = "⚠️" if spawn['type'] == 1 else "👹"
-                entry = f"{type_icon} {monster_name} - Qty: {spawn['quantity']} - Area: ({spawn['x']}, {spawn['y']}) to ({spawn['end_x']}, {spawn['end_y']})"
+            rows.append("=== Monsters & Traps ===")
+            for i in monsters:
+                spawn = self.spawns[i]
                 if (not search_text or
-                    search_text in monster_name.lower() or
-                    search_text in str(spawn['monster_id']) or
-                    (spawn['type'] == 1 and "trap" in search_text) or
-                    (spawn['type'] != 1 and "monster" in search_text)):
-                    self.spawn_listbox.insert(tk.END, entry)
-
-    def on_spawn_selected(self, event):
-        """Handle spawn selection in the list"""
-        selection = self.spawn_listbox.curselection()
-        if not selection:
-            return
-            
-        selected_text = self.spawn_listbox.get(selection[0])
-        if selected_text.startswith("==="):
-            return
-            
-        # Find the corresponding spawn
-        spawn_index = -1
-        for i, spawn in enumerate(self.spawns):
-            monster_name = self.monsters.get(spawn['monster_id'], {}).get('name', "Unknown")
-            
-            if spawn['type'] == 0:  # NPC
-                if f"🧍 {monster_name} at ({spawn['x']}, {spawn['y']})" == selected_text:
-                    spawn_index = i
-                    break
-            else:  # Monster or Trap
-                type_icon = "⚠️" if spawn['type'] == 1 else "👹"
-                if f"{type_icon} {monster_name} - Qty: {spawn['quantity']} - Area: ({spawn['x']}, {spawn['y']}) to ({spawn['end_x']}, {spawn['end_y']})" == selected_text:
-                    spawn_index = i
-                    break
-        
-        if spawn_index >= 0:
-            # Highlight the selected spawn on the map
-            self.selected_spawn_index = spawn_index
-            self.display_spawns()
+                    search_text in str(spawn.monster_id) or
+                    (spawn.type == 1 and "trap" in search_text) or
+                    (spawn.type != 1 and "monster" in search_text) or
+                    search_text in self.monsters.get(spawn.monster_id, {}).get('name', "Unknown").lower()):
+                    rows.append(i)
+        self.spawn_rows = rows
+        PROFILER.count("spawn list rows", len(rows))
+        self.spawn_row_of = {index: row for row, index in enumerate(rows) if not isinstance(index, str)}
+        self.spawn_list.set_count(len(rows), self.spawn_row_of.get(getattr(self, 'selected_spawn_index', -1)),
+                                  self.marked_spawn_rows())
+
+    def spawn_row_text(self, row):
+        """Text of one row of the spawn list"""
+        index = self.spawn_rows[row]
+        if isinstance(index, str):
+            return index
+        spawn = self.spawns[index]
+        monster_name = self.monsters.get(spawn.monster_id, {}).get('name', "Unknown")
+        if spawn.type == 0:  # NPC
+            return f"🧍 {monster_name} at ({spawn.x}, {spawn.y})"
+        type_icon = "⚠️" if spawn.type == 1 else "👹"
+        return f"{type_icon} {monster_name} - Qty: {spawn.quantity} - Area: ({spawn.x}, {spawn.y}) to ({spawn.end_x}, {spawn.end_y})"
 
     def delete_selected_spawn(self):
-        """Delete the currently selected spawn"""
+        """Delete the currently selected spawn (or every spawn of a multi-selection)"""
+        if len(self.selected_spawns) > 1:
+            self.apply_bulk_edit(lambda spawns: delete_spawns(self.spawns, spawns))
+            return
         if hasattr(self, 'selected_spawn_index') and self.selected_spawn_index >= 0:
-            # Save current state before deleting
-            self.save_state("Remove Spawn")
-            
             # Remove the spawn
-            del self.spawns[self.selected_spawn_index]
+            index = self.selected_spawn_index
+            spawn = self.spawns[index]
+            self.execute_command(DeleteSpawns("Remove Spawn", [(index, spawn)], index))
             self.selected_spawn_index = -1
             
             # Update the display
             self.update_spawn_list()
-            self.display_spawns()
-            
-            # Mark map as modified
-            if hasattr(self, 'selected_map_file'):
-                self.modified_maps.add(self.selected_map_file)
-                self.update_modified_indicator()
+            self.spawn_scene.remove(spawn)
+
+    def show_bulk_edit(self):
+        """Window with the bulk operations; they act on whatever is selected when a button is pressed"""
+        if self.bulk_window is not None and self.bulk_window.winfo_exists():
+            self.bulk_window.lift()
+            return
+        window = tk.Toplevel(self.root)
+        window.title("Bulk Edit")
+        window.transient(self.root)
+        window.resizable(False, False)
+        frame = ttk.Frame(window, padding=10)
+        frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        self.bulk_count_var = tk.StringVar()
+        ttk.Label(frame, textvariable=self.bulk_count_var).grid(row=0, column=0, columnspan=5, sticky=tk.W, pady=(0, 8))
+        
+        dx_var, dy_var = tk.IntVar(value=0), tk.IntVar(value=0)
+        quantity_var, percent_var = tk.IntVar(value=self.quantity_var.get()), tk.IntVar(value=120)
+        range_var, direction_var = tk.IntVar(value=self.range_var.get()), tk.IntVar(value=-1)
+        monster_var = tk.IntVar(value=getattr(self, 'selected_monster_id', 0) or 0)
+        
+        def spinbox(row, column, var, low, high):
+            tk.Spinbox(frame, from_=low, to=high, textvariable=var, width=6).grid(row=row, column=column, padx=2, pady=2)
+        
+        ttk.Label(frame, text="Move X / Y by:").grid(row=1, column=0, sticky=tk.W)
+        spinbox(1, 1, dx_var, -255, 255)
+        spinbox(1, 2, dy_var, -255, 255)
+        ttk.Button(frame, text="Move", command=lambda: self.apply_bulk_edit(
+            lambda spawns: translate_spawns(spawns, self.checked(dx_var, -255, 255, "X"),
+                                           self.checked(dy_var, -255, 255, "Y")))).grid(row=1, column=4, sticky=tk.E)
+        
+        ttk.Label(frame, text="Quantity:").grid(row=2, column=0, sticky=tk.W)
+        spinbox(2, 1, quantity_var, 1, 100)
+        ttk.Button(frame, text="Set", command=lambda: self.apply_bulk_edit(
+            lambda spawns: set_spawn_fields(spawns, {'quantity': self.checked(quantity_var, 1, 100, "Quantity")},
+                                            "Set Quantity"))).grid(row=2, column=4, sticky=tk.E)
+        ttk.Label(frame, text="Scale quantity %:").grid(row=3, column=0, sticky=tk.W)
+        spinbox(3, 1, percent_var, 1, 1000)
+        ttk.Button(frame, text="Scale", command=lambda: self.apply_bulk_edit(
+            lambda spawns: scale_quantity(spawns, self.checked(percent_var, 1, 1000, "Percent") / 100))
+        ).grid(row=3, column=4, sticky=tk.E)
+        
+        ttk.Label(frame, text="Range:").grid(row=4, column=0, sticky=tk.W)
+        spinbox(4, 1, range_var, 0, 255)
+        ttk.Button(frame, text="Set", command=lambda: self.apply_bulk_edit(
+            lambda spawns: set_spawn_fields(spawns, {'range': self.checked(range_var, 0, 255, "Range")},
+                                            "Set Range"))).grid(row=4, column=4, sticky=tk.E)
+        
+        ttk.Label(frame, text="Direction (-1 = random):").grid(row=5, column=0, sticky=tk.W)
+        spinbox(5, 1, direction_var, -1, 7)
+        ttk.Button(frame, text="Set", command=lambda: self.apply_bulk_edit(
+            lambda spawns: set_spawn_fields(spawns, {'direction': self.checked(direction_var, -1, 7, "Direction")},
+                                            "Set Direction"))).grid(row=5, column=4, sticky=tk.E)
+        
+        ttk.Label(frame, text="Monster ID:").grid(row=6, column=0, sticky=tk.W)
+        spinbox(6, 1, monster_var, 0, 65535)
+        ttk.Button(frame, text="Set", command=lambda: self.apply_bulk_edit(self.retarget_command(monster_var))
+                   ).grid(row=6, column=4, sticky=tk.E)
+        
+        ttk.Button(frame, text="Remove Selected", command=lambda: self.apply_bulk_edit(
+            lambda spawns: delete_spawns(self.spawns, spawns))).grid(row=7, column=0, columnspan=5, sticky=tk.E, pady=(8, 0))
+        
+        self.bulk_window = window
+        self.update_bulk_window()
+
+    def update_bulk_window(self):
+        if self.bulk_window is not None and self.bulk_window.winfo_exists():
+            count = len(self.selection_targets())
+            self.bulk_count_var.set(f"{count} spawn(s) selected - Shift+drag on the map or Ctrl+click to select")
+
+    @staticmethod
+    def checked(var, low, high, label):
+        """Value of an IntVar, or ValueError if it is not a number in [low, high]"""
+        try:
+            value = var.get()
+        except tk.TclError:
+            raise ValueError(f"{label} must be a number") from None
+        if not low <= value <= high:
+            raise ValueError(f"{label} must be between {low} and {high}")
+        return value
+
+    def retarget_command(self, monster_var):
+        """Bulk edit builder that points spawns at the monster ID in ``monster_var``"""
+        def build(spawns):
+            monster_id = self.checked(monster_var, 0, 65535, "Monster ID")
+            if monster_id not in self.monsters:
+                raise ValueError(f"Monster {monster_id} is not in Monster.txt")
+            return retarget_spawns(spawns, monster_id, self.monsters[monster_id]['type'])
+        return build
+
+    @profiled()
+    def apply_bulk_edit(self, build):
+        """Run ``build(spawns)`` on the selected spawns and apply the command it returns:
+        one history entry and one redraw however many spawns it touches"""
+        targets = self.selection_targets()
+        if not targets:
+            self.status_var.set("No spawns selected")
+            return
+        try:
+            command = build(targets)
+        except (ValueError, tk.TclError) as e:
+            messagebox.showwarning("Warning", str(e))
+            return
+        if isinstance(command, ModifySpawns) and not command:
+            self.status_var.set("Nothing to change")
+            return
+        self.execute_command(command)
+        if isinstance(command, DeleteSpawns):
+            self.selected_spawns = []
+            self.selected_spawn_index = -1
+        self.display_spawns()
+        self.update_spawn_list()
+        self.update_bulk_window()
 
     def toggle_mobs_visibility(self):
         """Toggle the visibility of mobs on the map"""
         self.display_spawns()
 
+    @profiled()
     def update_monster_stats(self):
         """Update the monster stats based on the UI values"""
         if not hasattr(self, 'selected_monster_id'):
@@ -1811,23 +2053,77 @@ class MonsterSpawnEditor:
             else:
                 updated_stats[key] = var.get()
         
-        # Update the monster stats in memory
-        self.monster_stats[monster_id] = updated_stats
-        self.monster_stats[monster_id]['id'] = monster_id
+        # Mob Type is the Attribute column; it overrides the Attrb field only when the user changed it
+        monster_type = self.mob_type_var.get()
+        if self.loaded_mob_type is not None and monster_type != self.loaded_mob_type:
+            updated_stats['attribute'] = monster_type
+            self.stat_vars['attribute'].set(str(monster_type))
+        else:
+            monster_type = monster_type_from_attribute(updated_stats.get('attribute', 2))
+        
+        # Record the change in the Monster.txt table so File > Save Monster Stats can write it;
+        # the table checks every value before changing any, so a bad value leaves the row as it was
+        table = getattr(self, 'monster_table', None)
+        if table is not None and monster_id in table:
+            try:
+                table.update(monster_id, updated_stats)
+            except OverflowError:
+                messagebox.showwarning("Warning", "One of the values is too large for Monster.txt")
+                return
+            if table.dirty:
+                self.status_var.set("Monster.txt has unsaved changes")
+        
+        # Update the monster stats in memory, keeping the columns the panel doesn't show
+        stats = self.monster_stats.setdefault(monster_id, {})
+        stats.update(updated_stats)
+        stats['id'] = monster_id
         
         # Update the monster name in the monster list
         self.monsters[monster_id]['name'] = updated_stats['name']
         
         # Update the monster type
-        monster_type = self.mob_type_var.get()
         self.monsters[monster_id]['type'] = monster_type
-        self.monster_stats[monster_id]['type'] = monster_type
+        stats['type'] = monster_type
+        self.mob_type_var.set(monster_type)
+        self.loaded_mob_type = monster_type
         
-        # Refresh the monster list and spawns
+        # Refresh the monster list and spawns (name or type may have changed)
+        self.monster_index = None
+        self.spawn_prefetch.clear()  # prefetched spawns carry the old type
         self.update_monster_list()
         self.display_spawns()
         messagebox.showinfo("Success", f"Monster {monster_id} updated successfully")
 
+    def show_mob_type(self, monster_id):
+        """Fill the Mob Type control from the monster's Monster.txt row"""
+        if not hasattr(self, 'mob_type_var'):
+            return
+        table = getattr(self, 'monster_table', None)
+        if table is not None and monster_id in table:
+            monster_type = table.monster_type(monster_id)
+        elif monster_id in self.monster_stats:
+            monster_type = monster_type_from_attribute(self.monster_stats[monster_id].get('attribute', 2))
+        else:
+            monster_type = self.monsters.get(monster_id, {}).get('type', 2)
+        self.mob_type_var.set(monster_type)
+        self.loaded_mob_type = monster_type
+
+    def save_monster_stats(self):
+        """Write edited monster stats back to Monster.txt, touching only the changed rows;
+        returns False if the file couldn't be written"""
+        table = getattr(self, 'monster_table', None)
+        if table is None or not table.dirty:
+            self.status_var.set("No monster stat changes to save")
+            return True
+        try:
+            count = self.repository.save_monsters(table)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save monster stats: {str(e)}")
+            return False
+        self.status_var.set(f"Saved {count} monster(s) to {self.monster_file}")
+        messagebox.showinfo("Success", f"Saved {count} changed monster(s) to {self.monster_file}")
+        return True
+
     def update_direction_label(self):
         value = self.direction_var.get()
         self.direction_label_var.set(f"Selected direction: {value}")
@@ -1851,6 +2147,9 @@ Tips:
 - Click on existing spawns to select them
 - Use the Remove button to delete selected spawns
 - Toggle "Hide Mobs" to see the map without spawns
+- Shift+drag on the map (or Ctrl/Shift+click in the spawn list) selects many spawns;
+  Ctrl+click on the map adds or removes one. Edit > Bulk Edit (Ctrl+E) then moves them,
+  sets or scales quantity, sets range, direction or monster in one undoable step
         """
         messagebox.showinfo("Instructions", instructions)
         
@@ -1866,6 +2165,7 @@ A visual editor for MU Online monster spawn files.
         """
         messagebox.showinfo("About", about_text)
 
+    @profiled()
     def update_spawn_coordinates(self):
         """Update the coordinates of the selected spawn"""
         if not hasattr(self, 'selected_spawn_index') or self.selected_spawn_index < 0:
@@ -1873,9 +2173,6 @@ A visual editor for MU Online monster spawn files.
             return
             
         try:
-            # Save current state before updating
-            self.save_state("Update Coordinates")
-            
             # Pobierz wartości z pól
             x = self.spawn_x_var.get()
             y = self.spawn_y_var.get()
@@ -1888,86 +2185,66 @@ A visual editor for MU Online monster spawn files.
                 return
                 
             # Aktualizuj spawn
-            self.spawns[self.selected_spawn_index]['x'] = x
-            self.spawns[self.selected_spawn_index]['y'] = y
-            self.spawns[self.selected_spawn_index]['end_x'] = end_x
-            self.spawns[self.selected_spawn_index]['end_y'] = end_y
+            spawn = self.spawns[self.selected_spawn_index]
+            values = {'x': x, 'y': y, 'end_x': end_x, 'end_y': end_y}
             
             # Dla NPCs end_x i end_y powinny być równe x i y
-            if self.spawns[self.selected_spawn_index]['type'] == 0:
-                self.spawns[self.selected_spawn_index]['end_x'] = x
-                self.spawns[self.selected_spawn_index]['end_y'] = y
+            if spawn.type == 0:
+                values['end_x'] = x
+                values['end_y'] = y
             
             # Zaktualizuj kierunek i ilość jeśli są dostępne w interfejsie
             if hasattr(self, 'direction_var'):
-                self.spawns[self.selected_spawn_index]['direction'] = self.direction_var.get()
-                
-            if hasattr(self, 'quantity_var') and self.spawns[self.selected_spawn_index]['type'] != 0:
-                self.spawns[self.selected_spawn_index]['quantity'] = self.quantity_var.get()
+                values['direction'] = self.direction_var.get()
                 
-            # Odśwież listę i wyświetlanie
-            self.update_spawn_list()
-            self.display_spawns()
+            if hasattr(self, 'quantity_var') and spawn.type != 0:
+                values['quantity'] = self.quantity_var.get()
             
-            # Mark map as modified
-            if hasattr(self, 'selected_map_file'):
-                self.modified_maps.add(self.selected_map_file)
-                self.update_modified_indicator()
+            command = ModifySpawns("Update Coordinates", [(spawn, values)], self.selected_spawn_index)
+            if command:
+                self.execute_command(command)
                 
-            messagebox.showinfo("Success", f"Spawn coordinates updated to X:{x} Y:{y}")
+                # Odśwież listę i wyświetlanie
+                self.update_spawn_list()
+                self.spawn_scene.update(spawn)
+                
+            self.status_var.set(f"Spawn coordinates updated to X:{x} Y:{y}")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to update spawn coordinates: {str(e)}")
 
-    def on_spawn_selected(self, event):
+    @profiled()
+    def on_spawn_selected(self, row):
         """Handle spawn selection in the list"""
-        selection = self.spawn_listbox.curselection()
-        if not selection:
-            return
-            
-        selected_text = self.spawn_listbox.get(selection[0])
-        if selected_text.startswith("==="):
-            return
-            
-        # Find the corresponding spawn
-        spawn_index = -1
-        for i, spawn in enumerate(self.spawns):
-            monster_name = self.monsters.get(spawn['monster_id'], {}).get('name', "Unknown")
-            
-            if spawn['type'] == 0:  # NPC
-                if f"🧍 {monster_name} at ({spawn['x']}, {spawn['y']})" == selected_text:
-                    spawn_index = i
-                    break
-            else:  # Monster or Trap
-                type_icon = "⚠️" if spawn['type'] == 1 else "👹"
-                if f"{type_icon} {monster_name} - Qty: {spawn['quantity']} - Area: ({spawn['x']}, {spawn['y']}) to ({spawn['end_x']}, {spawn['end_y']})" == selected_text:
-                    spawn_index = i
-                    break
+        spawn_index = self.spawn_rows[row] if 0 <= row < len(self.spawn_rows) else -1
+        if isinstance(spawn_index, str):
+            return  # Nagłówek sekcji
         
         if spawn_index >= 0:
             # Highlight the selected spawn on the map
+            self.selected_spawns = []
             self.selected_spawn_index = spawn_index
-            self.display_spawns()
+            self.update_spawn_highlight()
             
             # Pobierz dane wybranego spawna
             spawn = self.spawns[spawn_index]
-            monster_id = spawn['monster_id']
+            monster_id = spawn.monster_id
             
             # Aktualizuj pola koordynatów
-            self.spawn_x_var.set(spawn['x'])
-            self.spawn_y_var.set(spawn['y'])
-            self.spawn_end_x_var.set(spawn['end_x'])
-            self.spawn_end_y_var.set(spawn['end_y'])
+            self.spawn_x_var.set(spawn.x)
+            self.spawn_y_var.set(spawn.y)
+            self.spawn_end_x_var.set(spawn.end_x)
+            self.spawn_end_y_var.set(spawn.end_y)
             
             # Aktualizuj inne pola, jeśli są dostępne w interfejsie
             if hasattr(self, 'direction_var'):
-                self.direction_var.set(spawn['direction'])
+                self.direction_var.set(spawn.direction)
                 self.update_direction_label()
                 
             if hasattr(self, 'quantity_var'):
-                self.quantity_var.set(spawn['quantity'])
+                self.quantity_var.set(spawn.quantity)
                 
-            if hasattr(self, 'mob_type_var'):
-                self.mob_type_var.set(spawn['type'])
+            # Mob Type shows the monster's Attribute, not the section the spawn sits in
+            self.show_mob_type(monster_id)
             
             # Pokaż ramkę z koordynatami
             if hasattr(self, 'spawn_coords_frame'):
@@ -1989,10 +2266,17 @@ A visual editor for MU Online monster spawn files.
         if event.widget == self.root:
             # Only update if we have a map loaded
             if hasattr(self, 'original_image') and self.original_image:
-                self.update_map_scale()
-
-    def update_map_scale(self):
+                # Szybki podgląd teraz, pełna jakość dopiero gdy użytkownik przestanie zmieniać rozmiar
+                self.update_map_scale(preview=True)
+                if self.resize_job is not None:
+                    self.root.after_cancel(self.resize_job)
+                self.resize_job = self.root.after(RESIZE_SETTLE_MS, self.update_map_scale)
+
+    @profiled()
+    def update_map_scale(self, preview=False):
         """Update map scale based on current canvas size"""
+        if not preview:
+            self.resize_job = None
         if not hasattr(self, 'original_image') or not self.original_image:
             return
             
@@ -2004,23 +2288,219 @@ A visual editor for MU Online monster spawn files.
         if canvas_width <= 1 or canvas_height <= 1:
             return
             
-        # Calculate new scale
-        scale_x = canvas_width / self.original_width
-        scale_y = canvas_height / self.original_height
-        self.scale = min(scale_x, scale_y)
-        
-        # Resize image if needed
-        if self.scale < 1:
-            new_width = int(self.original_width * self.scale)
-            new_height = int(self.original_height * self.scale)
-            resized_image = self.original_image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            self.photo_image = ImageTk.PhotoImage(resized_image)
-            self.map_canvas.delete("all")
-            self.map_canvas.create_image(0, 0, image=self.photo_image, anchor="nw")
+        self.set_fitted_scale(canvas_width, canvas_height)
+        self.update_scale_display()
+        self.show_map_bitmap(preview)
+
+    def set_fitted_scale(self, canvas_width, canvas_height):
+        """Scale the map to fit the canvas (never above 100%) and make it the zoom base"""
+        self.scale = fitted_scale(self.original_width, self.original_height, canvas_width, canvas_height)
+        self.zoom_base = self.scale
+        self.zoom_step = 0
+
+    @profiled()
+    def show_map_bitmap(self, preview=False):
+        """Show the map image at self.scale, rendering only the tiles in view.
+
+        With ``preview`` missing tiles are rendered with NEAREST and not
+        cached; otherwise they use LANCZOS and go into the tile cache.
+        """
+        key = (self.map_image_path, self.scale)
+        rescaled = key != self.tile_key
+        self.tile_key = key
+        self.tile_preview = preview
+        if rescaled:
+            new_width = max(1, int(self.original_width * self.scale))
+            new_height = max(1, int(self.original_height * self.scale))
             self.map_canvas.configure(scrollregion=(0, 0, new_width, new_height))
+        self.update_map_tiles()
+        if rescaled:
+            # Move the spawn markers to the new scale
+            self.spawn_scene.reproject()
+
+    def schedule_tile_update(self):
+        """Render newly visible tiles once the current events are handled"""
+        if self.tile_job is None and self.tile_key is not None:
+            self.tile_job = self.root.after_idle(self.update_map_tiles)
+
+    @profiled()
+    def update_map_tiles(self):
+        """Create or refresh the tiles covering the viewport and drop the others"""
+        if self.tile_job is not None:
+            self.root.after_cancel(self.tile_job)
+            self.tile_job = None
+        if self.tile_key is None or not getattr(self, 'original_image', None):
+            return
         
-        # Redisplay spawns with updated scale
-        self.display_spawns()
+        size = MAP_TILE_SIZE
+        map_width = max(1, int(self.original_width * self.scale))
+        map_height = max(1, int(self.original_height * self.scale))
+        columns = (map_width + size - 1) // size
+        rows = (map_height + size - 1) // size
+        
+        # Widoczny obszar w pikselach przeskalowanej mapy
+        left = self.map_canvas.canvasx(0)
+        top = self.map_canvas.canvasy(0)
+        right = left + max(self.map_canvas.winfo_width(), 1)
+        bottom = top + max(self.map_canvas.winfo_height(), 1)
+        first_col = max(0, int(left // size) - MAP_TILE_MARGIN)
+        last_col = min(columns - 1, int(right // size) + MAP_TILE_MARGIN)
+        first_row = max(0, int(top // size) - MAP_TILE_MARGIN)
+        last_row = min(rows - 1, int(bottom // size) + MAP_TILE_MARGIN)
+        wanted = {(col, row) for col in range(first_col, last_col + 1) for row in range(first_row, last_row + 1)}
+        
+        for cell in [cell for cell in self.map_tiles if cell not in wanted]:
+            self.map_canvas.delete(self.map_tiles.pop(cell)[0])
+        
+        for cell in wanted:
+            tile = self.map_tiles.get(cell)
+            if tile is not None and tile[2] == self.tile_key and (self.tile_preview or not tile[3]):
+                continue
+            photo, preview = self.render_map_tile(cell[0], cell[1], map_width, map_height)
+            if tile is None:
+                item = self.map_canvas.create_image(cell[0] * size, cell[1] * size, image=photo,
+                                                    anchor="nw", tags="map")
+                self.map_canvas.tag_lower(item)
+                self.map_tiles[cell] = [item, photo, self.tile_key, preview]
+            else:
+                self.map_canvas.itemconfigure(tile[0], image=photo)
+                tile[1:] = [photo, self.tile_key, preview]
+
+    @profiled()
+    def render_map_tile(self, col, row, map_width, map_height):
+        """Return (PhotoImage, is preview) for one tile at the current scale"""
+        from PIL import Image, ImageTk
+        cache_key = self.tile_key + (col, row)
+        photo = self.map_bitmaps.get(cache_key)
+        if photo is not None:
+            PROFILER.count("map tiles from cache")
+            return photo, False
+        PROFILER.count("map tiles rendered")
+        
+        size = MAP_TILE_SIZE
+        left, top = col * size, row * size
+        right, bottom = min(left + size, map_width), min(top + size, map_height)
+        scale = self.scale
+        # Fragment oryginalnego obrazu odpowiadający kafelkowi
+        box = (left / scale, top / scale,
+               min(right / scale, self.original_width), min(bottom / scale, self.original_height))
+        exact = True  # full quality, so it can be cached even while previewing
+        if scale == 1.0:
+            image = self.original_image.crop((left, top, right, bottom))
+        elif scale == self.fitted_scale and self.fitted_image is not None:
+            image = self.fitted_image.crop((left, top, right, bottom))  # przeskalowany w tle
+        else:
+            resample = Image.Resampling.NEAREST if self.tile_preview else Image.Resampling.LANCZOS
+            image = self.original_image.resize((right - left, bottom - top), resample, box=box)
+            exact = not self.tile_preview
+        photo = ImageTk.PhotoImage(image)
+        if exact:
+            self.map_bitmaps.put(cache_key, photo)
+            return photo, False
+        return photo, True
+
+    def toggle_debug_log(self):
+        """Switch debug logging on or off without restarting; off goes back to the level it replaced"""
+        root_logger = logging.getLogger()
+        if self.debug_log_var.get():
+            self.log_level_before_debug = root_logger.level
+            level = logging.DEBUG
+        else:
+            # Started with --debug/trace: there is no quieter level to return to, so use the default
+            level = getattr(self, 'log_level_before_debug', logging.WARNING)
+        root_logger.setLevel(level)
+        self.status_var.set(f"Log level: {logging.getLevelName(level)}")
+
+    def toggle_profiling(self):
+        """Start or stop timing the handlers (View > Profiling)"""
+        PROFILER.enable(self.profiling_var.get())
+        if PROFILER.enabled:
+            self.status_var.set("Profiling on")
+            self.refresh_profiling()
+        else:
+            self.profile_var.set("")
+            self.status_var.set("Profiling off")
+
+    def refresh_profiling(self):
+        """Update the status bar readout and the stats window while profiling is on"""
+        self.profile_job = None
+        if not PROFILER.enabled:
+            return
+        self.profile_var.set(PROFILER.summary())
+        window = self.profile_window
+        if window is not None and window.winfo_exists():
+            text = window.text
+            first = text.yview()[0]
+            text.configure(state=tk.NORMAL)
+            text.delete("1.0", tk.END)
+            text.insert("1.0", self.profiling_report())
+            text.configure(state=tk.DISABLED)
+            text.yview_moveto(first)
+        self.profile_job = self.root.after(PROFILE_REFRESH_MS, self.refresh_profiling)
+
+    def profiling_report(self):
+        """Plain-text table of the handler timings and counters, slowest total first"""
+        lines = [f"{'Handler':<28}{'Calls':>8}{'Total ms':>12}{'Avg ms':>10}{'Max ms':>10}   Histogram (ms)"]
+        for name, stats in PROFILER.rows():
+            histogram = "  ".join(f"{label}:{count}" for label, count in stats.to_dict()["histogram"].items()
+                                  if count)
+            lines.append(f"{name:<28}{stats.count:>8}{stats.total_ms:>12.1f}{stats.mean_ms:>10.2f}"
+                         f"{stats.max_ms:>10.1f}   {histogram}")
+        if PROFILER.counters:
+            lines.append("")
+            lines.extend(f"{name:<28}{count:>8}" for name, count in sorted(PROFILER.counters.items()))
+        return "\n".join(lines)
+
+    def show_profiling_stats(self):
+        """Window with the live handler timings; opening it turns profiling on"""
+        if self.profile_window is not None and self.profile_window.winfo_exists():
+            self.profile_window.lift()
+            return
+        window = tk.Toplevel(self.root)
+        window.title("Profiling")
+        window.geometry("900x400")
+        buttons = ttk.Frame(window)
+        buttons.pack(side=tk.BOTTOM, fill=tk.X)
+        ttk.Button(buttons, text="Reset", command=PROFILER.reset).pack(side=tk.LEFT, padx=5, pady=5)
+        ttk.Button(buttons, text="Dump...", command=self.dump_profiling_stats).pack(side=tk.LEFT, padx=5, pady=5)
+        window.text = tk.Text(window, font=("Courier New", 9), wrap=tk.NONE, background='#23293a',
+                              foreground='#e0e6f8', state=tk.DISABLED)
+        window.text.pack(fill=tk.BOTH, expand=True)
+        self.profile_window = window
+        if not PROFILER.enabled:
+            self.profiling_var.set(True)
+            self.toggle_profiling()
+        elif self.profile_job is None:
+            self.refresh_profiling()
+
+    def dump_profiling_stats(self):
+        """Write the handler timings and histograms to a JSON file"""
+        path = filedialog.asksaveasfilename(title="Dump Profiling Stats", defaultextension=".json",
+                                            initialfile="profile.json", filetypes=[("JSON", "*.json")])
+        if not path:
+            return
+        try:
+            PROFILER.dump(path)
+        except OSError as e:
+            messagebox.showerror("Error", f"Failed to write {path}: {e}")
+            return
+        self.status_var.set(f"Profiling stats written to {path}")
+
+    def toggle_cprofile(self):
+        """Start a cProfile capture, or stop it and save it to a .prof file"""
+        if self.cprofile_var.get():
+            PROFILER.start_cprofile()
+            self.status_var.set("cProfile capture running")
+            return
+        path = filedialog.asksaveasfilename(title="Save cProfile Capture", defaultextension=".prof",
+                                            initialfile="profile.prof", filetypes=[("cProfile", "*.prof")])
+        try:
+            top = PROFILER.stop_cprofile(path or None)
+        except OSError as e:
+            messagebox.showerror("Error", f"Failed to write {path}: {e}")
+            return
+        log.info("cProfile capture:\n%s", top)
+        self.status_var.set(f"cProfile capture saved to {path}" if path else "cProfile capture discarded")
 
     def toggle_mobs_visibility_menu(self):
         """Toggle visibility of mobs from menu"""
@@ -2029,22 +2509,31 @@ A visual editor for MU Online monster spawn files.
 
     def zoom_in(self):
         """Increase map zoom by 20%"""
-        if hasattr(self, 'scale') and self.scale > 0:
-            self.scale = min(self.scale * 1.2, 5.0)  # Limit zoom in to 500%
-            self.update_scale_display()
-            self.update_map_with_scale()
+        self.zoom_by(1)
 
     def zoom_out(self):
-        """Decrease map zoom by 20%"""
-        if hasattr(self, 'scale') and self.scale > 0:
-            self.scale = max(self.scale * 0.8, 0.1)  # Limit zoom out to 10%
-            self.update_scale_display()
-            self.update_map_with_scale()
+        """Decrease map zoom by one step (undoes zoom_in)"""
+        self.zoom_by(-1)
+
+    def zoom_by(self, steps):
+        """Move the zoom by a number of ZOOM_FACTOR steps, within MIN_ZOOM-MAX_ZOOM"""
+        if not hasattr(self, 'scale') or self.scale <= 0:
+            return
+        step = self.zoom_step + steps
+        scale = self.zoom_base * ZOOM_FACTOR ** step
+        if not MIN_ZOOM <= scale <= MAX_ZOOM:
+            return  # Already at the zoom limit
+        self.zoom_step = step
+        self.scale = quantize_scale(scale)
+        self.update_scale_display()
+        self.update_map_with_scale()
 
     def reset_zoom(self):
         """Reset zoom to 100%"""
         if hasattr(self, 'scale'):
             self.scale = 1.0
+            self.zoom_base = 1.0
+            self.zoom_step = 0
             self.update_scale_display()
             self.update_map_with_scale()
 
@@ -2054,54 +2543,28 @@ A visual editor for MU Online monster spawn files.
             scale_percent = int(self.scale * 100)
             self.scale_var.set(f"Scale: {scale_percent}%")
 
+    @profiled()
     def update_map_with_scale(self):
         """Update map display with current scale"""
         if not hasattr(self, 'original_image') or not self.original_image:
             return
-            
-        self.map_canvas.delete("all")
-        
-        # Resize image based on scale
-        new_width = int(self.original_width * self.scale)
-        new_height = int(self.original_height * self.scale)
-        
-        if new_width > 0 and new_height > 0:
-            try:
-                resized_image = self.original_image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                self.photo_image = ImageTk.PhotoImage(resized_image)
-                self.map_canvas.create_image(0, 0, image=self.photo_image, anchor="nw")
-                self.map_canvas.configure(scrollregion=(0, 0, new_width, new_height))
-                
-                # Wyświetl spawny z nową skalą
-                self.display_spawns()
-            except Exception as e:
-                print(f"Error scaling image: {e}")
+        try:
+            self.show_map_bitmap()
+        except Exception as e:
+            log.error("Error scaling image: %s", e)
 
     # Add these new methods for undo/redo functionality
-    def save_state(self, action_name):
-        """Save current state to undo stack"""
-        print(f"Saving state: {action_name}")  # Debug
-        
-        # Create a copy of current spawns for the undo stack
-        current_state = {
-            'spawns': copy.deepcopy(self.spawns),
-            'action': action_name,
-            'selected_spawn_index': getattr(self, 'selected_spawn_index', -1)
-        }
-        
-        # Add to undo stack and clear redo stack (since we're creating a new action path)
-        self.undo_stack.append(current_state)
-        self.redo_stack.clear()
-        
-        # Limit the size of the undo stack
-        if len(self.undo_stack) > self.max_history:
-            self.undo_stack.pop(0)
+    @profiled()
+    def execute_command(self, command):
+        """Apply an edit to self.spawns and record it in the undo history"""
+        log.debug("Executing: %s", command.name)
+        self.session.execute(command)
         
         # Update menu states
         self.update_undo_redo_states()
         
         # Update status bar
-        self.status_var.set(f"Action: {action_name}")
+        self.status_var.set(f"Action: {command.name}")
         
         # Mark map as modified
         if hasattr(self, 'selected_map_file'):
@@ -2113,8 +2576,8 @@ A visual editor for MU Online monster spawn files.
         if hasattr(self, 'edit_menu'):
             try:
                 # Update Undo state
-                if self.undo_stack:
-                    action = self.undo_stack[-1]['action']
+                action = self.history.undo_name
+                if action:
                     self.edit_menu.entryconfigure(self.undo_index, state="normal")
                     self.edit_menu.entryconfigure(self.undo_index, label=f"Undo {action}")
                 else:
@@ -2122,37 +2585,25 @@ A visual editor for MU Online monster spawn files.
                     self.edit_menu.entryconfigure(self.undo_index, label="Undo")
                 
                 # Update Redo state
-                if self.redo_stack:
-                    action = self.redo_stack[-1]['action']
+                action = self.history.redo_name
+                if action:
                     self.edit_menu.entryconfigure(self.redo_index, state="normal")
                     self.edit_menu.entryconfigure(self.redo_index, label=f"Redo {action}")
                 else:
                     self.edit_menu.entryconfigure(self.redo_index, state="disabled")
                     self.edit_menu.entryconfigure(self.redo_index, label="Redo")
             except Exception as e:
-                print(f"Error updating menu state: {e}")
+                log.error("Error updating menu state: %s", e)
                 # Don't let a menu error crash the whole application
 
+    @profiled()
     def undo(self):
-        """Restore the previous state from undo stack"""
-        print("Undo called")  # Debug
-        if not self.undo_stack:
-            print("Undo stack empty")  # Debug
+        """Revert the last edit from the undo history"""
+        command = self.session.undo(getattr(self, 'selected_spawn_index', -1))
+        if command is None:
+            log.debug("Undo stack empty")
             return
-        
-        # Get the current state for the redo stack
-        current_state = {
-            'spawns': copy.deepcopy(self.spawns),
-            'action': self.undo_stack[-1]['action'],
-            'selected_spawn_index': getattr(self, 'selected_spawn_index', -1)
-        }
-        self.redo_stack.append(current_state)
-        
-        # Restore the previous state
-        previous_state = self.undo_stack.pop()
-        self.spawns = previous_state['spawns']
-        if 'selected_spawn_index' in previous_state:
-            self.selected_spawn_index = previous_state['selected_spawn_index']
+        self.selected_spawn_index = command.selection
         
         # Update display
         self.display_spawns()
@@ -2162,29 +2613,17 @@ A visual editor for MU Online monster spawn files.
         self.update_undo_redo_states()
         
         # Update status bar
-        self.status_var.set(f"Undid: {previous_state['action']}")
-        print(f"Undid: {previous_state['action']}")  # Debug
+        self.status_var.set(f"Undid: {command.name}")
+        log.debug("Undid: %s", command.name)
 
+    @profiled()
     def redo(self):
-        """Restore the next state from redo stack"""
-        print("Redo called")  # Debug
-        if not self.redo_stack:
-            print("Redo stack empty")  # Debug
+        """Re-apply the last undone edit"""
+        command = self.session.redo()
+        if command is None:
+            log.debug("Redo stack empty")
             return
-        
-        # Get the current state for the undo stack
-        current_state = {
-            'spawns': copy.deepcopy(self.spawns),
-            'action': self.redo_stack[-1]['action'],
-            'selected_spawn_index': getattr(self, 'selected_spawn_index', -1)
-        }
-        self.undo_stack.append(current_state)
-        
-        # Restore the next state
-        next_state = self.redo_stack.pop()
-        self.spawns = next_state['spawns']
-        if 'selected_spawn_index' in next_state:
-            self.selected_spawn_index = next_state['selected_spawn_index']
+        self.selected_spawn_index = command.redo_selection
         
         # Update display
         self.display_spawns()
@@ -2194,21 +2633,24 @@ A visual editor for MU Online monster spawn files.
         self.update_undo_redo_states()
         
         # Update status bar
-        self.status_var.set(f"Redid: {next_state['action']}")
-        print(f"Redid: {next_state['action']}")  # Debug
-
-    def save_map_to_memory(self, map_file):
-        """Save current map spawns to memory"""
-        if hasattr(self, 'spawns') and self.spawns:
-            self.map_spawns[map_file] = copy.deepcopy(self.spawns)
-            print(f"Saved map {map_file} to memory with {len(self.spawns)} spawns")
-            
-            # Mark as modified if there are unsaved changes
-            if hasattr(self, 'undo_stack') and self.undo_stack:
-                self.modified_maps.add(map_file)
+        self.status_var.set(f"Redid: {command.name}")
+        log.debug("Redid: %s", command.name)
 
     def on_closing(self):
         """Handle application closing with unsaved changes check"""
+        table = getattr(self, 'monster_table', None)
+        if table is not None and table.dirty:
+            result = messagebox.askyesnocancel(
+                "Unsaved Monster Stats",
+                f"You have edited {len(table.dirty)} monster(s).\n\nDo you want to save them to {self.monster_file}?",
+                icon="warning"
+            )
+            if result is None:  # Cancel
+                return
+            elif result:
+                if not self.save_monster_stats():
+                    return  # Don't close with unsaved monster stats
+        
         if self.modified_maps:
             # Format list of modified maps for display
             modified_list = "\n".join(sorted(self.modified_maps))
@@ -2222,32 +2664,14 @@ A visual editor for MU Online monster spawn files.
             
             if result is None:  # Cancel
                 return  # Don't close the app
-            elif result:  # Yes, save changes
-                # Save current map first
-                if hasattr(self, 'selected_map_file') and self.selected_map_file in self.modified_maps:
-                    self.save_changes()
-                
-                # Prompt for saving other modified maps
-                for map_file in sorted(self.modified_maps.copy()):  # Use copy to avoid modification during iteration
-                    if not hasattr(self, 'selected_map_file') or map_file != self.selected_map_file:
-                        save_this = messagebox.askyesno(
-                            "Save Map",
-                            f"Save changes to {map_file}?",
-                            icon="question"
-                        )
-                        if save_this:
-                            # Switch to this map temporarily and save it
-                            self.save_map_to_memory(self.selected_map_file)  # Save current map state
-                            old_map = self.selected_map_file
-                            self.selected_map_file = map_file
-                            self.spawns = copy.deepcopy(self.map_spawns[map_file])
-                            self.save_changes()
-                            
-                            # Switch back to original map
-                            self.selected_map_file = old_map
-                            self.spawns = copy.deepcopy(self.map_spawns[old_map])
+            elif result:  # Yes, save every modified map in one batch
+                if not self.save_all():
+                    return  # Don't close with unsaved changes
         
         # Close the application
+        PROFILER.stop_cprofile()
+        self.spawn_prefetch.shutdown()
+        self.image_prefetch.shutdown()
         self.root.destroy()
 
 def main():
@@ -2255,5 +2679,108 @@ def main():
     app = MonsterSpawnEditor(root)
     root.mainloop()
 
+def validate_command(args):
+    """Check every MonsterSetBase file without opening the editor; returns the exit code"""
+    started = time.perf_counter()
+    repository = Repository(args.root)
+    monster_file = repository.monster_file
+    try:
+        table = repository.load_monsters()
+    except OSError as e:
+        print(f"error: cannot read {monster_file}: {e}", file=sys.stderr)
+        return 2
+    monster_names = {monster_id: table.name(monster_id) for monster_id in table}
+    
+    paths = find_spawn_files(args.root)
+    reports = validate_tree(paths, monster_names, rewrite=args.rewrite, jobs=args.jobs,
+                            backup_dir=repository.backup_dir)
+    
+    errors = warnings = spawns = rewritten = 0
+    for report in reports:
+        spawns += report.spawns
+        rewritten += report.rewritten
+        for issue in report.issues:
+            if issue.severity == "error":
+                errors += 1
+            else:
+                warnings += 1
+            print(f"{issue.path}:{issue.line}: {issue.severity}: {issue.message}")
+    
+    summary = (f"Checked {len(reports)} files, {spawns} spawns: {errors} error(s), {warnings} warning(s)"
+               f" in {time.perf_counter() - started:.2f}s")
+    if args.rewrite:
+        summary += f", rewrote {rewritten} file(s)"
+    print(summary)
+    if errors or (args.strict and warnings):
+        return 1
+    return 0
+
+def generate_command(args):
+    """Write a synthetic Monster.txt and MonsterSetBase tree for stress tests; returns the exit code"""
+    try:
+        paths = generate_tree(args.root, maps=args.maps, spawns=args.spawns, monsters=args.monsters,
+                              seed=args.seed, event_maps=args.event_maps, invasion_maps=args.invasion_maps,
+                              distribution=args.distribution)
+    except OSError as e:
+        print(f"error: cannot write to {args.root}: {e}", file=sys.stderr)
+        return 2
+    print(f"Wrote {len(paths)} files under {args.root} (seed {args.seed})")
+    return 0
+
+def cli(argv):
+    """Entry point: no arguments opens the editor, 'validate', 'bench' and 'generate' run headless"""
+    parser = argparse.ArgumentParser(prog="MonsterSpawnEditor", description="Monster & MonsterSetBase Editor")
+    parser.add_argument("--log-level", choices=sorted(LOG_LEVELS, key=LOG_LEVELS.get),
+                        help=f"log verbosity (default: ${LOG_ENV_VAR} or warning); trace logs every mouse event")
+    parser.add_argument("--debug", action="store_const", const="debug", dest="log_level",
+                        help="shortcut for --log-level debug")
+    parser.add_argument("--log-file", help="write the log to this file instead of the console")
+    parser.add_argument("--profile", action="store_true", help="start the editor with View > Profiling on")
+    commands = parser.add_subparsers(dest="command")
+    
+    validate = commands.add_parser("validate", help="check every MonsterSetBase file without opening the editor")
+    validate.add_argument("--root", default=".", help="folder that contains Monster/ and MonsterSetBase/ (default: current)")
+    validate.add_argument("--rewrite", action="store_true", help="rewrite every file in the standard column layout")
+    validate.add_argument("--jobs", type=int, default=None, help="number of worker processes (default: CPU count)")
+    validate.add_argument("--strict", action="store_true", help="exit non-zero on warnings (duplicate spawns) too")
+    
+    # The benchmark harness (and tracemalloc) is only imported when 'bench' is run; its options
+    # are added once the first pass has seen the command
+    bench = commands.add_parser("bench", help="time the data paths on the bundled and scaled-up data, as JSON",
+                                add_help=False)
+    
+    generate = commands.add_parser("generate", help="write a seeded synthetic Monster.txt and MonsterSetBase tree")
+    generate.add_argument("root", help="folder to write Monster/ and MonsterSetBase/ into")
+    generate.add_argument("--maps", type=int, default=10, help="regular maps (default: 10)")
+    generate.add_argument("--spawns", type=int, default=1000, help="spawns per map file (default: 1000)")
+    generate.add_argument("--monsters", type=int, default=1000, help="rows in Monster.txt (default: 1000)")
+    generate.add_argument("--event-maps", type=int, default=2, help="files under Event/ (default: 2)")
+    generate.add_argument("--invasion-maps", type=int, default=3,
+                          help="maps covered by Invasion/InvasionSetBase.txt, 0 for none (default: 3)")
+    generate.add_argument("--distribution", choices=DISTRIBUTIONS, default="clustered",
+                          help="spawn positions: around a few hotspots or all over the map (default: clustered)")
+    generate.add_argument("--seed", type=int, default=0, help="same seed, same files (default: 0)")
+    
+    args, _ = parser.parse_known_args(argv)
+    if args.command == "bench":
+        try:
+            import bench as benchmarks
+        except ImportError:
+            parser.error("bench is not included in this build; run it from the source tree")
+        benchmarks.add_arguments(bench)
+        bench.add_argument("-h", "--help", action="help", help="show this help message and exit")
+    args = parser.parse_args(argv)
+    configure_logging(args.log_level, args.log_file)
+    if args.command == "validate":
+        return validate_command(args)
+    if args.command == "bench":
+        return benchmarks.bench_command(args)
+    if args.command == "generate":
+        return generate_command(args)
+    PROFILER.enable(args.profile)
+    main()
+    return 0
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    multiprocessing.freeze_support()
+    sys.exit(cli(sys.argv[1:]))
\ No newline at end of file
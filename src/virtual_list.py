@@ -0,0 +1,173 @@
+"""Listbox that only holds the rows currently in view."""
+import tkinter as tk
+from tkinter import ttk
+
+# Smallest row height assumed when deciding how many rows fill the view
+MIN_ROW_HEIGHT = 12
+
+
+class VirtualList(ttk.Frame):
+    """Scrollable list of ``count`` rows whose text comes from ``row_text(row)``.
+
+    Only the visible page is inserted into the Listbox, so a list of
+    thousands of rows costs a couple of dozen Tk calls to (re)draw.  Rows are
+    addressed by their model number; ``on_select(row)`` is called when the
+    user picks one.  With ``on_mark``, Ctrl-click toggles rows and
+    Shift-click adds a range to a multi-selection kept by model row (the
+    Listbox itself only holds the visible page); ``on_mark(rows)`` gets
+    the marked rows after every change.
+    """
+
+    def __init__(self, master, row_text, on_select=None, height=10, width=50, on_mark=None):
+        super().__init__(master)
+        self.row_text = row_text
+        self.on_select = on_select
+        self.on_mark = on_mark
+        self.count = 0
+        self.first = 0          # model row shown at the top of the Listbox
+        self.selected = None    # selected model row
+        self.marked = set()     # model rows of the multi-selection
+        self.anchor = None      # row a Shift-click range starts from
+        self.page = height      # rows currently inserted into the Listbox
+
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+        self.listbox = tk.Listbox(self, height=height, width=width, exportselection=False)
+        self.listbox.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.y_scroll = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.y_scroll.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        x_scroll = ttk.Scrollbar(self, orient="horizontal", command=self.listbox.xview)
+        x_scroll.grid(row=1, column=0, sticky=(tk.W, tk.E))
+        self.listbox.configure(xscrollcommand=x_scroll.set)
+
+        self.listbox.bind('<<ListboxSelect>>', self._on_listbox_select)
+        self.listbox.bind('<Configure>', lambda event: self.refresh())
+        self.listbox.bind('<MouseWheel>', lambda event: self.scroll(-1 if event.delta > 0 else 1, "units"))
+        self.listbox.bind('<Button-4>', lambda event: self.scroll(-1, "units"))
+        self.listbox.bind('<Button-5>', lambda event: self.scroll(1, "units"))
+        self.listbox.bind('<Up>', lambda event: self._step(-1))
+        self.listbox.bind('<Down>', lambda event: self._step(1))
+        self.listbox.bind('<Prior>', lambda event: self.scroll(-1, "pages"))
+        self.listbox.bind('<Next>', lambda event: self.scroll(1, "pages"))
+        if on_mark is not None:
+            self.listbox.bind('<Control-Button-1>', lambda event: self._on_mark_click(event, extend=False))
+            self.listbox.bind('<Shift-Button-1>', lambda event: self._on_mark_click(event, extend=True))
+
+    def set_count(self, count, selected=None, marked=()):
+        """Replace the rows; only the visible ones are redrawn"""
+        self.count = count
+        self.selected = selected if selected is not None and 0 <= selected < count else None
+        self.marked = {row for row in marked if 0 <= row < count}
+        self.first = max(0, min(self.first, count - 1))
+        self.refresh()
+
+    def refresh(self):
+        """Redraw the visible rows from row_text"""
+        listbox = self.listbox
+        self.page = max(int(listbox.cget('height')), listbox.winfo_height() // MIN_ROW_HEIGHT + 1)
+        last = min(self.count, self.first + self.page)
+        listbox.delete(0, tk.END)
+        if last > self.first:
+            listbox.insert(tk.END, *(self.row_text(row) for row in range(self.first, last)))
+        for row in self.marked:
+            if self.first <= row < last:
+                listbox.selection_set(row - self.first)
+        if self.selected is not None and self.first <= self.selected < last:
+            listbox.selection_set(self.selected - self.first)
+            listbox.activate(self.selected - self.first)
+        listbox.yview_moveto(0)
+        self._update_scrollbar()
+
+    def visible_rows(self):
+        """Number of rows that fit in the Listbox"""
+        if self.count == 0 or self.listbox.size() == 0:
+            return self.page
+        return self.listbox.nearest(self.listbox.winfo_height()) + 1
+
+    def _update_scrollbar(self):
+        if self.count <= 0:
+            self.y_scroll.set(0, 1)
+            return
+        visible = min(self.visible_rows(), self.count)
+        self.y_scroll.set(self.first / self.count, (self.first + visible) / self.count)
+
+    # Scrolling
+
+    def yview(self, *args):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, 'units'/'pages')"""
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * self.count))
+        elif args[0] == "scroll":
+            self.scroll(int(args[1]), args[2])
+
+    def scroll(self, amount, what="units"):
+        step = max(1, self.visible_rows() - 1) if what == "pages" else 1
+        self.scroll_to(self.first + amount * step)
+        return "break"
+
+    def scroll_to(self, row):
+        row = max(0, min(row, self.count - self.visible_rows()))
+        if row != self.first:
+            self.first = row
+            self.refresh()
+
+    def see(self, row):
+        """Scroll so that ``row`` is visible"""
+        visible = self.visible_rows()
+        if row < self.first:
+            self.scroll_to(row)
+        elif row >= self.first + visible:
+            self.scroll_to(row - visible + 1)
+
+    # Selection
+
+    def select(self, row, notify=False):
+        """Select a model row (dropping any multi-selection) and scroll to it"""
+        if not 0 <= row < self.count:
+            return
+        self.selected = row
+        self.marked.clear()
+        self.anchor = row
+        self.see(row)
+        self.refresh()
+        if notify and self.on_select:
+            self.on_select(row)
+
+    def mark(self, rows):
+        """Replace the multi-selection (without calling on_mark); it takes the place of the selected row"""
+        self.marked = {row for row in rows if 0 <= row < self.count}
+        self.selected = None
+        self.refresh()
+
+    def _on_mark_click(self, event, extend):
+        if self.listbox.size() == 0:
+            return "break"
+        row = self.first + self.listbox.nearest(event.y)
+        if not 0 <= row < self.count:
+            return "break"
+        if not self.marked and self.selected is not None:
+            self.marked.add(self.selected)  # the multi-selection starts from the selected row
+        if extend and self.anchor is not None:
+            self.marked.update(range(min(self.anchor, row), max(self.anchor, row) + 1))
+        else:
+            self.marked.symmetric_difference_update({row})
+            self.anchor = row
+        self.selected = None
+        self.refresh()
+        self.on_mark(sorted(self.marked))
+        return "break"
+
+    def _step(self, delta):
+        current = self.first if self.selected is None else self.selected + delta
+        self.select(max(0, min(current, self.count - 1)), notify=True)
+        return "break"
+
+    def _on_listbox_select(self, event):
+        selection = self.listbox.curselection()
+        if not selection:
+            return
+        self.selected = self.first + selection[0]
+        self.marked.clear()
+        self.anchor = self.selected
+        if self.on_select:
+            self.on_select(self.selected)
@@ -0,0 +1,105 @@
+"""Bulk edits are one history step each and keep spawns on the map."""
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from editor_core import Spawn  # noqa: E402
+from editor_core.bulk import (  # noqa: E402
+    delete_spawns,
+    retarget_spawns,
+    scale_quantity,
+    set_spawn_fields,
+    translate_spawns,
+)
+from editor_core.history import History  # noqa: E402
+
+FIELDS = ('monster_id', 'range', 'x', 'y', 'end_x', 'end_y', 'direction', 'quantity', 'type')
+
+
+def snapshot(spawns):
+    return [spawn.values(FIELDS) for spawn in spawns]
+
+
+class BulkEditTest(unittest.TestCase):
+
+    def setUp(self):
+        self.npc = Spawn(249, 0, x=130, y=120, direction=3, type=0, section=0)
+        self.single = Spawn(3, 0, x=250, y=10, type=2, section=2)
+        self.area = Spawn(7, 0, range=5, x=20, y=30, end_x=60, end_y=40, quantity=4, section=1)
+        self.invasion = Spawn(7, 0, x=100, y=100, end_x=120, end_y=110, quantity=10, section=3)
+        self.spawns = [self.npc, self.single, self.area, self.invasion]
+        self.history = History()
+
+    def execute(self, command):
+        before = snapshot(self.spawns)
+        self.history.execute(command, self.spawns)
+        after = snapshot(self.spawns)
+        # One undo brings every spawn back, one redo re-applies all of them
+        self.history.undo(self.spawns)
+        self.assertEqual(snapshot(self.spawns), before)
+        self.history.redo(self.spawns)
+        self.assertEqual(snapshot(self.spawns), after)
+
+    def test_translate_stops_at_the_edge_and_keeps_area_size(self):
+        self.execute(translate_spawns(self.spawns, 10, -25))
+        self.assertEqual((self.single.x, self.single.y), (255, 0))
+        self.assertEqual((self.area.x, self.area.y, self.area.end_x, self.area.end_y), (30, 5, 70, 15))
+        self.assertEqual((self.npc.x, self.npc.y), (140, 95))
+
+        self.execute(translate_spawns([self.area], -100, 0))
+        self.assertEqual((self.area.x, self.area.end_x), (0, 40))
+
+    def test_translate_clamps_spawns_already_off_the_map(self):
+        outside = Spawn(7, 0, x=250, y=-3, end_x=270, end_y=5, section=1)
+        self.spawns.append(outside)
+        self.execute(translate_spawns([outside], 10, -10))
+        self.assertEqual((outside.x, outside.y, outside.end_x, outside.end_y), (255, 0, 255, 0))
+
+        outside.x, outside.end_x = 300, 310
+        self.execute(translate_spawns([outside], -20, 0))
+        self.assertEqual((outside.x, outside.end_x), (255, 255))
+
+    def test_set_fields_only_touches_stored_columns(self):
+        command = set_spawn_fields(self.spawns, {'quantity': 9}, "Set Quantity")
+        self.assertEqual(command.name, "Set Quantity (2 Spawns)")
+        self.execute(command)
+        self.assertEqual([spawn.quantity for spawn in self.spawns], [1, 1, 9, 9])
+
+        command = set_spawn_fields(self.spawns, {'range': 5})
+        self.assertEqual(command.name, "Edit (3 Spawns)")  # the area already had range 5
+
+    def test_scale_quantity_counts_changed_spawns(self):
+        command = scale_quantity(self.spawns, 1.5)
+        self.assertEqual(command.name, "Scale Quantity (2 Spawns)")
+        self.execute(command)
+        self.assertEqual((self.area.quantity, self.invasion.quantity), (6, 15))
+
+        self.area.quantity = 1
+        command = scale_quantity(self.spawns, 0.1)
+        self.assertEqual(command.name, "Scale Quantity")  # only the invasion area changes
+        self.execute(command)
+        self.assertEqual((self.area.quantity, self.invasion.quantity), (1, 2))
+
+        self.assertFalse(scale_quantity([self.npc, self.single], 3))
+
+    def test_retarget_sets_type_per_section(self):
+        self.execute(retarget_spawns(self.spawns, 100, mtype=1))
+        self.assertEqual([spawn.monster_id for spawn in self.spawns], [100] * 4)
+        self.assertEqual([spawn.type for spawn in self.spawns], [0, 1, 1, 1])
+
+    def test_delete_removes_by_identity(self):
+        copy = self.area.copy()
+        command = delete_spawns(self.spawns, [copy, self.single, self.invasion])
+        self.assertEqual(command.name, "Remove (2 Spawns)")
+        self.history.execute(command, self.spawns)
+        self.assertEqual(self.spawns, [self.npc, self.area])
+        self.history.undo(self.spawns)
+        self.assertEqual(self.spawns, [self.npc, self.single, self.area, self.invasion])
+        self.assertEqual(delete_spawns(self.spawns, [self.npc]).name, "Remove Spawn")
+
+
+if __name__ == "__main__":
+    unittest.main()
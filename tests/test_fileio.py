@@ -0,0 +1,105 @@
+"""Saves replace files atomically, keep a bounded number of backups and skip no-op writes."""
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from editor_core.fileio import (  # noqa: E402
+    BACKUP_SUFFIX,
+    atomic_write_text,
+    backup_file,
+    save_text_file,
+    save_text_files,
+)
+
+
+def current_umask():
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+
+def read(path):
+    with open(path, 'r', encoding="utf-8", newline='') as f:
+        return f.read()
+
+
+class FileIOTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.path = os.path.join(self.tmp, "000 - Lorencia.txt")
+        self.backups = os.path.join(self.tmp, "Backups")
+
+    def backup_names(self):
+        if not os.path.isdir(self.backups):
+            return []
+        return sorted(os.listdir(self.backups))
+
+    def test_atomic_write_keeps_line_endings_and_leaves_no_temp_files(self):
+        atomic_write_text(self.path, "a\r\nb\n")
+        self.assertEqual(read(self.path), "a\r\nb\n")
+        self.assertEqual(os.listdir(self.tmp), [os.path.basename(self.path)])
+
+    @unittest.skipIf(os.name == "nt", "POSIX file modes")
+    def test_new_file_gets_the_umask_mode(self):
+        atomic_write_text(self.path, "new\n")
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o666 & ~current_umask())
+
+    @unittest.skipIf(os.name == "nt", "POSIX file modes")
+    def test_existing_file_keeps_its_mode(self):
+        atomic_write_text(self.path, "old\n")
+        os.chmod(self.path, 0o640)
+        atomic_write_text(self.path, "new\n")
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o640)
+
+    def test_backup_rotation_keeps_the_newest_copies(self):
+        self.assertIsNone(backup_file(self.path, self.backups))  # nothing to back up yet
+        made = []
+        for n in range(5):
+            atomic_write_text(self.path, f"version {n}\n")
+            made.append(os.path.basename(backup_file(self.path, self.backups, keep=3)))
+        names = self.backup_names()
+        self.assertEqual(names, made[-3:])
+        self.assertTrue(all(name.endswith(BACKUP_SUFFIX) for name in names))
+        self.assertEqual(read(os.path.join(self.backups, names[-1])), "version 4\n")
+        # Backups of other files in the same folder are left alone
+        other = os.path.join(self.tmp, "001 - Dungeon.txt")
+        atomic_write_text(other, "x\n")
+        backup_file(other, self.backups, keep=1)
+        self.assertEqual(len(self.backup_names()), 4)
+
+    def test_save_skips_unchanged_files(self):
+        first = save_text_file(self.path, "one\n", backup_dir=self.backups)
+        self.assertTrue(first.written)
+        self.assertIsNone(first.backup)  # new file, nothing to back up
+
+        same = save_text_file(self.path, "one\n", backup_dir=self.backups)
+        self.assertFalse(same.written)
+        self.assertEqual(self.backup_names(), [])
+
+        changed = save_text_file(self.path, "two\n", backup_dir=self.backups)
+        self.assertTrue(changed.written)
+        self.assertEqual(read(changed.backup), "one\n")
+        self.assertEqual(read(self.path), "two\n")
+
+    def test_batch_save_reports_failures_per_file(self):
+        good = os.path.join(self.tmp, "good.txt")
+        bad = os.path.join(self.tmp, "missing", "bad.txt")
+        results = save_text_files([(good, "ok\n", self.backups), (bad, "no\n", None)], workers=2)
+        self.assertEqual([result.path for result in results], [good, bad])
+        self.assertTrue(results[0].written)
+        self.assertIsNone(results[0].error)
+        self.assertFalse(results[1].written)
+        self.assertIsInstance(results[1].error, OSError)
+        self.assertEqual(read(good), "ok\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+"""Saving Monster.txt must rewrite only the edited rows, in their original columns."""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from editor_core import ENCODING, load_monster_table, save_monster_table  # noqa: E402
+from editor_core.monster_txt import TOKEN_RE  # noqa: E402
+
+MONSTER_TXT = os.path.join(ROOT, "Monster", "Monster.txt")
+
+
+def token_starts(line):
+    return [m.start() for m in TOKEN_RE.finditer(line)]
+
+
+class MonsterTableSaveTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.path = os.path.join(self.tmp, "Monster.txt")
+        shutil.copyfile(MONSTER_TXT, self.path)
+        with open(self.path, 'rb') as f:
+            self.original = f.read()
+        self.table = load_monster_table(self.path)
+        self.monster_id = next(iter(self.table))
+
+    def read_lines(self):
+        with open(self.path, 'rb') as f:
+            return f.read().decode(ENCODING).splitlines(keepends=True)
+
+    def test_unchanged_table_is_byte_identical(self):
+        self.assertEqual(save_monster_table(self.table, self.path), 0)
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), self.original)
+
+    def test_update_rewrites_only_its_row_in_place(self):
+        row_line = self.table.row_lines[self.table.rows[self.monster_id]]
+        level = self.table.get(self.monster_id, "level")
+        self.assertTrue(self.table.update(self.monster_id, {"level": level + 1, "hp": 12345}))
+        self.assertEqual(save_monster_table(self.table, self.path), 1)
+
+        before = self.original.decode(ENCODING).splitlines(keepends=True)
+        after = self.read_lines()
+        self.assertEqual(len(after), len(before))
+        for line_no, (old, new) in enumerate(zip(before, after)):
+            if line_no != row_line:
+                self.assertEqual(new, old)
+        # Every column still starts where it did, and the values read back
+        self.assertNotEqual(after[row_line], before[row_line])
+        self.assertEqual(token_starts(after[row_line]), token_starts(before[row_line]))
+        reloaded = load_monster_table(self.path)
+        self.assertEqual(reloaded.get(self.monster_id, "level"), level + 1)
+        self.assertEqual(reloaded.get(self.monster_id, "hp"), 12345)
+
+    def test_overflowing_update_changes_nothing(self):
+        record = self.table.record(self.monster_id)
+        with self.assertRaises(OverflowError):
+            self.table.update(self.monster_id, {"level": record["level"] + 1, "hp": 2 ** 40})
+        self.assertEqual(self.table.record(self.monster_id), record)
+        self.assertFalse(self.table.dirty)
+        save_monster_table(self.table, self.path)
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), self.original)
+
+
+if __name__ == "__main__":
+    unittest.main()
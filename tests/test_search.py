@@ -0,0 +1,78 @@
+"""MonsterIndex must return the same matches however the query was typed."""
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from editor_core.search import MonsterIndex  # noqa: E402
+
+ENTRIES = [
+    (26, "Goblin", 2),
+    (0, "Bull Fighter", 2),
+    (249, "Guard", 0),
+    (100, "Lance", 1),
+    (3, "Spider", 2),
+    (251, "Hanzo the Blacksmith", 0),
+    (1, "Hound", 2),
+]
+
+
+def ids(index, positions):
+    return [index.ids[position] for position in positions]
+
+
+class MonsterIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = MonsterIndex(ENTRIES)
+
+    def test_empty_query_lists_everything_in_id_order(self):
+        self.assertEqual(ids(self.index, self.index.search("")), sorted(e[0] for e in ENTRIES))
+
+    def test_matches_name_or_id_as_substring(self):
+        self.assertEqual(ids(self.index, self.index.search("ou")), [1])
+        self.assertEqual(ids(self.index, self.index.search("GOB")), [26])
+        self.assertEqual(ids(self.index, self.index.search("25")), [251])
+        self.assertEqual(ids(self.index, self.index.search("0")), [0, 100])
+
+    def test_typing_refines_the_previous_result(self):
+        fresh = MonsterIndex(ENTRIES)
+        for query in ("h", "ha", "han", "hanz", "hanzo"):
+            self.assertEqual(self.index.search(query), fresh.search(query), query)
+            fresh = MonsterIndex(ENTRIES)  # no previous query to refine
+        self.assertEqual(ids(self.index, self.index.search("hanzo")), [251])
+        # Deleting letters or starting over scans everything again
+        self.assertEqual(ids(self.index, self.index.search("g")), [0, 26, 249])
+        self.assertEqual(ids(self.index, self.index.search("gu")), [249])
+        self.assertEqual(ids(self.index, self.index.search("g")), [0, 26, 249])
+
+    def test_refining_only_scans_previous_matches(self):
+        self.index.search("g")
+        self.index.keys[self.index.positions[3]] = "g spider\n3"  # not a candidate any more
+        self.assertEqual(ids(self.index, self.index.search("g s")), [])
+        self.index._last_query = None
+        self.assertEqual(ids(self.index, self.index.search("g s")), [3])
+
+    def test_fuzzy_fallback_matches_letters_in_order(self):
+        self.assertEqual(ids(self.index, self.index.search("gbl")), [26])
+        self.assertEqual(ids(self.index, self.index.search("bfi")), [0])
+        self.assertEqual(ids(self.index, self.index.search("h bs")), [251])
+        self.assertEqual(self.index.search("xyz"), [])
+        # A fuzzy miss doesn't stop the next query from matching
+        self.assertEqual(ids(self.index, self.index.search("lance")), [100])
+
+    def test_split_by_type(self):
+        npcs, monsters = self.index.split_by_type(self.index.search(""))
+        self.assertEqual(npcs, [249, 251])
+        self.assertEqual(monsters, [0, 1, 3, 26, 100])
+        self.index.set_type(100, 0)
+        self.index.set_type(9999, 0)  # unknown IDs are ignored
+        npcs, monsters = self.index.split_by_type(self.index.search("an"))
+        self.assertEqual(npcs, [100, 251])
+        self.assertEqual(monsters, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+"""SpawnGrid queries, and the scene keeping its grid in step with edits and undo."""
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from editor_core import Spawn  # noqa: E402
+from editor_core.history import DeleteSpawns, History, InsertSpawns, ModifySpawns  # noqa: E402
+from editor_core.scene import SpawnScene  # noqa: E402
+from editor_core.spatial import SpawnGrid  # noqa: E402
+
+
+class FakeCanvas:
+    """The few canvas calls SpawnScene makes"""
+
+    def __init__(self):
+        self.next_item = 0
+
+    def _create(self, *args, **kwargs):
+        self.next_item += 1
+        return self.next_item
+
+    create_oval = create_rectangle = _create
+
+    def itemconfigure(self, *args, **kwargs):
+        pass
+
+    def coords(self, *args):
+        pass
+
+    def delete(self, *args):
+        pass
+
+
+def brute_near(spawns, x, y, radius):
+    return {id(s) for s in spawns if abs(s.x - x) <= radius and abs(s.y - y) <= radius}
+
+
+def ids(spawns):
+    return {id(spawn) for spawn in spawns}
+
+
+class SpawnGridTest(unittest.TestCase):
+
+    def setUp(self):
+        self.npc = Spawn(249, 0, x=130, y=120, type=0, section=0)
+        self.single = Spawn(3, 0, x=10, y=10, type=2, section=2)
+        self.area = Spawn(7, 0, x=20, y=30, end_x=60, end_y=40, type=2, section=1)
+        self.edge = Spawn(7, 0, x=255, y=0, type=2, section=2)
+        self.spawns = [self.npc, self.single, self.area, self.edge]
+        self.grid = SpawnGrid()
+        for spawn in self.spawns:
+            self.grid.add(spawn)
+
+    def test_near_returns_a_superset_of_the_spawns_in_range(self):
+        for x, y, radius in ((10, 10, 0), (12.5, 8.2, 3), (0, 0, 40), (255, 0, 1), (128, 128, 10)):
+            found = ids(self.grid.near(x, y, radius))
+            self.assertLessEqual(brute_near(self.spawns, x, y, radius), found, (x, y, radius))
+        self.assertEqual(self.grid.near(200, 200, 2), [])
+
+    def test_covering_only_returns_area_spawns_containing_the_cell(self):
+        self.assertEqual(self.grid.covering(20, 30), [self.area])
+        self.assertEqual(self.grid.covering(60, 40), [self.area])
+        self.assertEqual(self.grid.covering(45, 35), [self.area])
+        self.assertEqual(self.grid.covering(61, 35), [])
+        self.assertEqual(self.grid.covering(10, 10), [])  # single spawn, no area
+        self.area.x, self.area.end_x = 60, 20  # reversed corners count too
+        self.grid.update(self.area)
+        self.assertEqual(self.grid.covering(45, 35), [self.area])
+
+    def test_within_is_inclusive_and_accepts_any_corner_order(self):
+        self.assertEqual(ids(self.grid.within(10, 10, 20, 30)), ids([self.single, self.area]))
+        self.assertEqual(ids(self.grid.within(20, 30, 10, 10)), ids([self.single, self.area]))
+        self.assertEqual(ids(self.grid.within(0, 0, 255, 255)), ids(self.spawns))
+        self.assertEqual(self.grid.within(11, 11, 19, 29), [])
+
+    def test_remove_and_update(self):
+        self.grid.remove(self.single)
+        self.grid.remove(self.single)  # removing twice is harmless
+        self.assertEqual(len(self.grid), 3)
+        self.assertEqual(self.grid.within(0, 0, 15, 15), [])
+        self.area.x, self.area.y, self.area.end_x, self.area.end_y = 200, 200, 210, 210
+        self.grid.update(self.area)
+        self.assertEqual(self.grid.covering(45, 35), [])
+        self.assertEqual(self.grid.covering(205, 205), [self.area])
+        self.assertEqual(self.grid.within(20, 30, 20, 30), [])
+
+
+class SceneGridSyncTest(unittest.TestCase):
+    """The scene's grid follows the spawn list through edits and undo/redo"""
+
+    def setUp(self):
+        self.spawns = [Spawn(3, 0, x=10 * n, y=5 * n, type=2, section=2) for n in range(10)]
+        self.scene = SpawnScene(FakeCanvas(), lambda x, y: (x, y))
+        self.history = History()
+        self.scene.sync(self.spawns)
+
+    def assert_grid_matches(self):
+        grid = self.scene.grid
+        self.assertEqual(len(grid), len(self.spawns))
+        self.assertEqual(ids(grid.within(0, 0, 255, 255)), ids(self.spawns))
+        for spawn in self.spawns:
+            self.assertIn(spawn, grid.within(spawn.x, spawn.y, spawn.x, spawn.y))
+
+    def run_command(self, command):
+        self.history.execute(command, self.spawns)
+        self.scene.sync(self.spawns)
+        self.assert_grid_matches()
+
+    def undo(self):
+        self.assertIsNotNone(self.history.undo(self.spawns))
+        self.scene.sync(self.spawns)
+        self.assert_grid_matches()
+
+    def redo(self):
+        self.assertIsNotNone(self.history.redo(self.spawns))
+        self.scene.sync(self.spawns)
+        self.assert_grid_matches()
+
+    def test_add_delete_edit_undo_redo(self):
+        added = Spawn(5, 0, x=200, y=210, end_x=220, end_y=230, type=2, section=1)
+        self.run_command(InsertSpawns("Add", [(3, added)]))
+        self.assertEqual(self.scene.grid.covering(210, 220), [added])
+
+        deleted = self.spawns[0]
+        self.run_command(DeleteSpawns("Delete", [(0, deleted)]))
+        self.assertNotIn(deleted, self.scene.grid.within(0, 0, 0, 0))
+
+        moved = self.spawns[4]
+        old_x, old_y = moved.x, moved.y
+        self.run_command(ModifySpawns("Move", [(moved, {'x': 250, 'y': 250})]))
+        self.assertEqual(self.scene.grid.within(old_x, old_y, old_x, old_y), [])
+        self.assertEqual(self.scene.grid.within(250, 250, 250, 250), [moved])
+
+        self.undo()  # move back
+        self.assertEqual(self.scene.grid.within(old_x, old_y, old_x, old_y), [moved])
+        self.undo()  # restore the deleted spawn
+        self.assertEqual(self.scene.grid.within(0, 0, 0, 0), [deleted])
+        self.undo()  # remove the added one
+        self.assertEqual(self.scene.grid.covering(210, 220), [])
+        self.redo()
+        self.assertEqual(self.scene.grid.covering(210, 220), [added])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""Saving a MonsterSetBase file must not change the lines the user didn't edit."""
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from editor_core import ENCODING, Spawn, format_spawn_file, parse_spawn_file  # noqa: E402
+from editor_core.catalog import list_spawn_files, spawn_file_path  # noqa: E402
+
+SPAWN_ROOT = os.path.join(ROOT, "MonsterSetBase")
+
+
+def read_bytes(rel_path):
+    with open(spawn_file_path(rel_path, SPAWN_ROOT), 'rb') as f:
+        return f.read()
+
+
+def round_trip(data):
+    doc, spawns = parse_spawn_file(data.decode(ENCODING))
+    return format_spawn_file(doc, spawns).encode(ENCODING)
+
+
+class RoundTripTest(unittest.TestCase):
+
+    def test_shipped_files_are_byte_identical(self):
+        files = list_spawn_files(SPAWN_ROOT)
+        self.assertTrue(files, "no MonsterSetBase files found")
+        for rel_path in files:
+            with self.subTest(file=rel_path):
+                data = read_bytes(rel_path)
+                self.assertEqual(round_trip(data), data)
+
+    def test_edit_delete_insert_only_touch_their_rows(self):
+        data = read_bytes("002 - Devias.txt")  # NPC, area and single-monster sections
+        doc, spawns = parse_spawn_file(data.decode(ENCODING))
+        area = next(spawn for spawn in spawns if spawn.section == 1)
+        edited, deleted = area, next(spawn for spawn in spawns if spawn.section == 2)
+        edited_line = doc.rows[edited.row][0]
+        deleted_line = doc.rows[deleted.row][0]
+        added = Spawn(area.monster_id, area.map_number, range=3, x=11, y=22, end_x=33, end_y=44,
+                      quantity=7, section=1)
+
+        edited.x = (edited.x + 1) % 256
+        kept = [spawn for spawn in spawns if spawn is not deleted] + [added]
+        text = format_spawn_file(doc, kept)
+        out_lines = text.splitlines(keepends=True)
+        in_lines = data.decode(ENCODING).splitlines(keepends=True)
+
+        # Every untouched line is still there, byte for byte, in the same order
+        untouched = [line for line in in_lines if line not in (edited_line, deleted_line)]
+        remaining = iter(out_lines)
+        for line in untouched:
+            self.assertIn(line, remaining)
+        self.assertNotIn(deleted_line, out_lines)
+        self.assertEqual(len(out_lines), len(in_lines))  # one row removed, one added
+
+        # The result reads back as the edited spawn list and is itself stable
+        doc2, spawns2 = parse_spawn_file(text)
+        self.assertEqual(len(spawns2), len(kept))
+        values = [spawn.values(('monster_id', 'x', 'y', 'end_x', 'end_y', 'quantity')) for spawn in spawns2]
+        self.assertIn((edited.monster_id, edited.x, edited.y, edited.end_x, edited.end_y, edited.quantity), values)
+        self.assertIn((added.monster_id, 11, 22, 33, 44, 7), values)
+        self.assertEqual(format_spawn_file(doc2, spawns2), text)
+
+    def test_normalize_keeps_row_comments(self):
+        data = read_bytes("002 - Devias.txt")
+        doc, spawns = parse_spawn_file(data.decode(ENCODING))
+        text = format_spawn_file(doc, spawns, lambda monster_id: "Renamed", normalize=True)
+        comments = [line.split("//", 1)[1] for line in text.splitlines() if line[:1].isdigit() and "//" in line]
+        originals = [doc.rows[spawn.row][0].split("//", 1)[1].rstrip("\r\n") for spawn in spawns]
+        self.assertEqual(comments, originals)
+        # Normalizing twice changes nothing
+        self.assertEqual(format_spawn_file(*parse_spawn_file(text), normalize=True), text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+"""SpawnStore must hold the same values as the Spawn records it was filled from."""
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from editor_core import Spawn, SpawnStore, load_spawn_store, read_spawn_file  # noqa: E402
+from editor_core.catalog import list_spawn_files, spawn_file_path  # noqa: E402
+from editor_core.spawn import STORE_COLUMNS  # noqa: E402
+
+SPAWN_ROOT = os.path.join(ROOT, "MonsterSetBase")
+
+
+class SpawnStoreTest(unittest.TestCase):
+
+    def test_extend_keeps_values_and_sources(self):
+        store = SpawnStore()
+        first = [Spawn(7, 0, range=3, x=10, y=20, end_x=30, end_y=40, quantity=5, section=1),
+                 Spawn(249, 0, x=130, y=120, direction=3, type=0, section=0)]
+        second = [Spawn(65535, 2, x=-1, y=300, section=3, value=4)]  # out-of-range values survive
+        store.extend(first, "a.txt")
+        store.extend(iter(second), "b.txt")
+
+        self.assertEqual(len(store), 3)
+        self.assertEqual(store.sources, ["a.txt", "b.txt"])
+        self.assertEqual(list(store.source), [0, 0, 1])
+        for position, spawn in enumerate(first + second):
+            for name, _ in STORE_COLUMNS:
+                self.assertEqual(store.columns[name][position], getattr(spawn, name), name)
+
+    def test_load_every_shipped_file(self):
+        paths = [spawn_file_path(rel_path, SPAWN_ROOT) for rel_path in list_spawn_files(SPAWN_ROOT)]
+        store = load_spawn_store(paths)
+
+        position = 0
+        for path in paths:
+            for spawn in read_spawn_file(path)[1]:
+                self.assertEqual(store.sources[store.source[position]], path)
+                self.assertEqual(store.columns['monster_id'][position], spawn.monster_id)
+                self.assertEqual(store.columns['x'][position], spawn.x)
+                self.assertEqual(store.columns['section'][position], spawn.section)
+                position += 1
+        self.assertEqual(len(store), position)
+        self.assertEqual(store.sources, paths)
+
+
+if __name__ == "__main__":
+    unittest.main()